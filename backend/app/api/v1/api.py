@@ -5,7 +5,7 @@ API v1 router configuration
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
     auth, courses, enrollments, progress, reports, users, sync,
-    people, planning_center_sync, course_content, audit, mock_planning_center
+    people, planning_center_sync, course_content, audit, mock_planning_center, diagnostics
 )
 
 api_router = APIRouter()
@@ -35,5 +35,8 @@ api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
 # Audit endpoints
 api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
 
+# Database diagnostics endpoints
+api_router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
+
 # Mock Planning Center endpoints (for development/testing)
 api_router.include_router(mock_planning_center.router, prefix="/mock-planning-center", tags=["mock-planning-center"])
@@ -4,15 +4,16 @@ Authentication endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.config import settings
 from app.schemas.user import User
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService, UserService
 from app.core.security import create_access_token, verify_password
 
 router = APIRouter()
@@ -21,7 +22,7 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """Get current authenticated user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,8 +38,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except Exception:
         raise credentials_exception
     
-    user_service = UserService(db)
-    user = user_service.get_user(user_id)
+    user_service = AsyncUserService(db)
+    user = await user_service.get_user(user_id)
     if user is None:
         raise credentials_exception
     
@@ -7,11 +7,12 @@ modules, content items, file uploads, and access tracking.
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.api.v1.endpoints.auth import get_current_active_user, get_current_admin_user
-from app.services.content_service import ContentService
+from app.services.content_service import AsyncContentService, ContentService
 from app.schemas.course_content import (
     CourseModule, CourseModuleCreate, CourseModuleUpdate,
     CourseContent, CourseContentCreate, CourseContentUpdate,
@@ -47,23 +48,23 @@ async def create_module(
 @router.get("/modules/{course_id}", response_model=List[CourseModule])
 async def get_course_modules(
     course_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all modules for a course"""
-    content_service = ContentService(db)
-    return content_service.get_modules(course_id)
+    content_service = AsyncContentService(db)
+    return await content_service.get_modules(course_id)
 
 
 @router.get("/modules/single/{module_id}", response_model=CourseModule)
 async def get_module(
     module_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get a specific module"""
-    content_service = ContentService(db)
-    module = content_service.get_module(module_id)
+    content_service = AsyncContentService(db)
+    module = await content_service.get_module(module_id)
     if not module:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -144,23 +145,23 @@ async def create_content(
 async def get_course_content(
     course_id: int,
     module_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get content for a course, optionally filtered by module"""
-    content_service = ContentService(db)
-    return content_service.get_content(course_id, module_id)
+    content_service = AsyncContentService(db)
+    return await content_service.get_content(course_id, module_id)
 
 
 @router.get("/{content_id}", response_model=CourseContent)
 async def get_content_item(
     content_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get a specific content item"""
-    content_service = ContentService(db)
-    content = content_service.get_content_item(content_id)
+    content_service = AsyncContentService(db)
+    content = await content_service.get_content_item(content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -3,12 +3,13 @@ Course API endpoints (Maps to Planning Center Events)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.schemas.course import Course, CourseCreate, CourseUpdate
-from app.services.course_service import CourseService
+from app.services.course_service import AsyncCourseService, CourseService
 from app.api.v1.endpoints.auth import get_current_active_user, get_current_admin_user
 
 router = APIRouter()
@@ -19,21 +20,21 @@ async def get_courses(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all courses with pagination and optional filtering"""
-    course_service = CourseService(db)
-    return course_service.get_courses(skip=skip, limit=limit, is_active=is_active)
+    course_service = AsyncCourseService(db)
+    return await course_service.get_courses(skip=skip, limit=limit, is_active=is_active)
 
 
 @router.get("/{course_id}", response_model=Course)
 async def get_course(
     course_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific course by ID"""
-    course_service = CourseService(db)
-    course = course_service.get_course(course_id)
+    course_service = AsyncCourseService(db)
+    course = await course_service.get_course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -45,11 +46,11 @@ async def get_course(
 @router.get("/pc-event/{pc_event_id}", response_model=Course)
 async def get_course_by_pc_event_id(
     pc_event_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a course by Planning Center event ID"""
-    course_service = CourseService(db)
-    course = course_service.get_course_by_pc_event_id(pc_event_id)
+    course_service = AsyncCourseService(db)
+    course = await course_service.get_course_by_pc_event_id(pc_event_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
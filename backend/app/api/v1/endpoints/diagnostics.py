@@ -0,0 +1,29 @@
+"""
+Database diagnostics endpoints (admin only)
+"""
+
+from fastapi import APIRouter, Depends, Query
+from typing import Any, Dict
+
+from app.api.v1.endpoints.auth import get_current_admin_user
+from app.core.slow_query_log import slow_query_log
+
+router = APIRouter()
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Number of entries to return, newest first"),
+    current_user: dict = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """Statements slower than SLOW_QUERY_THRESHOLD_MS, with redacted parameters, call site and plan"""
+    return dict(slow_query_log.stats(), entries=slow_query_log.entries(limit))
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Empty the slow-query buffer"""
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared"}
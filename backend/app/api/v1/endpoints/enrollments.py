@@ -3,12 +3,13 @@ CourseEnrollment API endpoints (Maps to Planning Center Registrations)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.schemas.enrollment import CourseEnrollment, CourseEnrollmentCreate, CourseEnrollmentUpdate
-from app.services.enrollment_service import CourseEnrollmentService
+from app.services.enrollment_service import AsyncCourseEnrollmentService, CourseEnrollmentService
 
 router = APIRouter()
 
@@ -20,11 +21,11 @@ async def get_enrollments(
     course_id: Optional[int] = None,
     people_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get enrollments with optional filtering"""
-    enrollment_service = CourseEnrollmentService(db)
-    return enrollment_service.get_enrollments(
+    enrollment_service = AsyncCourseEnrollmentService(db)
+    return await enrollment_service.get_enrollments(
         skip=skip, 
         limit=limit, 
         course_id=course_id, 
@@ -36,11 +37,11 @@ async def get_enrollments(
 @router.get("/{enrollment_id}", response_model=CourseEnrollment)
 async def get_enrollment(
     enrollment_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific enrollment by ID"""
-    enrollment_service = CourseEnrollmentService(db)
-    enrollment = enrollment_service.get_enrollment(enrollment_id)
+    enrollment_service = AsyncCourseEnrollmentService(db)
+    enrollment = await enrollment_service.get_enrollment(enrollment_id)
     if not enrollment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,11 +53,11 @@ async def get_enrollment(
 @router.get("/pc-registration/{pc_registration_id}", response_model=CourseEnrollment)
 async def get_enrollment_by_pc_registration_id(
     pc_registration_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get enrollment by Planning Center registration ID"""
-    enrollment_service = CourseEnrollmentService(db)
-    enrollment = enrollment_service.get_enrollment_by_pc_registration_id(pc_registration_id)
+    enrollment_service = AsyncCourseEnrollmentService(db)
+    enrollment = await enrollment_service.get_enrollment_by_pc_registration_id(pc_registration_id)
     if not enrollment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -3,12 +3,13 @@ People API endpoints (from Planning Center)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.schemas.people import People, PeopleCreate, PeopleUpdate
-from app.services.people_service import PeopleService
+from app.services.people_service import AsyncPeopleService, PeopleService
 
 router = APIRouter()
 
@@ -18,21 +19,21 @@ async def get_people(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all people with pagination and optional filtering"""
-    people_service = PeopleService(db)
-    return people_service.get_people(skip=skip, limit=limit, is_active=is_active)
+    people_service = AsyncPeopleService(db)
+    return await people_service.get_people(skip=skip, limit=limit, is_active=is_active)
 
 
 @router.get("/{person_id}", response_model=People)
 async def get_person(
     person_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific person by ID"""
-    people_service = PeopleService(db)
-    person = people_service.get_person(person_id)
+    people_service = AsyncPeopleService(db)
+    person = await people_service.get_person(person_id)
     if not person:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,11 +45,11 @@ async def get_person(
 @router.get("/pc-id/{pc_id}", response_model=People)
 async def get_person_by_pc_id(
     pc_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a person by Planning Center ID"""
-    people_service = PeopleService(db)
-    person = people_service.get_person_by_pc_id(pc_id)
+    people_service = AsyncPeopleService(db)
+    person = await people_service.get_person_by_pc_id(pc_id)
     if not person:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,11 +62,11 @@ async def get_person_by_pc_id(
 async def search_people(
     search_term: str,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search people by name or email"""
-    people_service = PeopleService(db)
-    return people_service.search_people(search_term, limit=limit)
+    people_service = AsyncPeopleService(db)
+    return await people_service.search_people(search_term, limit=limit)
 
 
 @router.post("/", response_model=People, status_code=status.HTTP_201_CREATED)
@@ -2,15 +2,22 @@
 Planning Center Sync API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional, List
 
 from app.core.database import get_db
 from app.services.planning_center_sync_service import PlanningCenterSyncService
+from app.services.planning_center_webhook_service import enqueue_webhook_event
 
 router = APIRouter()
 
+# Explicit sync modes; omit to run incrementally once a watermark exists
+SYNC_MODE_PATTERN = "^(full|incremental)$"
+
 
 @router.get("/test-connection", response_model=Dict[str, Any])
 async def test_planning_center_connection(
@@ -46,11 +53,12 @@ async def test_planning_center_connection(
 
 @router.post("/people", response_model=Dict[str, Any])
 async def start_sync_people(
+    mode: Optional[str] = Query(None, pattern=SYNC_MODE_PATTERN),
     db: Session = Depends(get_db)
 ):
     """Start async sync of people from Planning Center"""
     sync_service = PlanningCenterSyncService(db)
-    task_id = sync_service.start_sync_people()
+    task_id = sync_service.start_sync_people(mode=mode)
     
     return {
         "task_id": task_id,
@@ -61,11 +69,12 @@ async def start_sync_people(
 
 @router.post("/events", response_model=Dict[str, Any])
 async def start_sync_events(
+    mode: Optional[str] = Query(None, pattern=SYNC_MODE_PATTERN),
     db: Session = Depends(get_db)
 ):
     """Start async sync of events (courses) from Planning Center"""
     sync_service = PlanningCenterSyncService(db)
-    task_id = sync_service.start_sync_events()
+    task_id = sync_service.start_sync_events(mode=mode)
     
     return {
         "task_id": task_id,
@@ -77,11 +86,12 @@ async def start_sync_events(
 @router.post("/registrations", response_model=Dict[str, Any])
 async def start_sync_registrations(
     event_id: Optional[str] = None,
+    mode: Optional[str] = Query(None, pattern=SYNC_MODE_PATTERN),
     db: Session = Depends(get_db)
 ):
     """Start async sync of registrations from Planning Center"""
     sync_service = PlanningCenterSyncService(db)
-    task_id = sync_service.start_sync_registrations(event_id=event_id)
+    task_id = sync_service.start_sync_registrations(event_id=event_id, mode=mode)
     
     return {
         "task_id": task_id,
@@ -92,11 +102,16 @@ async def start_sync_registrations(
 
 @router.post("/all", response_model=Dict[str, Any])
 async def start_sync_all(
+    mode: Optional[str] = Query(None, pattern=SYNC_MODE_PATTERN),
     db: Session = Depends(get_db)
 ):
-    """Start async sync of all data from Planning Center"""
+    """Start async sync of all data from Planning Center.
+    
+    Without an explicit mode each stage runs incrementally once it has a
+    recorded watermark and as a full sync otherwise.
+    """
     sync_service = PlanningCenterSyncService(db)
-    task_id = sync_service.start_sync_all()
+    task_id = sync_service.start_sync_all(mode=mode)
     
     return {
         "task_id": task_id,
@@ -110,7 +125,7 @@ async def list_sync_tasks(
     task_type: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """List all sync tasks, optionally filtered by type"""
+    """List recent sync tasks, optionally filtered by type"""
     sync_service = PlanningCenterSyncService(db)
     tasks = sync_service.list_sync_tasks(task_type=task_type)
     
@@ -135,12 +150,64 @@ async def get_sync_task_status(
     return task_status
 
 
-@router.post("/webhook", response_model=Dict[str, Any])
+@router.get("/tasks/{task_id}/events")
+async def stream_sync_task_events(
+    task_id: str,
+    db: Session = Depends(get_db)
+):
+    """Stream sync task progress as Server-Sent Events.
+    
+    Sends a ``progress`` event whenever the task changes (at most 4 per
+    second by default) and a final ``result`` event when it finishes.
+    """
+    sync_service = PlanningCenterSyncService(db)
+    if not sync_service.get_sync_task_status(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    async def events():
+        async for event, data in sync_service.stream_sync_task(task_id):
+            if event == "ping":
+                yield ": ping\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # keep proxies from buffering the stream
+    })
+
+
+@router.post("/tasks/{task_id}/cancel", response_model=Dict[str, Any])
+async def cancel_sync_task(
+    task_id: str,
+    db: Session = Depends(get_db)
+):
+    """Cancel a queued sync task, or ask the worker running it to stop"""
+    sync_service = PlanningCenterSyncService(db)
+    task_status = sync_service.cancel_sync_task(task_id)
+    
+    if not task_status:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    return task_status
+
+
+@router.post("/webhook", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def process_webhook(
     request: Request,
     db: Session = Depends(get_db)
 ):
-    """Process webhook events from Planning Center"""
+    """Accept a webhook event from Planning Center.
+    
+    The payload is stored and acknowledged straight away; the background
+    webhook processor applies it.
+    """
     try:
         webhook_data = await request.json()
     except Exception as e:
@@ -148,14 +215,23 @@ async def process_webhook(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON payload"
         )
+    if not isinstance(webhook_data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON payload"
+        )
     
-    sync_service = PlanningCenterSyncService(db)
-    result = sync_service.process_webhook_event(webhook_data)
-    
-    if result["status"] == "error":
+    try:
+        webhook_event = enqueue_webhook_event(db, webhook_data)
+    except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=result["error"]
+            detail=f"Failed to queue webhook: {str(e)}"
         )
-    
-    return result
+
+    return {
+        "status": "accepted",
+        "webhook_id": webhook_event.id,
+        "message": "Webhook queued for processing"
+    }
@@ -52,6 +52,24 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
     DATABASE_POOL_TIMEOUT: int = int(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
     DATABASE_POOL_RECYCLE: int = int(os.getenv("DATABASE_POOL_RECYCLE", "3600"))
+    DATABASE_POOL_FAST_FAIL_MS: int = int(os.getenv("DATABASE_POOL_FAST_FAIL_MS", "0"))  # answer 503 after waiting this long for a connection; 0 waits DATABASE_POOL_TIMEOUT
+    DATABASE_POOL_RETRY_AFTER: int = int(os.getenv("DATABASE_POOL_RETRY_AFTER", "2"))  # seconds, Retry-After on pool 503s
+    
+    # SQLite tuning; production mode sends writes through one connection and reads through a read-only pool
+    SQLITE_PRODUCTION_MODE: bool = os.getenv("SQLITE_PRODUCTION_MODE", "false").lower() == "true"
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_WAL_AUTOCHECKPOINT: int = int(os.getenv("SQLITE_WAL_AUTOCHECKPOINT", "1000"))  # pages
+    SQLITE_OPTIMIZE_INTERVAL: int = int(os.getenv("SQLITE_OPTIMIZE_INTERVAL", "3600"))  # seconds between PRAGMA optimize runs; 0 disables
+    
+    # Per-request SQL instrumentation (Server-Timing header and request log)
+    SQL_INSTRUMENTATION_ENABLED: bool = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    SQL_REPEAT_THRESHOLD: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "0"))  # flag a statement shape run more often than this per request; 0 disables
+    SQL_REPEAT_ACTION: str = os.getenv("SQL_REPEAT_ACTION", "log")  # 'log' or 'raise'
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))  # 0 disables the slow-query log
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))  # entries kept for the diagnostics endpoint
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
     
     # CSV Data Loading
     LOAD_CSV_DATA: bool = os.getenv("LOAD_CSV_DATA", "false").lower() == "true"
@@ -70,8 +88,76 @@ class Settings(BaseSettings):
     PLANNING_CENTER_SECRET: Optional[str] = os.getenv("PLANNING_CENTER_SECRET")
     PLANNING_CENTER_ACCESS_TOKEN: Optional[str] = os.getenv("PLANNING_CENTER_ACCESS_TOKEN")
     
+    # Planning Center paging (PC caps per_page at 100)
+    PLANNING_CENTER_PAGE_SIZE: int = int(os.getenv("PLANNING_CENTER_PAGE_SIZE", "100"))
+    PLANNING_CENTER_PREFETCH_PAGES: int = int(os.getenv("PLANNING_CENTER_PREFETCH_PAGES", "4"))
+    # Events whose registrations are fetched concurrently during a registrations sync
+    PLANNING_CENTER_EVENT_CONCURRENCY: int = int(os.getenv("PLANNING_CENTER_EVENT_CONCURRENCY", "8"))
+    # Records written per transaction by the batch upsert paths
+    PLANNING_CENTER_SYNC_CHUNK_SIZE: int = int(os.getenv("PLANNING_CENTER_SYNC_CHUNK_SIZE", "500"))
+    # Incremental syncs re-read this many minutes before the last watermark
+    PLANNING_CENTER_SYNC_OVERLAP_MINUTES: int = int(os.getenv("PLANNING_CENTER_SYNC_OVERLAP_MINUTES", "10"))
+    # sync_all stages (people, events, registrations) allowed to run at once; 1 runs them in sequence
+    PLANNING_CENTER_SYNC_STAGE_CONCURRENCY: int = int(os.getenv("PLANNING_CENTER_SYNC_STAGE_CONCURRENCY", "2"))
+    # A complete full sync deactivates local people/courses PC no longer lists, unless more than this fraction would go
+    PLANNING_CENTER_RECONCILE_MAX_FRACTION: float = float(os.getenv("PLANNING_CENTER_RECONCILE_MAX_FRACTION", "0.5"))
+    
+    # Planning Center HTTP client pooling
+    PLANNING_CENTER_MAX_CONNECTIONS: int = int(os.getenv("PLANNING_CENTER_MAX_CONNECTIONS", "20"))
+    PLANNING_CENTER_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("PLANNING_CENTER_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    PLANNING_CENTER_KEEPALIVE_EXPIRY: float = float(os.getenv("PLANNING_CENTER_KEEPALIVE_EXPIRY", "30"))  # seconds
+    PLANNING_CENTER_CONNECT_TIMEOUT: float = float(os.getenv("PLANNING_CENTER_CONNECT_TIMEOUT", "5"))  # seconds
+    PLANNING_CENTER_READ_TIMEOUT: float = float(os.getenv("PLANNING_CENTER_READ_TIMEOUT", "30"))  # seconds
+    PLANNING_CENTER_HTTP2: bool = os.getenv("PLANNING_CENTER_HTTP2", "false").lower() == "true"
+    
+    # Planning Center request budget (PC allows 100 requests per 20s by default;
+    # the live values are read from X-PCO-API-Request-Rate-* headers)
+    PLANNING_CENTER_RATE_LIMIT: int = int(os.getenv("PLANNING_CENTER_RATE_LIMIT", "100"))
+    PLANNING_CENTER_RATE_PERIOD: float = float(os.getenv("PLANNING_CENTER_RATE_PERIOD", "20"))  # seconds
+    PLANNING_CENTER_RATE_HEADROOM: float = float(os.getenv("PLANNING_CENTER_RATE_HEADROOM", "0.9"))  # fraction of budget to use
+    PLANNING_CENTER_MAX_RETRIES: int = int(os.getenv("PLANNING_CENTER_MAX_RETRIES", "5"))
+    PLANNING_CENTER_BACKOFF_BASE: float = float(os.getenv("PLANNING_CENTER_BACKOFF_BASE", "0.5"))  # seconds
+    PLANNING_CENTER_BACKOFF_MAX: float = float(os.getenv("PLANNING_CENTER_BACKOFF_MAX", "30"))  # seconds
+    
+    # Conditional-GET (ETag/Last-Modified) cache of Planning Center responses; an empty path disables it
+    PLANNING_CENTER_RESPONSE_CACHE_PATH: str = os.getenv("PLANNING_CENTER_RESPONSE_CACHE_PATH", "data/pc_response_cache.db")
+    PLANNING_CENTER_RESPONSE_CACHE_MAX_MB: float = float(os.getenv("PLANNING_CENTER_RESPONSE_CACHE_MAX_MB", "64"))
+    PLANNING_CENTER_RESPONSE_CACHE_PARSED_MB: float = float(os.getenv("PLANNING_CENTER_RESPONSE_CACHE_PARSED_MB", "0"))  # decoded pages kept in memory, by body size; 0 disables
+    
+    # Webhooks for the same record arriving within this window are applied once
+    PLANNING_CENTER_WEBHOOK_DEBOUNCE_SECONDS: float = float(os.getenv("PLANNING_CENTER_WEBHOOK_DEBOUNCE_SECONDS", "5"))
+    # Stored webhooks are drained in batches of this size every poll interval
+    PLANNING_CENTER_WEBHOOK_BATCH_SIZE: int = int(os.getenv("PLANNING_CENTER_WEBHOOK_BATCH_SIZE", "200"))
+    PLANNING_CENTER_WEBHOOK_POLL_SECONDS: float = float(os.getenv("PLANNING_CENTER_WEBHOOK_POLL_SECONDS", "1"))
+    PLANNING_CENTER_WEBHOOK_CLAIM_SECONDS: int = int(os.getenv("PLANNING_CENTER_WEBHOOK_CLAIM_SECONDS", "300"))  # reclaim batches from dead processors
+    PLANNING_CENTER_WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("PLANNING_CENTER_WEBHOOK_MAX_ATTEMPTS", "5"))  # then a failing webhook is marked processed with its error
+    
+    # Planning Center sync job queue and worker pool
+    SYNC_WORKERS_ENABLED: bool = os.getenv("SYNC_WORKERS_ENABLED", "true").lower() == "true"
+    SYNC_WORKER_CONCURRENCY: int = int(os.getenv("SYNC_WORKER_CONCURRENCY", "2"))
+    SYNC_WORKER_POLL_SECONDS: float = float(os.getenv("SYNC_WORKER_POLL_SECONDS", "2"))
+    SYNC_JOB_HEARTBEAT_SECONDS: float = float(os.getenv("SYNC_JOB_HEARTBEAT_SECONDS", "5"))
+    SYNC_JOB_LEASE_SECONDS: int = int(os.getenv("SYNC_JOB_LEASE_SECONDS", "300"))  # requeue running jobs without a heartbeat
+    SYNC_JOB_MAX_ATTEMPTS: int = int(os.getenv("SYNC_JOB_MAX_ATTEMPTS", "2"))
+    SYNC_JOB_PROGRESS_INTERVAL: float = float(os.getenv("SYNC_JOB_PROGRESS_INTERVAL", "1"))  # seconds between progress writes
+    SYNC_JOB_RETENTION_DAYS: int = int(os.getenv("SYNC_JOB_RETENTION_DAYS", "30"))
+    SYNC_JOB_MAX_RETAINED: int = int(os.getenv("SYNC_JOB_MAX_RETAINED", "500"))
+    SYNC_CHECKPOINT_MAX_AGE_HOURS: float = float(os.getenv("SYNC_CHECKPOINT_MAX_AGE_HOURS", "24"))  # older unfinished runs start over
+    # Server-Sent Events progress stream for sync tasks
+    SYNC_TASK_STREAM_INTERVAL: float = float(os.getenv("SYNC_TASK_STREAM_INTERVAL", "0.25"))  # at most 4 events/s
+    SYNC_TASK_STREAM_KEEPALIVE_SECONDS: float = float(os.getenv("SYNC_TASK_STREAM_KEEPALIVE_SECONDS", "15"))
+    
     # Mock Planning Center API (for development)
     USE_MOCK_PLANNING_CENTER: bool = os.getenv("USE_MOCK_PLANNING_CENTER", "true").lower() == "true"
+    # Mock data is generated from the seed, so any size costs no memory
+    MOCK_PLANNING_CENTER_SEED: int = int(os.getenv("MOCK_PLANNING_CENTER_SEED", "0"))
+    MOCK_PLANNING_CENTER_PEOPLE: int = int(os.getenv("MOCK_PLANNING_CENTER_PEOPLE", "50"))
+    MOCK_PLANNING_CENTER_EVENTS: int = int(os.getenv("MOCK_PLANNING_CENTER_EVENTS", "20"))
+    MOCK_PLANNING_CENTER_REGISTRATIONS_PER_EVENT: int = int(os.getenv("MOCK_PLANNING_CENTER_REGISTRATIONS_PER_EVENT", "50"))  # upper bound
+    # Fault injection for the in-process mock API app
+    MOCK_PLANNING_CENTER_LATENCY_MS: float = float(os.getenv("MOCK_PLANNING_CENTER_LATENCY_MS", "0"))
+    MOCK_PLANNING_CENTER_THROTTLE_RATE: float = float(os.getenv("MOCK_PLANNING_CENTER_THROTTLE_RATE", "0"))  # fraction answered 429
+    MOCK_PLANNING_CENTER_ERROR_RATE: float = float(os.getenv("MOCK_PLANNING_CENTER_ERROR_RATE", "0"))  # fraction answered 5xx
     
     # Security
     ALGORITHM: str = "HS256"
@@ -3,14 +3,29 @@ Database configuration and session management with connection pooling
 """
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import logging
+import time
 from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics, instrument_pool
+from app.core.query_stats import current_request_stats
+from app.core.slow_query_log import slow_query_log
+from app.core.sqlite_production import (
+    SQLiteMaintenance, SQLiteRoutingSession, is_sqlite_production_mode, set_sqlite_read_only,
+    sqlite_reader_config, sqlite_writer_config
+)
 
 logger = logging.getLogger(__name__)
 
+def get_pool_timeout() -> float:
+    """Seconds a checkout may wait for a connection; DATABASE_POOL_FAST_FAIL_MS caps it"""
+    if settings.DATABASE_POOL_FAST_FAIL_MS > 0:
+        return min(settings.DATABASE_POOL_TIMEOUT, settings.DATABASE_POOL_FAST_FAIL_MS / 1000)
+    return settings.DATABASE_POOL_TIMEOUT
+
 # Database connection configuration
 def get_engine_config():
     """Get database engine configuration based on environment"""
@@ -31,7 +46,7 @@ def get_engine_config():
                 "poolclass": QueuePool,
                 "pool_size": settings.DATABASE_POOL_SIZE,
                 "max_overflow": settings.DATABASE_MAX_OVERFLOW,
-                "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+                "pool_timeout": get_pool_timeout(),
                 "pool_recycle": settings.DATABASE_POOL_RECYCLE,
                 "pool_pre_ping": True,
             })
@@ -43,14 +58,68 @@ def get_engine_config():
     
     return config
 
-# Create database engine with optimized configuration
-engine = create_engine(
-    settings.DATABASE_URL,
-    **get_engine_config()
-)
+
+def get_async_database_url(url: str) -> str:
+    """The same database addressed through its asyncio driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def get_async_engine_config():
+    """Engine configuration for the async engine: same pool settings, asyncio-compatible pool class"""
+    config = get_engine_config()
+    if config.get("poolclass") is QueuePool:
+        config["poolclass"] = AsyncAdaptedQueuePool
+    return config
+
+# Single writer plus read-only pool for file-backed SQLite (see app.core.sqlite_production)
+SQLITE_PRODUCTION_MODE = is_sqlite_production_mode(settings.DATABASE_URL)
+
+# Pool telemetry for /health (see app.core.pool_metrics)
+pool_metrics = PoolMetrics("sync")
+read_pool_metrics = PoolMetrics("read")
+async_pool_metrics = PoolMetrics("async")
+
+if SQLITE_PRODUCTION_MODE:
+    # The writer: one connection, writers queue for it in the pool
+    engine = create_engine(
+        settings.DATABASE_URL,
+        **instrument_pool(sqlite_writer_config(get_pool_timeout()), pool_metrics)
+    )
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        **instrument_pool(sqlite_reader_config(), read_pool_metrics)
+    )
+    # Async endpoints only read, so they share the read-only setup
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        **instrument_pool(sqlite_reader_config(AsyncAdaptedQueuePool), async_pool_metrics)
+    )
+    read_pool_metrics.attach(read_engine)
+else:
+    # Create database engine with optimized configuration
+    engine = create_engine(
+        settings.DATABASE_URL,
+        **instrument_pool(get_engine_config(), pool_metrics)
+    )
+    read_engine = engine
+    
+    # Async engine for ``async def`` endpoints, so their queries don't block the event loop
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        **instrument_pool(get_async_engine_config(), async_pool_metrics)
+    )
+
+pool_metrics.attach(engine)
+async_pool_metrics.attach(async_engine.sync_engine)
 
 # Add connection event listeners for monitoring
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """Set SQLite pragmas for better performance"""
     if "sqlite" in settings.DATABASE_URL:
@@ -63,9 +132,16 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor.execute("PRAGMA cache_size=10000")
         # Set temp store to memory
         cursor.execute("PRAGMA temp_store=MEMORY")
+        # Wait this long for the write lock before failing with "database is locked"
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # Read the database file through memory-mapped I/O
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        # Checkpoint the WAL back into the database after this many pages
+        cursor.execute(f"PRAGMA wal_autocheckpoint={int(settings.SQLITE_WAL_AUTOCHECKPOINT)}")
         cursor.close()
 
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_postgresql_settings(dbapi_connection, connection_record):
     """Set PostgreSQL settings for better performance"""
     if "postgresql" in settings.DATABASE_URL:
@@ -78,8 +154,56 @@ def set_postgresql_settings(dbapi_connection, connection_record):
         cursor.execute("SET idle_in_transaction_session_timeout = '60s'")
         cursor.close()
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Statement timing for per-request statistics (app.core.query_stats) and the slow-query log
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    """Note when a statement starts"""
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+@event.listens_for(engine, "after_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    """Pass the statement's duration to the slow-query log and the current request's statistics"""
+    started_at = getattr(context, "_query_started_at", None)
+    if started_at is None:
+        return
+    seconds = time.perf_counter() - started_at
+    slow_query_log.observe(conn, statement, parameters, seconds, executemany)
+    stats = current_request_stats()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+# The read-only connections get the same pragmas and statement timing
+if SQLITE_PRODUCTION_MODE:
+    event.listen(read_engine, "connect", set_sqlite_pragma)
+    event.listen(read_engine, "connect", set_sqlite_read_only)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_read_only)
+    event.listen(read_engine, "before_cursor_execute", start_statement_timer)
+    event.listen(read_engine, "after_cursor_execute", record_statement)
+
+# Create session factories
+if SQLITE_PRODUCTION_MODE:
+    SessionLocal = sessionmaker(class_=SQLiteRoutingSession, writer=engine, reader=read_engine,
+                                autocommit=False, autoflush=False)
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit: lazy refreshes aren't possible on an AsyncSession
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Periodic PRAGMA optimize, started with the app in SQLite production mode
+sqlite_maintenance = SQLiteMaintenance(engine) if SQLITE_PRODUCTION_MODE else None
+
+def get_pool_status():
+    """Pool metrics of every engine, for the health check"""
+    status = {
+        "sync": pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+    }
+    if SQLITE_PRODUCTION_MODE:
+        status["read"] = read_pool_metrics.snapshot(read_engine.pool)
+    return status
 
 # Create base class for models
 Base = declarative_base()
@@ -92,3 +216,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,289 @@
+"""
+Shared HTTP client for Planning Center API calls with connection pooling
+and rate-limit-aware request scheduling
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.planning_center_response_cache import CachingTransport, PlanningCenterResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: throttled, or a transient server-side failure
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Methods safe to resend when a failed attempt may have reached the server
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+# Transport errors raised before the request reached the server
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# One pooled client per event loop: httpx connections are bound to the loop
+# that opened them, and background syncs may run on their own loop.
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _header_number(response: httpx.Response, name: str) -> Optional[float]:
+    """Read a numeric response header, ignoring missing or malformed values"""
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse Retry-After as delta-seconds or an HTTP date"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PlanningCenterRateLimiter:
+    """Process-wide token bucket for the Planning Center request budget.
+
+    The bucket starts from the configured limit/period and re-sizes itself
+    from PC's ``X-PCO-API-Request-Rate-*`` headers. It fills to
+    ``PLANNING_CENTER_RATE_HEADROOM`` of the budget so we stay just below the
+    limit, and a 429's ``Retry-After`` pauses every caller, not just the one
+    that was throttled.
+    """
+
+    def __init__(self, limit: Optional[int] = None, period: Optional[float] = None, headroom: Optional[float] = None):
+        self.limit = limit or settings.PLANNING_CENTER_RATE_LIMIT
+        self.period = period or settings.PLANNING_CENTER_RATE_PERIOD
+        self.headroom = headroom or settings.PLANNING_CENTER_RATE_HEADROOM
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.requests_sent = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._sent_at = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.limit * self.headroom)
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second"""
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    async def acquire(self):
+        """Wait until the budget allows another request"""
+        wait = self.reserve()
+        if wait > 0:
+            with self._lock:
+                self.throttled_seconds += wait
+            await asyncio.sleep(wait)
+        with self._lock:
+            now = time.monotonic()
+            self.requests_sent += 1
+            self._sent_at.append(now)
+            while self._sent_at and now - self._sent_at[0] > self.period:
+                self._sent_at.popleft()
+
+    def observe(self, response: httpx.Response):
+        """Update the budget from PC's rate limit headers"""
+        limit = _header_number(response, "X-PCO-API-Request-Rate-Limit")
+        period = _header_number(response, "X-PCO-API-Request-Rate-Period")
+        count = _header_number(response, "X-PCO-API-Request-Rate-Count")
+        retry_after = _retry_after_seconds(response) if response.status_code == 429 else None
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and period:
+                self.limit = limit
+                self.period = period
+            if count is not None:
+                # The server's count for the current window is authoritative
+                self.tokens = min(self.tokens, self.capacity - count)
+            if response.status_code == 429:
+                self.tokens = min(self.tokens, 0.0)
+                self.blocked_until = max(self.blocked_until, now + (retry_after or self.period / self.limit))
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Current throughput and remaining budget, for sync task status"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            recent = sum(1 for sent_at in self._sent_at if now - sent_at <= self.period)
+            return {
+                "rate_limit": self.limit,
+                "rate_period_seconds": self.period,
+                "budget_remaining": max(0, int(self.tokens)),
+                "requests_per_second": round(recent / self.period, 2),
+                "requests_sent": self.requests_sent,
+                "retries": self.retries,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+                "blocked_for_seconds": round(max(0.0, self.blocked_until - now), 2),
+            }
+
+
+rate_limiter = PlanningCenterRateLimiter()
+
+# Shared by every pooled client; None when the response cache is disabled
+response_cache: Optional[PlanningCenterResponseCache] = PlanningCenterResponseCache.from_settings()
+
+
+def response_cache_stats() -> Optional[Dict[str, Any]]:
+    """Response cache counters, or None when the cache is disabled"""
+    return response_cache.stats() if response_cache is not None else None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    ceiling = min(settings.PLANNING_CENTER_BACKOFF_MAX, settings.PLANNING_CENTER_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that schedules every request through the rate limiter and
+    retries 429s, 5xx responses and connection errors with backoff.
+    
+    5xx responses and transport errors are only retried for GET/HEAD, except
+    connect errors, which never reached the server and are safe to resend.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: PlanningCenterRateLimiter, max_retries: Optional[int] = None):
+        self.transport = transport
+        self.limiter = limiter
+        self.max_retries = settings.PLANNING_CENTER_MAX_RETRIES if max_retries is None else max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                retryable = request.method in IDEMPOTENT_METHODS or isinstance(e, CONNECT_ERRORS)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+            else:
+                self.limiter.observe(response)
+                retryable = response.status_code == 429 or (
+                    response.status_code in RETRY_STATUS_CODES and request.method in IDEMPOTENT_METHODS
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = _retry_after_seconds(response) or backoff_delay(attempt)
+                await response.aclose()
+
+            attempt += 1
+            self.limiter.record_retry()
+            logger.info(f"Retrying Planning Center request {request.method} {request.url.path} "
+                        f"in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    if not settings.PLANNING_CENTER_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("PLANNING_CENTER_HTTP2 is enabled but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def get_client_config() -> dict:
+    """Get Planning Center connection pool configuration (limits, keep-alive, timeouts)"""
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.PLANNING_CENTER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PLANNING_CENTER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.PLANNING_CENTER_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(
+            settings.PLANNING_CENTER_READ_TIMEOUT,
+            connect=settings.PLANNING_CENTER_CONNECT_TIMEOUT,
+        ),
+        "http2": _http2_enabled(),
+    }
+
+
+def _base_transport(config: dict) -> httpx.AsyncBaseTransport:
+    """Pooled network transport underneath the rate limiter"""
+    return httpx.AsyncHTTPTransport(limits=config["limits"], http2=config["http2"])
+
+
+def get_planning_center_client() -> httpx.AsyncClient:
+    """Get the pooled client for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        # Drop clients whose loops have finished (e.g. completed background threads)
+        for stale_loop in [l for l in _clients if l.is_closed()]:
+            del _clients[stale_loop]
+
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            config = get_client_config()
+            transport = RateLimitedTransport(_base_transport(config), rate_limiter)
+            if response_cache is not None:
+                # Outside the limiter: a revalidation still spends a request
+                transport = CachingTransport(transport, response_cache)
+            client = httpx.AsyncClient(transport=transport, timeout=config["timeout"])
+            _clients[loop] = client
+    return client
+
+
+@asynccontextmanager
+async def planning_center_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Borrow the pooled client; unlike ``httpx.AsyncClient()`` it stays open on exit"""
+    yield get_planning_center_client()
+
+
+async def close_planning_center_client():
+    """Close the pooled client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
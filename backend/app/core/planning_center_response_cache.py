@@ -0,0 +1,336 @@
+"""
+Conditional-GET response cache for Planning Center reads
+
+Planning Center answers GETs with ``ETag``/``Last-Modified`` validators.
+``PlanningCenterResponseCache`` keeps the last 200 response for each URL in a
+size-bounded SQLite file, least recently used entries evicted first, and
+``CachingTransport`` replays those validators as ``If-None-Match`` /
+``If-Modified-Since``. A 304 is then answered from the stored body, so an
+unchanged page costs one small round trip instead of a full transfer.
+
+A new 200 body is not buffered: ``CacheTeeStream`` hands it to the reader as
+it arrives and spools a copy on the side, written to the store once the body
+has been read to the end. Store reads and writes run in worker threads so
+they never block the event loop.
+
+Cached and replayed responses carry the cache and their key in the
+``pc_response_cache`` response extension, and replayed ones are marked
+``X-PC-Cache: revalidated``. With PLANNING_CENTER_RESPONSE_CACHE_PARSED_MB
+set, the pager also keeps decoded pages in memory up to that budget and reuses
+them for revalidated pages instead of parsing them again.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+CACHE_HEADER = "X-PC-Cache"
+
+# Bodies are copied into and out of the store in chunks of this size, and
+# spooled in memory up to it before moving to a temporary file
+CHUNK_BYTES = 64 * 1024
+
+# Headers that describe one transfer rather than the cached representation.
+# Bodies are stored decoded, so the encoding and length headers go too.
+HOP_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length",
+    "date", "x-pco-api-request-rate-count",
+}
+
+
+class PlanningCenterResponseCache:
+    """LRU store of Planning Center GET responses, keyed by URL and credentials"""
+
+    def __init__(self, path: str, max_bytes: int, parsed_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        if parsed_bytes is None:
+            parsed_bytes = int(settings.PLANNING_CENTER_RESPONSE_CACHE_PARSED_MB * 1024 * 1024)
+        self.parsed_bytes = parsed_bytes  # budget for decoded pages, counted by their body size
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._parsed: "OrderedDict[str, Tuple[str, Any, int]]" = OrderedDict()
+        self._parsed_size = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> Optional["PlanningCenterResponseCache"]:
+        """The configured cache, or None when PLANNING_CENTER_RESPONSE_CACHE_PATH is empty"""
+        if not settings.PLANNING_CENTER_RESPONSE_CACHE_PATH:
+            return None
+        return cls(settings.PLANNING_CENTER_RESPONSE_CACHE_PATH,
+                   int(settings.PLANNING_CENTER_RESPONSE_CACHE_MAX_MB * 1024 * 1024))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the store on first use, so importing the client has no side effects"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            # Losing the tail of a cache on a crash only costs a refetch
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+                " headers TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_used_at ON responses (used_at)")
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        """Cache key: the full URL plus the credentials it was fetched with"""
+        auth = request.headers.get("Authorization", "")
+        return hashlib.sha256(f"{request.url}\n{auth}".encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored validators and headers for a key; marks the entry as recently used"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT etag, last_modified, headers FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        etag, last_modified, headers = row
+        return {"etag": etag, "last_modified": last_modified, "headers": json.loads(headers)}
+
+    def body(self, key: str) -> Optional[bytes]:
+        """Stored body for a key, or None if it has been evicted"""
+        with self._lock:
+            row = self._connect().execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, key: str, url: str, headers: httpx.Headers, body: bytes):
+        """Save a 200 response held in memory"""
+        self.store_file(key, url, headers, io.BytesIO(body), len(body))
+
+    def store_file(self, key: str, url: str, headers: httpx.Headers, body: BinaryIO, size: int):
+        """Save a 200 response whose ``size``-byte body is in a file, copying it in chunk by chunk.
+
+        Least recently used entries are evicted to stay under ``max_bytes``.
+        """
+        if size > self.max_bytes:
+            return
+        stored_headers = representation_headers(headers)
+        body.seek(0)
+        with self._lock:
+            conn = self._connect()
+            previous = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute("BEGIN")
+            try:
+                cursor = conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, url, etag, last_modified, headers, body, size, used_at)"
+                    " VALUES (?, ?, ?, ?, ?, zeroblob(?), ?, ?)",
+                    (key, url, headers.get("ETag"), headers.get("Last-Modified"), json.dumps(stored_headers),
+                     size, size, time.time())
+                )
+                with conn.blobopen("responses", "body", cursor.lastrowid) as blob:
+                    for chunk in iter(lambda: body.read(CHUNK_BYTES), b""):
+                        blob.write(chunk)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._size += size - (previous[0] if previous else 0)
+            self.stores += 1
+            self._forget_parsed(key)
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        while self._size > self.max_bytes:
+            victims = conn.execute("SELECT key, size FROM responses ORDER BY used_at LIMIT 50").fetchall()
+            if not victims:
+                self._size = 0
+                return
+            for key, size in victims:
+                if self._size <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self.evictions += 1
+                self._forget_parsed(key)
+
+    def _forget_parsed(self, key: str):
+        entry = self._parsed.pop(key, None)
+        if entry is not None:
+            self._parsed_size -= entry[2]
+
+    def parsed(self, key: str, etag: Optional[str]) -> Optional[Any]:
+        """A decoded body kept in memory for this entry and ETag"""
+        with self._lock:
+            entry = self._parsed.get(key)
+            if entry is None or etag is None or entry[0] != etag:
+                return None
+            self._parsed.move_to_end(key)
+            return entry[1]
+
+    def remember_parsed(self, key: str, etag: Optional[str], size: int, build: Callable[[], Any]):
+        """Keep a decoded body so a later 304 for the same ETag can skip decoding.
+
+        ``size`` is the body size the entry is charged against the
+        ``parsed_bytes`` budget; ``build`` makes the value to keep and is only
+        called when the entry fits.
+        """
+        if etag is None or size > self.parsed_bytes:
+            return
+        value = build()
+        with self._lock:
+            self._forget_parsed(key)
+            self._parsed[key] = (etag, value, size)
+            self._parsed_size += size
+            while self._parsed_size > self.parsed_bytes:
+                self._forget_parsed(next(iter(self._parsed)))
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and store size, for sync task results"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "size_bytes": self._size or 0,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+            self._size = 0
+            self._parsed.clear()
+            self._parsed_size = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def representation_headers(headers: httpx.Headers) -> List[Tuple[str, str]]:
+    return [(name, value) for name, value in headers.multi_items() if name.lower() not in HOP_HEADERS]
+
+
+def stats_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters accumulated between two ``stats()`` snapshots (size fields as of ``after``)"""
+    delta = {name: after[name] - before.get(name, 0) for name in ("hits", "misses", "stores", "evictions")}
+    delta["size_bytes"] = after["size_bytes"]
+    return delta
+
+
+class CacheTeeStream(httpx.AsyncByteStream):
+    """Response body passed to the reader as it arrives and spooled for the cache on the way.
+
+    The spool stays in memory up to CHUNK_BYTES and moves to a temporary file
+    beyond that. The entry is stored only once the body has been read to the
+    end; bodies over the cache's size bound are not kept at all.
+    """
+
+    def __init__(self, response: httpx.Response, cache: PlanningCenterResponseCache, key: str, url: str):
+        self.response = response
+        self.cache = cache
+        self.key = key
+        self.url = url
+
+    async def __aiter__(self):
+        spool = tempfile.SpooledTemporaryFile(max_size=CHUNK_BYTES)
+        size = 0
+        try:
+            async for chunk in self.response.aiter_bytes():
+                size += len(chunk)
+                if size > self.cache.max_bytes:
+                    spool.close()
+                elif not spool.closed:
+                    spool.write(chunk)
+                yield chunk
+            if not spool.closed:
+                await asyncio.to_thread(self.cache.store_file, self.key, self.url, self.response.headers, spool, size)
+        finally:
+            spool.close()
+
+    async def aclose(self):
+        await self.response.aclose()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Transport that revalidates cached GETs and answers 304s from the cache.
+
+    Responses without an ETag or Last-Modified pass through untouched; the
+    bodies of validated ones are streamed through ``CacheTeeStream``.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: PlanningCenterResponseCache):
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or "If-None-Match" in request.headers or "If-Modified-Since" in request.headers:
+            return await self.transport.handle_async_request(request)
+
+        key = self.cache.key(request)
+        cached = await asyncio.to_thread(self.cache.lookup, key)
+        if cached is not None:
+            if cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                request.headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await self.transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached is not None:
+            await response.aclose()
+            body = await asyncio.to_thread(self.cache.body, key)
+            if body is not None:
+                self.cache.record(hit=True)
+                headers = httpx.Headers(cached["headers"])
+                headers[CACHE_HEADER] = "revalidated"
+                return httpx.Response(200, headers=headers, content=body, request=request,
+                                      extensions={"pc_response_cache": (self.cache, key)})
+            # Evicted since the lookup: ask again without the validators
+            for name in ("If-None-Match", "If-Modified-Since"):
+                if name in request.headers:
+                    del request.headers[name]
+            response = await self.transport.handle_async_request(request)
+
+        self.cache.record(hit=False)
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if (response.status_code != 200 or "no-store" in cache_control
+                or not (response.headers.get("ETag") or response.headers.get("Last-Modified"))):
+            return response
+
+        headers = httpx.Headers(representation_headers(response.headers))
+        headers[CACHE_HEADER] = "stored"
+        return httpx.Response(response.status_code, headers=headers, request=request,
+                              stream=CacheTeeStream(response, self.cache, key, str(request.url)),
+                              extensions=dict(response.extensions, pc_response_cache=(self.cache, key)))
+
+    async def aclose(self):
+        await self.transport.aclose()
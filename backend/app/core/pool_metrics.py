@@ -0,0 +1,187 @@
+"""
+Connection pool telemetry and saturation fast-fail
+
+``PoolMetrics`` follows one engine's pool through pool events. It tracks:
+
+- connections opened and in use
+- how long each connection stays checked out
+- invalidations
+- failed pre-pings, reported through ``handle_error`` with ``is_pre_ping``
+
+Pool events fire only after a connection has been handed out, so the time
+spent waiting for one is measured by the pool class itself.
+``instrumented_pool_class`` derives a pool class whose ``connect()`` records
+that wait. With ``DATABASE_POOL_FAST_FAIL_MS`` set, the pool timeout is cut to
+that threshold and a checkout that runs out of time raises ``PoolSaturated``.
+The API answers that with 503 and ``Retry-After`` rather than letting requests
+queue for the full ``DATABASE_POOL_TIMEOUT``.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+from app.core.config import settings
+
+# Histogram bucket upper bounds, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000, 60000)
+
+
+class PoolSaturated(exc.TimeoutError):
+    """No pooled connection became free within DATABASE_POOL_FAST_FAIL_MS"""
+
+
+class Histogram:
+    """Counts of observed durations per bucket, plus count, sum and max"""
+
+    def __init__(self, bounds_ms: Sequence[float]):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}ms": count for bound, count in zip(self.bounds_ms, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class PoolMetrics:
+    """Live counters and histograms for one engine's connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait = Histogram(WAIT_BUCKETS_MS)
+        self.checkout_duration = Histogram(CHECKOUT_BUCKETS_MS)
+        self.connects = 0
+        self.checkouts = 0
+        self.in_use = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.timeouts = 0
+        self.last_timeout_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """Listen to the engine's pool (and the pools it is recreated with on dispose)"""
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["pool_checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        # Also fires for connections invalidated while checked out
+        checked_out_at = connection_record.info.pop("pool_checked_out_at", None)
+        if checked_out_at is None:
+            return
+        with self._lock:
+            self.in_use -= 1
+            self.checkout_duration.observe(time.perf_counter() - checked_out_at)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_error(self, context):
+        if getattr(context, "is_pre_ping", False):
+            with self._lock:
+                self.pre_ping_failures += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+                self.last_timeout_at = time.time()
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        """Counters, histograms and, for queue pools, the pool's own occupancy"""
+        with self._lock:
+            result = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "timeouts": self.timeouts,
+                "last_timeout_at": self.last_timeout_at,
+                "wait": self.wait.snapshot(),
+                "checkout_duration": self.checkout_duration.snapshot(),
+            }
+        if pool is not None:
+            result["pool_class"] = type(pool).__name__
+            if hasattr(pool, "checkedout"):
+                result.update({
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": pool.overflow(),
+                    "max_overflow": pool._max_overflow,
+                    "timeout_seconds": pool.timeout(),
+                })
+        return result
+
+
+def instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass of ``base`` whose checkouts record their wait in ``metrics``.
+
+    ``Pool.recreate()`` builds the replacement from ``self.__class__``, so the
+    pool an engine gets after ``dispose()`` keeps reporting to the same metrics.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError as e:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            if settings.DATABASE_POOL_FAST_FAIL_MS > 0 and not isinstance(e, PoolSaturated):
+                raise PoolSaturated(
+                    f"No database connection free within {settings.DATABASE_POOL_FAST_FAIL_MS}ms "
+                    f"({metrics.name} pool, size {self.size()}, overflow {self.overflow()})"
+                ) from e
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect, "metrics": metrics})
+
+
+def instrument_pool(config: Dict[str, Any], metrics: PoolMetrics) -> Dict[str, Any]:
+    """Engine keyword arguments with the configured pool class swapped for its instrumented subclass.
+
+    Without an explicit ``poolclass`` (SQLite) the dialect picks the pool; the
+    event-based metrics still apply, only the wait histogram stays empty.
+    """
+    if config.get("poolclass") is not None:
+        config = dict(config, poolclass=instrumented_pool_class(config["poolclass"], metrics))
+    return config
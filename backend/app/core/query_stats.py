@@ -0,0 +1,100 @@
+"""
+Per-request SQL statement statistics
+
+The cursor-execute listeners in ``app.core.database`` record every statement
+into the ``RequestQueryStats`` of the current request, which lives in a
+context variable. ``run_in_threadpool`` and SQLAlchemy's async greenlets both
+carry the context along, so sync and async endpoints are covered. Work outside
+a request, such as the sync workers, has no stats, and the listeners skip it.
+
+Statements are grouped by fingerprint, which is the SQL text with literals and
+expanded ``IN`` lists collapsed. A request that runs one shape many times is
+usually lazy-loading a relationship per row (N+1). With ``SQL_REPEAT_THRESHOLD``
+set, such a request is logged, or fails with ``RepeatedQueryError`` when
+``SQL_REPEAT_ACTION`` is ``raise``.
+"""
+
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(Exception):
+    """One request ran the same statement shape more than SQL_REPEAT_THRESHOLD times"""
+
+
+def statement_fingerprint(statement: str) -> str:
+    """The statement's shape: literals become ``?`` and ``IN`` lists of any length ``IN (...)``"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """Statement count, database time and repeated statement shapes of one request"""
+
+    def __init__(self, label: Optional[str] = None, repeat_threshold: Optional[int] = None,
+                 repeat_action: Optional[str] = None):
+        self.label = label  # e.g. "GET /api/v1/people/"
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self.repeat_threshold = settings.SQL_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        self.repeat_action = repeat_action or settings.SQL_REPEAT_ACTION
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        fingerprint = statement_fingerprint(statement)
+        self.fingerprints[fingerprint] += 1
+        # Flag each shape once, when it first goes over the threshold
+        if self.repeat_threshold and self.fingerprints[fingerprint] == self.repeat_threshold + 1:
+            message = f"Statement repeated more than {self.repeat_threshold} times in one request: {fingerprint[:300]}"
+            if self.repeat_action == "raise":
+                raise RepeatedQueryError(message)
+            logger.warning(message)
+
+    def repeated(self, minimum: int = 2) -> List[Tuple[str, int]]:
+        """Statement shapes run at least ``minimum`` times, most frequent first"""
+        return [(fingerprint, count) for fingerprint, count in self.fingerprints.most_common() if count >= minimum]
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` metric for the request's database work"""
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self) -> str:
+        """Short description for the request log"""
+        text = f"{self.count} queries, {self.seconds * 1000:.1f}ms db"
+        repeated = self.repeated()
+        if repeated:
+            text += f", max repeat {repeated[0][1]}x"
+        return text
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def start_request_stats(label: Optional[str] = None) -> Tuple[RequestQueryStats, Token]:
+    """Start collecting for the current request; pass the token to ``stop_request_stats``"""
+    stats = RequestQueryStats(label)
+    return stats, _current_stats.set(stats)
+
+
+def stop_request_stats(token: Token):
+    _current_stats.reset(token)
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
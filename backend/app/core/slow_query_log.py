@@ -0,0 +1,204 @@
+"""
+Slow-query log with query plans
+
+The cursor-execute listeners in ``app.core.database`` pass every statement's
+duration to ``slow_query_log``. Statements slower than
+``SLOW_QUERY_THRESHOLD_MS`` are kept in a bounded ring buffer along with:
+
+- their fingerprint, the SQL text with inlined literals replaced by ``?``
+  (the raw text is never stored)
+- their parameters, with strings and other values that may be personal data redacted
+- the application call site
+- the request they ran in
+- the plan from ``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN`` (PostgreSQL/MySQL)
+
+The plan is fetched right away on a fresh cursor of the same connection. That
+cursor bypasses the engine events, and on PostgreSQL it runs inside a
+savepoint so a failed EXPLAIN cannot abort the caller's transaction. Only the
+plan is requested, never ``ANALYZE``, so the statement is not run a second
+time. The newest entries are served by the admin diagnostics endpoint.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import deque
+from datetime import date, datetime, time as time_of_day
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.query_stats import current_request_stats, statement_fingerprint
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames in these files are the instrumentation itself, not the caller
+SKIPPED_FILES = {os.path.abspath(__file__), os.path.join(APP_DIR, "core", "database.py")}
+
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN "}
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+FULL_SCAN = re.compile(r"^\s*(?:SCAN (?:TABLE )?\S+\s*$|.*\bSeq Scan\b)")
+
+
+def redact_value(value: Any) -> Any:
+    """Numbers, booleans, dates and None as they are; anything else by type and length only"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {name: redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+def _frames():
+    """Current stack, continued into the parent greenlet for statements run under asyncio"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    try:
+        from greenlet import getcurrent
+    except ImportError:
+        return
+    parent = getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def call_site() -> Optional[str]:
+    """Innermost application frame that led to the statement, as ``path:line in function``"""
+    for frame in _frames():
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(APP_DIR + os.sep) and filename not in SKIPPED_FILES:
+            relative = os.path.relpath(filename, os.path.dirname(APP_DIR))
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return None
+
+
+class SlowQueryLog:
+    """Ring buffer of statements slower than ``threshold_ms``, with their plans"""
+
+    def __init__(self, threshold_ms: float, capacity: int, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.recorded = 0
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "SlowQueryLog":
+        return cls(settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_LOG_SIZE, settings.SLOW_QUERY_EXPLAIN)
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen
+
+    def observe(self, conn, statement: str, parameters: Any, seconds: float, executemany: bool = False):
+        """Record the statement if it took longer than the threshold; never raises"""
+        if self.threshold_ms <= 0 or seconds * 1000 < self.threshold_ms:
+            return
+        try:
+            self._record(conn, statement, parameters, seconds, executemany)
+        except Exception as e:
+            logger.debug(f"Could not record slow query: {e}")
+
+    def _record(self, conn, statement: str, parameters: Any, seconds: float, executemany: bool):
+        stats = current_request_stats()
+        first_parameters = parameters[0] if executemany and parameters else parameters
+        entry = {
+            "recorded_at": datetime.utcnow().isoformat(),
+            "duration_ms": round(seconds * 1000, 2),
+            "fingerprint": statement_fingerprint(statement),
+            "parameters": redact_parameters(first_parameters),
+            "executemany": len(parameters) if executemany and parameters else None,
+            "call_site": call_site(),
+            "request": stats.label if stats is not None else None,
+            "plan": None,
+            "full_scan": None,
+        }
+        if self.explain:
+            entry.update(self._explain(conn, statement, first_parameters))
+        logger.warning(
+            f"Slow query ({entry['duration_ms']}ms) at {entry['call_site'] or 'unknown call site'}: "
+            f"{entry['fingerprint'][:300]}"
+        )
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Dict[str, Any]:
+        dialect = conn.dialect.name
+        prefix = EXPLAIN_PREFIXES.get(dialect)
+        if prefix is None or not EXPLAINABLE.match(statement):
+            return {}
+        cursor = conn.connection.cursor()
+        savepoint = False
+        try:
+            if dialect == "postgresql":
+                try:
+                    cursor.execute("SAVEPOINT slow_query_explain")
+                    savepoint = True
+                except Exception:
+                    pass  # not in a transaction, nothing to protect
+            try:
+                if parameters:
+                    cursor.execute(prefix + statement, parameters)
+                else:
+                    cursor.execute(prefix + statement)
+                rows = cursor.fetchall()
+            except Exception as e:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return {"plan": None, "explain_error": str(e)}
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+        plan = [self._plan_line(dialect, row) for row in rows]
+        return {"plan": plan, "full_scan": any(FULL_SCAN.match(line) for line in plan)}
+
+    @staticmethod
+    def _plan_line(dialect: str, row) -> str:
+        if dialect == "sqlite":
+            return str(row[-1])  # (id, parent, notused, detail)
+        if len(row) == 1:
+            return str(row[0])
+        return " | ".join("" if value is None else str(value) for value in row)
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recorded statements, newest first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "capacity": self.capacity,
+                "buffered": len(self._entries),
+                "recorded": self.recorded,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog.from_settings()
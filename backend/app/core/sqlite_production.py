@@ -0,0 +1,158 @@
+"""
+SQLite production mode: one writer connection, a pool of read-only readers
+
+WAL lets readers run alongside a writer, but SQLite still allows only one
+writer at a time. Several connections competing for that lock (sync workers,
+access-log inserts, login updates) end in "database is locked" once
+busy_timeout runs out. With ``SQLITE_PRODUCTION_MODE`` on, ``app.core.database``
+changes three things:
+
+- The main engine becomes the writer: a queue pool of exactly one connection.
+  Writers wait their turn in the pool, and the pool metrics and the
+  DATABASE_POOL_FAST_FAIL_MS 503 apply to that wait.
+- A separate read engine holds ``SQLITE_READ_POOL_SIZE`` connections with
+  ``PRAGMA query_only``. The async engine is configured the same way, because
+  async endpoints only read.
+- ``SessionLocal`` makes ``SQLiteRoutingSession`` objects. Each one sends
+  SELECTs to the read pool and everything else to the writer. Once it has
+  written, it stays on the writer until its transaction ends, so it reads its
+  own uncommitted changes.
+
+A session holds the writer connection from its first write until it commits
+or rolls back, so writes should be committed promptly. ``SQLiteMaintenance``
+runs ``PRAGMA optimize`` periodically on the writer.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.expression import CompoundSelect, Select, TextClause
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+WRITER_PINNED = "sqlite_writer_pinned"
+READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+
+def is_sqlite_production_mode(url: str) -> bool:
+    """Whether SQLITE_PRODUCTION_MODE applies: the connections need a database file to share"""
+    if not settings.SQLITE_PRODUCTION_MODE or not url.startswith("sqlite"):
+        return False
+    database = url.split("://", 1)[1].lstrip("/")
+    return bool(database) and ":memory:" not in database
+
+
+def sqlite_writer_config(pool_timeout: float) -> Dict[str, Any]:
+    """Engine keyword arguments for the single writer connection"""
+    return {
+        "echo": settings.DATABASE_ECHO,
+        "pool_pre_ping": True,
+        "connect_args": {"check_same_thread": False},
+        "poolclass": QueuePool,
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": pool_timeout,
+    }
+
+
+def sqlite_reader_config(poolclass: type = QueuePool) -> Dict[str, Any]:
+    """Engine keyword arguments for the read-only connection pool"""
+    return {
+        "echo": settings.DATABASE_ECHO,
+        "pool_pre_ping": True,
+        "connect_args": {"check_same_thread": False},
+        "poolclass": poolclass,
+        "pool_size": settings.SQLITE_READ_POOL_SIZE,
+        "max_overflow": 0,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    }
+
+
+def set_sqlite_read_only(dbapi_connection, connection_record):
+    """Refuse writes on reader connections, so a mis-routed write fails instead of taking the lock"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _is_read(clause) -> bool:
+    if isinstance(clause, (Select, CompoundSelect)):
+        return True
+    if isinstance(clause, TextClause):
+        return bool(READ_STATEMENT.match(clause.text))
+    return False
+
+
+class SQLiteRoutingSession(Session):
+    """Session that reads from the read pool and writes through the single writer connection"""
+
+    def __init__(self, *args, writer: Engine, reader: Engine, **kwargs):
+        kwargs.setdefault("bind", writer)
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get(WRITER_PINNED) or self._flushing or not _is_read(clause):
+            self.info[WRITER_PINNED] = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    """Let the next transaction read from the pool again"""
+    if transaction.parent is None:
+        session.info.pop(WRITER_PINNED, None)
+
+
+class SQLiteMaintenance:
+    """Background thread running ``PRAGMA optimize`` every SQLITE_OPTIMIZE_INTERVAL seconds"""
+
+    def __init__(self, engine: Engine, interval: Optional[float] = None):
+        self.engine = engine
+        self.interval = settings.SQLITE_OPTIMIZE_INTERVAL if interval is None else interval
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the thread and optimize once more, as SQLite recommends before closing"""
+        if not self.is_running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self.optimize()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.optimize()
+
+    def optimize(self):
+        """Let SQLite refresh the statistics its planner needs; cheap when nothing changed"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+                conn.commit()
+            self.runs += 1
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
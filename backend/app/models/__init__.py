@@ -20,6 +20,7 @@ from .planning_center_sync_log import PlanningCenterSyncLog
 from .planning_center_webhook_events import PlanningCenterWebhookEvents
 from .planning_center_events_cache import PlanningCenterEventsCache
 from .planning_center_registrations_cache import PlanningCenterRegistrationsCache
+from .planning_center_sync_job import PlanningCenterSyncJob
 from .audit_log import AuditLog
 
 __all__ = [
@@ -45,5 +46,6 @@ __all__ = [
     "PlanningCenterWebhookEvents",
     "PlanningCenterEventsCache",
     "PlanningCenterRegistrationsCache",
+    "PlanningCenterSyncJob",
     "AuditLog"
 ]
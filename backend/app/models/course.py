@@ -24,7 +24,9 @@ class Course(Base):
     event_end_date = Column(DateTime(timezone=True), nullable=True)
     max_capacity = Column(Integer, nullable=True)
     current_registrations = Column(Integer, default=0, nullable=False)
+    pc_fingerprint = Column(String(64), nullable=True)  # hash of the PC values last written
     is_active = Column(Boolean, default=True, nullable=False)
+    pc_missing_since = Column(DateTime(timezone=True), nullable=True)  # set when a full sync deactivated it as gone from PC
     
     # Content settings
     content_unlock_mode = Column(String(20), default="immediate", nullable=False)  # 'immediate' or 'progressive'
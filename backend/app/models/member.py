@@ -31,7 +31,9 @@ class People(Base):
     status = Column(String(50), nullable=True, default="active")
     join_date = Column(Date, nullable=True)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    pc_fingerprint = Column(String(64), nullable=True)  # hash of the PC values last written
     is_active = Column(Boolean, default=True, nullable=False)
+    pc_missing_since = Column(DateTime(timezone=True), nullable=True)  # set when a full sync deactivated it as gone from PC
     
     # CSV source tracking
     data_source = Column(String(20), nullable=True)  # 'csv', 'api', 'manual', etc.
@@ -23,5 +23,6 @@ class PlanningCenterEventsCache(Base):
     registration_deadline = Column(DateTime(timezone=True), nullable=True)
     event_status = Column(String(50), nullable=True)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    pc_fingerprint = Column(String(64), nullable=True)  # hash of the PC values last written
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
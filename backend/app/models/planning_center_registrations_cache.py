@@ -21,5 +21,6 @@ class PlanningCenterRegistrationsCache(Base):
     registration_notes = Column(Text, nullable=True)
     custom_field_responses = Column(JSON, nullable=True)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    pc_fingerprint = Column(String(64), nullable=True)  # hash of the PC values last written
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,32 @@
+"""
+PlanningCenterSyncJob SQLAlchemy model
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class PlanningCenterSyncJob(Base):
+    """PlanningCenterSyncJob model for queued and running sync tasks"""
+    
+    __tablename__ = "planning_center_sync_jobs"
+    
+    id = Column(String(36), primary_key=True)  # task id returned to API clients
+    task_type = Column(String(50), nullable=False, index=True)  # sync_people, sync_events, sync_registrations, sync_all
+    parent_id = Column(String(36), nullable=True, index=True)  # stage of a sync_all job; never claimed on its own
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, running, completed, failed, cancelled
+    lock_key = Column(String(50), nullable=True, unique=True)  # held while pending/running, by stages too, so a sync type runs once
+    params = Column(JSON, nullable=True)
+    progress = Column(Integer, default=0, nullable=False)
+    message = Column(Text, nullable=True)
+    details = Column(JSON, nullable=True)  # mode, API throughput and other live status fields
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
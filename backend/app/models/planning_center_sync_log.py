@@ -13,11 +13,18 @@ class PlanningCenterSyncLog(Base):
     __tablename__ = "planning_center_sync_log"
     
     id = Column(Integer, primary_key=True, index=True)
-    sync_type = Column(String(50), nullable=False)  # people, events, registrations, custom_fields
+    sync_type = Column(String(50), nullable=False)  # people, events, registrations, all, custom_fields
     sync_direction = Column(String(20), nullable=False)  # from_pc, to_pc
     records_processed = Column(Integer, default=0, nullable=False)
     records_successful = Column(Integer, default=0, nullable=False)
     records_failed = Column(Integer, default=0, nullable=False)
+    records_unchanged = Column(Integer, default=0, nullable=False)  # successful records that needed no write
+    records_deactivated = Column(Integer, default=0, nullable=False)  # local rows deactivated as deleted in PC
+    sync_mode = Column(String(20), nullable=True)  # full, incremental
+    high_water_mark = Column(DateTime(timezone=True), nullable=True)  # max PC updated_at applied by this run
+    task_id = Column(String(36), nullable=True, index=True)  # sync job running (or last running) this log
+    checkpoint = Column(JSON, nullable=True)  # resume point of an unfinished run; cleared on success
+    stage_timings = Column(JSON, nullable=True)  # sync_all: when each stage waited, started and finished
     error_details = Column(JSON, nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -19,4 +19,7 @@ class PlanningCenterWebhookEvents(Base):
     processed = Column(Boolean, default=False, nullable=False)
     processed_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(Text, nullable=True)
+    claim_token = Column(String(36), nullable=True, index=True)  # batch currently processing this row
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)  # failed processing attempts so far
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -14,6 +14,8 @@ class PlanningCenterSyncLogBase(BaseModel):
     records_processed: int = Field(default=0, ge=0)
     records_successful: int = Field(default=0, ge=0)
     records_failed: int = Field(default=0, ge=0)
+    sync_mode: Optional[str] = Field(None, pattern="^(full|incremental)$")
+    high_water_mark: Optional[datetime] = None
     error_details: Optional[Dict[str, Any]] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
@@ -10,8 +10,9 @@ import uuid
 import mimetypes
 from typing import List, Optional, Dict, Any, BinaryIO
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, and_, or_, desc, func, select
 from fastapi import UploadFile, HTTPException, status
 try:
     import boto3
@@ -34,6 +35,21 @@ from app.schemas.course_content import (
 from app.core.config import settings
 
 
+def modules_query(course_id: int) -> Select:
+    """A course's modules in order, with their content items loaded up front"""
+    return select(CourseModule).where(
+        CourseModule.course_id == course_id
+    ).options(selectinload(CourseModule.content_items)).order_by(CourseModule.order_index)
+
+
+def content_query(course_id: int, module_id: Optional[int] = None) -> Select:
+    """A course's content in order, optionally limited to one module"""
+    query = select(CourseContent).where(CourseContent.course_id == course_id)
+    if module_id:
+        query = query.where(CourseContent.module_id == module_id)
+    return query.order_by(CourseContent.order_index)
+
+
 class ContentService:
     """Service for managing course content"""
     
@@ -92,9 +108,7 @@ class ContentService:
     
     def get_modules(self, course_id: int) -> List[CourseModule]:
         """Get all modules for a course"""
-        return self.db.query(CourseModule).filter(
-            CourseModule.course_id == course_id
-        ).order_by(CourseModule.order_index).all()
+        return list(self.db.scalars(modules_query(course_id)))
     
     def get_module(self, module_id: int) -> Optional[CourseModule]:
         """Get a specific module"""
@@ -282,12 +296,7 @@ class ContentService:
     
     def get_content(self, course_id: int, module_id: Optional[int] = None) -> List[CourseContent]:
         """Get content for a course, optionally filtered by module"""
-        query = self.db.query(CourseContent).filter(CourseContent.course_id == course_id)
-        
-        if module_id:
-            query = query.filter(CourseContent.module_id == module_id)
-        
-        return query.order_by(CourseContent.order_index).all()
+        return list(self.db.scalars(content_query(course_id, module_id)))
     
     def get_content_item(self, content_id: int) -> Optional[CourseContent]:
         """Get a specific content item"""
@@ -585,3 +594,28 @@ class ContentService:
         )
         self.db.add(audit_log)
         self.db.commit()
+
+
+class AsyncContentService:
+    """Read-only content listings on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_modules(self, course_id: int) -> List[CourseModule]:
+        """Get all modules for a course"""
+        return list(await self.db.scalars(modules_query(course_id)))
+    
+    async def get_module(self, module_id: int) -> Optional[CourseModule]:
+        """Get a specific module"""
+        return (await self.db.scalars(
+            select(CourseModule).where(CourseModule.id == module_id).options(selectinload(CourseModule.content_items))
+        )).first()
+    
+    async def get_content(self, course_id: int, module_id: Optional[int] = None) -> List[CourseContent]:
+        """Get content for a course, optionally filtered by module"""
+        return list(await self.db.scalars(content_query(course_id, module_id)))
+    
+    async def get_content_item(self, content_id: int) -> Optional[CourseContent]:
+        """Get a specific content item"""
+        return (await self.db.scalars(select(CourseContent).where(CourseContent.id == content_id).limit(1))).first()
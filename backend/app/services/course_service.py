@@ -2,12 +2,54 @@
 Course service layer (Maps to Planning Center Events)
 """
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
 from app.schemas.course import CourseCreate, CourseUpdate
 from app.models.course import Course as CourseModel
+from app.services.planning_center_fingerprint import fingerprint
+
+
+def map_pc_course(pc_event_data: dict) -> Dict[str, Any]:
+    """Map a flattened PC event payload onto Course column values.
+
+    ``title`` and ``description`` are only present when PC sent them, so an
+    update keeps the local values otherwise.
+    """
+    row = {
+        "planning_center_event_name": pc_event_data.get("name"),
+        "event_start_date": pc_event_data.get("start_date"),
+        "event_end_date": pc_event_data.get("end_date"),
+        "max_capacity": pc_event_data.get("max_capacity"),
+        "current_registrations": pc_event_data.get("current_registrations", 0),
+    }
+    title = pc_event_data.get("title", pc_event_data.get("name"))
+    if title is not None:
+        row["title"] = title
+    if "description" in pc_event_data:
+        row["description"] = pc_event_data["description"]
+    return row
+
+
+def course_fingerprint(pc_event_data: dict) -> str:
+    """Fingerprint of the Course values a PC event maps to"""
+    return fingerprint(map_pc_course(pc_event_data))
+
+
+def _is_unchanged(stored_fingerprint: Optional[str], pc_missing_since: Optional[datetime], row_fingerprint: str) -> bool:
+    """A stored course matches the payload and was not deactivated as gone from PC"""
+    return stored_fingerprint == row_fingerprint and pc_missing_since is None
+
+
+def courses_query(skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> Select:
+    """Page of courses, optionally filtered by active flag"""
+    query = select(CourseModel)
+    if is_active is not None:
+        query = query.where(CourseModel.is_active == is_active)
+    return query.offset(skip).limit(limit)
 
 
 class CourseService:
@@ -18,10 +60,7 @@ class CourseService:
     
     def get_courses(self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> List[CourseModel]:
         """Get all courses with pagination and optional filtering"""
-        query = self.db.query(CourseModel)
-        if is_active is not None:
-            query = query.filter(CourseModel.is_active == is_active)
-        return query.offset(skip).limit(limit).all()
+        return list(self.db.scalars(courses_query(skip, limit, is_active)))
     
     def get_course(self, course_id: int) -> Optional[CourseModel]:
         """Get a specific course by ID"""
@@ -71,37 +110,79 @@ class CourseService:
         self.db.commit()
         return True
     
-    def sync_from_planning_center(self, pc_event_data: dict, updated_by: Optional[int] = None) -> CourseModel:
-        """Sync course data from Planning Center event"""
+    def sync_from_planning_center(self, pc_event_data: dict, updated_by: Optional[int] = None,
+                                  commit: bool = True) -> CourseModel:
+        """Sync course data from Planning Center event; unchanged courses are not rewritten.
+        
+        With ``commit=False`` the write is only flushed, for callers that
+        commit it as part of a larger batch.
+        """
         pc_event_id = pc_event_data.get("id")
+        row = map_pc_course(pc_event_data)
+        row_fingerprint = fingerprint(row)
         
         # Check if course already exists
         existing_course = self.get_course_by_pc_event_id(pc_event_id)
         
         if existing_course:
+            if _is_unchanged(existing_course.pc_fingerprint, existing_course.pc_missing_since, row_fingerprint):
+                return existing_course
+            
             # Update existing course
-            existing_course.title = pc_event_data.get("title", pc_event_data.get("name", existing_course.title))
-            existing_course.description = pc_event_data.get("description", existing_course.description)
-            existing_course.planning_center_event_name = pc_event_data.get("name")
-            existing_course.event_start_date = pc_event_data.get("start_date")
-            existing_course.event_end_date = pc_event_data.get("end_date")
-            existing_course.max_capacity = pc_event_data.get("max_capacity")
-            existing_course.current_registrations = pc_event_data.get("current_registrations", 0)
+            for field, value in row.items():
+                setattr(existing_course, field, value)
+            existing_course.data_source = "api"
+            if existing_course.pc_missing_since is not None:
+                # Listed again after a sync deactivated it as gone; admin deactivations stay
+                existing_course.is_active = True
+                existing_course.pc_missing_since = None
+            existing_course.pc_fingerprint = row_fingerprint
             existing_course.updated_at = datetime.now(timezone.utc)
             existing_course.updated_by = updated_by
-            self.db.commit()
-            self.db.refresh(existing_course)
+            self._save(existing_course, commit)
             return existing_course
         else:
             # Create new course
-            course_data = CourseCreate(
-                title=pc_event_data.get("title", pc_event_data.get("name", "Unknown Course")),
-                description=pc_event_data.get("description"),
-                planning_center_event_id=pc_event_id,
-                planning_center_event_name=pc_event_data.get("name"),
-                event_start_date=pc_event_data.get("start_date"),
-                event_end_date=pc_event_data.get("end_date"),
-                max_capacity=pc_event_data.get("max_capacity"),
-                current_registrations=pc_event_data.get("current_registrations", 0)
-            )
-            return self.create_course(course_data, created_by=updated_by)
+            course_data = CourseCreate(**dict(
+                row,
+                title=row.get("title", "Unknown Course"),
+                description=row.get("description"),
+                planning_center_event_id=pc_event_id
+            ))
+            db_course = CourseModel(**course_data.model_dump(), data_source="api", pc_fingerprint=row_fingerprint)
+            db_course.created_at = datetime.now(timezone.utc)
+            db_course.updated_at = datetime.now(timezone.utc)
+            db_course.created_by = updated_by
+            
+            self.db.add(db_course)
+            self._save(db_course, commit)
+            return db_course
+    
+    def _save(self, db_course: CourseModel, commit: bool):
+        """Commit a synced course, or only flush it into the caller's transaction"""
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_course)
+        else:
+            self.db.flush()
+
+
+class AsyncCourseService:
+    """Read-only course queries on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_courses(self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> List[CourseModel]:
+        """Get all courses with pagination and optional filtering"""
+        return list(await self.db.scalars(courses_query(skip, limit, is_active)))
+    
+    async def get_course(self, course_id: int) -> Optional[CourseModel]:
+        """Get a specific course by ID"""
+        return (await self.db.scalars(select(CourseModel).where(CourseModel.id == course_id).limit(1))).first()
+    
+    async def get_course_by_pc_event_id(self, pc_event_id: str) -> Optional[CourseModel]:
+        """Get a course by Planning Center event ID"""
+        return (await self.db.scalars(
+            select(CourseModel).where(CourseModel.planning_center_event_id == pc_event_id).limit(1)
+        )).first()
@@ -2,12 +2,33 @@
 CourseEnrollment service layer (Maps to Planning Center Registrations)
 """
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
 from app.schemas.enrollment import CourseEnrollmentCreate, CourseEnrollmentUpdate
 from app.models.enrollment import CourseEnrollment as CourseEnrollmentModel
+from app.services.planning_center_id_index import PlanningCenterIdIndex
+
+
+def enrollments_query(
+    skip: int = 0,
+    limit: int = 100,
+    course_id: Optional[int] = None,
+    people_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> Select:
+    """Page of enrollments with optional course/person/status filters"""
+    query = select(CourseEnrollmentModel)
+    if course_id:
+        query = query.where(CourseEnrollmentModel.course_id == course_id)
+    if people_id:
+        query = query.where(CourseEnrollmentModel.people_id == people_id)
+    if status:
+        query = query.where(CourseEnrollmentModel.status == status)
+    return query.offset(skip).limit(limit)
 
 
 class CourseEnrollmentService:
@@ -25,16 +46,7 @@ class CourseEnrollmentService:
         status: Optional[str] = None
     ) -> List[CourseEnrollmentModel]:
         """Get enrollments with optional filtering"""
-        query = self.db.query(CourseEnrollmentModel)
-        
-        if course_id:
-            query = query.filter(CourseEnrollmentModel.course_id == course_id)
-        if people_id:
-            query = query.filter(CourseEnrollmentModel.people_id == people_id)
-        if status:
-            query = query.filter(CourseEnrollmentModel.status == status)
-        
-        return query.offset(skip).limit(limit).all()
+        return list(self.db.scalars(enrollments_query(skip, limit, course_id, people_id, status)))
     
     def get_enrollment(self, enrollment_id: int) -> Optional[CourseEnrollmentModel]:
         """Get a specific enrollment by ID"""
@@ -104,9 +116,27 @@ class CourseEnrollmentService:
         self.db.commit()
         return True
     
-    def sync_from_planning_center(self, pc_registration_data: dict, updated_by: Optional[int] = None) -> CourseEnrollmentModel:
-        """Sync enrollment data from Planning Center registration"""
+    def sync_from_planning_center(
+        self,
+        pc_registration_data: dict,
+        updated_by: Optional[int] = None,
+        id_index: Optional[PlanningCenterIdIndex] = None,
+        commit: bool = True
+    ) -> Optional[CourseEnrollmentModel]:
+        """Sync enrollment data from Planning Center registration.
+        
+        The registration's PC person and event ids are resolved to local ids
+        through ``id_index``; pass one index for a whole sync run to avoid
+        per-record lookups. Returns None if the person or course has not been
+        synced yet, rather than creating an enrollment that points nowhere.
+        With ``commit=False`` the write is only flushed, for callers that
+        commit it as part of a larger batch.
+        """
         pc_registration_id = pc_registration_data.get("id")
+        if id_index is None:
+            id_index = PlanningCenterIdIndex(self.db)
+        people_id = id_index.person_id(pc_registration_data.get("person_id"))
+        course_id = id_index.course_id(pc_registration_data.get("event_id"))
         
         # Check if enrollment already exists
         existing_enrollment = self.get_enrollment_by_pc_registration_id(pc_registration_id)
@@ -115,23 +145,45 @@ class CourseEnrollmentService:
             # Update existing enrollment
             existing_enrollment.registration_status = pc_registration_data.get("status")
             existing_enrollment.registration_notes = pc_registration_data.get("notes")
+            # Repair enrollments created before their person/course could be resolved
+            if people_id and not existing_enrollment.people_id:
+                existing_enrollment.people_id = people_id
+            if course_id and not existing_enrollment.course_id:
+                existing_enrollment.course_id = course_id
             existing_enrollment.updated_at = datetime.utcnow()
             existing_enrollment.updated_by = updated_by
-            self.db.commit()
-            self.db.refresh(existing_enrollment)
+            self._save(existing_enrollment, commit)
             return existing_enrollment
+        elif people_id is None or course_id is None:
+            return None
         else:
-            # Create new enrollment (requires people_id and course_id to be resolved)
-            # This would typically be called after people and courses are synced
+            # Create new enrollment (the create schema has no PC registration id)
             enrollment_data = CourseEnrollmentCreate(
-                people_id=0,  # This would need to be resolved from PC person ID
-                course_id=0,  # This would need to be resolved from PC event ID
-                planning_center_registration_id=pc_registration_id,
+                people_id=people_id,
+                course_id=course_id,
                 registration_status=pc_registration_data.get("status"),
                 registration_notes=pc_registration_data.get("notes"),
-                enrollment_date=pc_registration_data.get("created_at", datetime.utcnow())
+                enrollment_date=pc_registration_data.get("created_at") or datetime.utcnow()
+            )
+            db_enrollment = CourseEnrollmentModel(
+                **enrollment_data.dict(),
+                planning_center_registration_id=pc_registration_id
             )
-            return self.create_enrollment(enrollment_data, created_by=updated_by)
+            db_enrollment.created_at = datetime.utcnow()
+            db_enrollment.updated_at = datetime.utcnow()
+            db_enrollment.created_by = updated_by
+            
+            self.db.add(db_enrollment)
+            self._save(db_enrollment, commit)
+            return db_enrollment
+    
+    def _save(self, db_enrollment: CourseEnrollmentModel, commit: bool):
+        """Commit a synced enrollment, or only flush it into the caller's transaction"""
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_enrollment)
+        else:
+            self.db.flush()
     
     def update_progress(self, enrollment_id: int, progress_percentage: float, updated_by: Optional[int] = None) -> Optional[CourseEnrollmentModel]:
         """Update enrollment progress percentage"""
@@ -151,3 +203,34 @@ class CourseEnrollmentService:
         self.db.commit()
         self.db.refresh(db_enrollment)
         return db_enrollment
+
+
+class AsyncCourseEnrollmentService:
+    """Read-only enrollment queries on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_enrollments(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        course_id: Optional[int] = None,
+        people_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> List[CourseEnrollmentModel]:
+        """Get enrollments with optional filtering"""
+        return list(await self.db.scalars(enrollments_query(skip, limit, course_id, people_id, status)))
+    
+    async def get_enrollment(self, enrollment_id: int) -> Optional[CourseEnrollmentModel]:
+        """Get a specific enrollment by ID"""
+        return (await self.db.scalars(
+            select(CourseEnrollmentModel).where(CourseEnrollmentModel.id == enrollment_id).limit(1)
+        )).first()
+    
+    async def get_enrollment_by_pc_registration_id(self, pc_registration_id: str) -> Optional[CourseEnrollmentModel]:
+        """Get enrollment by Planning Center registration ID"""
+        return (await self.db.scalars(
+            select(CourseEnrollmentModel)
+            .where(CourseEnrollmentModel.planning_center_registration_id == pc_registration_id).limit(1)
+        )).first()
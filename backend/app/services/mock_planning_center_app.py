@@ -0,0 +1,196 @@
+"""
+In-process Planning Center API stand-in
+
+Serves ``MockPlanningCenterService`` data on the real Planning Center paths
+(``/people/v2/people``, ``/events/v2/events``, ...) as JSON:API documents with
+PC-style ``meta``/``links`` paging and ``where[updated_at][gte]`` filtering.
+It is a plain ASGI app, so sync code can be pointed at it without network
+access::
+
+    app = create_mock_planning_center_app(MockPlanningCenterService(seed=1, people_count=100_000))
+    transport = httpx.ASGITransport(app=app)
+
+Every GET carries an ``ETag`` and answers ``If-None-Match`` with a 304, like
+the real API, so conditional requests can be exercised too.
+
+Latency, 429 throttling and 5xx errors can be injected to exercise the
+client's retry and rate-limit handling. Faults are drawn from a generator
+seeded with the service seed, so a sequential run is reproducible.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.services.mock_planning_center_service import MockPlanningCenterService
+
+# Flat mock keys that are JSON:API relationships on the real API
+RELATIONSHIPS = {"person_id": ("person", "Person"), "event_id": ("event", "Event")}
+
+ERROR_STATUSES = (500, 502, 503)
+
+
+def to_resource(resource_type: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a flat mock record as a JSON:API resource"""
+    attributes = {key: value for key, value in record.items() if key != "id" and key not in RELATIONSHIPS}
+    resource = {"type": resource_type, "id": record["id"], "attributes": attributes}
+    relationships = {
+        name: {"data": {"type": related_type, "id": record[key]}}
+        for key, (name, related_type) in RELATIONSHIPS.items() if record.get(key)
+    }
+    if relationships:
+        resource["relationships"] = relationships
+    return resource
+
+
+class MockPlanningCenterFaults:
+    """Fault injection settings and counters for the mock API app"""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency: Optional[float] = None,
+        throttle_rate: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        retry_after: float = 1,
+        rate_limit: Optional[int] = None,
+        rate_period: int = 20
+    ):
+        self.latency = settings.MOCK_PLANNING_CENTER_LATENCY_MS / 1000 if latency is None else latency
+        self.throttle_rate = settings.MOCK_PLANNING_CENTER_THROTTLE_RATE if throttle_rate is None else throttle_rate
+        self.error_rate = settings.MOCK_PLANNING_CENTER_ERROR_RATE if error_rate is None else error_rate
+        self.retry_after = retry_after
+        # Optional PC-style request budget, advertised in X-PCO-API-Request-Rate-* headers
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self._rng = random.Random(f"{seed}:faults")
+        self._window_started = float("-inf")
+        self._window_count = 0
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+
+    def _rate_headers(self, now: float) -> Dict[str, str]:
+        if not self.rate_limit:
+            return {}
+        if now - self._window_started >= self.rate_period:
+            self._window_started = now
+            self._window_count = 0
+        self._window_count += 1
+        return {
+            "X-PCO-API-Request-Rate-Limit": str(self.rate_limit),
+            "X-PCO-API-Request-Rate-Period": str(self.rate_period),
+            "X-PCO-API-Request-Rate-Count": str(self._window_count),
+        }
+
+    def check(self, now: float) -> Tuple[Optional[JSONResponse], Dict[str, str]]:
+        """Decide whether a request fails; returns (failure response or None, rate headers)"""
+        self.stats["requests"] += 1
+        headers = self._rate_headers(now)
+        over_budget = self.rate_limit and self._window_count > self.rate_limit
+        if over_budget or self._rng.random() < self.throttle_rate:
+            self.stats["throttled"] += 1
+            retry_after = self.rate_period - (now - self._window_started) if over_budget else self.retry_after
+            headers["Retry-After"] = str(max(0, round(retry_after, 3)))
+            return JSONResponse({"errors": [{"status": "429", "title": "Too Many Requests"}]},
+                                status_code=429, headers=headers), headers
+        if self._rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            code = self._rng.choice(ERROR_STATUSES)
+            return JSONResponse({"errors": [{"status": str(code), "title": "Injected failure"}]},
+                                status_code=code, headers=headers), headers
+        return None, headers
+
+
+def conditional_response(request: Request, body: Dict[str, Any]) -> Response:
+    """JSON response with an ETag; 304 when the client already holds this version"""
+    content = json.dumps(body, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(content).hexdigest()}"'
+    if etag in [value.strip() for value in request.headers.get("If-None-Match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content, media_type="application/json", headers={"ETag": etag})
+
+
+def create_mock_planning_center_app(
+    service: Optional[MockPlanningCenterService] = None,
+    faults: Optional[MockPlanningCenterFaults] = None
+) -> FastAPI:
+    """Build an ASGI app serving the mock data on Planning Center's API paths"""
+    service = service or MockPlanningCenterService()
+    faults = faults or MockPlanningCenterFaults(seed=service.seed)
+    app = FastAPI(title="Mock Planning Center API", openapi_url=None, docs_url=None, redoc_url=None)
+    app.state.service = service
+    app.state.faults = faults
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if faults.latency:
+            await asyncio.sleep(faults.latency)
+        failure, headers = faults.check(time.monotonic())
+        if failure is not None:
+            return failure
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    @app.exception_handler(HTTPException)
+    async def not_found(request: Request, exc: HTTPException):
+        return JSONResponse({"errors": [{"status": str(exc.status_code), "title": str(exc.detail)}]},
+                            status_code=exc.status_code)
+
+    def document(request: Request, resource_type: str, page: Dict[str, Any], per_page: int, offset: int) -> Dict[str, Any]:
+        total_count = page["meta"]["total_count"]
+        meta: Dict[str, Any] = {"total_count": total_count, "count": page["meta"]["count"]}
+        links = {"self": str(request.url)}
+        if offset + per_page < total_count:
+            meta["next"] = {"offset": offset + per_page}
+            links["next"] = str(request.url.include_query_params(offset=offset + per_page, per_page=per_page))
+        if offset > 0:
+            meta["prev"] = {"offset": max(0, offset - per_page)}
+            links["prev"] = str(request.url.include_query_params(offset=max(0, offset - per_page), per_page=per_page))
+        return {
+            "data": [to_resource(resource_type, record) for record in page["data"]],
+            "included": [],
+            "meta": meta,
+            "links": links,
+        }
+
+    def updated_since(request: Request) -> Optional[str]:
+        return request.query_params.get("where[updated_at][gte]")
+
+    @app.get("/people/v2/people")
+    async def list_people(request: Request, per_page: int = Query(25, ge=1, le=100), offset: int = Query(0, ge=0)):
+        page = await service.get_people(limit=per_page, offset=offset, updated_since=updated_since(request))
+        return conditional_response(request, document(request, "Person", page, per_page, offset))
+
+    @app.get("/people/v2/people/{person_id}")
+    async def get_person(request: Request, person_id: str):
+        return conditional_response(request, {"data": to_resource("Person", (await service.get_person(person_id))["data"])})
+
+    @app.get("/events/v2/events")
+    async def list_events(request: Request, per_page: int = Query(25, ge=1, le=100), offset: int = Query(0, ge=0)):
+        page = await service.get_events(limit=per_page, offset=offset, updated_since=updated_since(request))
+        return conditional_response(request, document(request, "Event", page, per_page, offset))
+
+    @app.get("/events/v2/events/{event_id}")
+    async def get_event(request: Request, event_id: str):
+        return conditional_response(request, {"data": to_resource("Event", (await service.get_event(event_id))["data"])})
+
+    @app.get("/events/v2/events/{event_id}/registrations")
+    async def list_registrations(request: Request, event_id: str,
+                                 per_page: int = Query(25, ge=1, le=100), offset: int = Query(0, ge=0)):
+        page = await service.get_event_registrations(event_id, limit=per_page, offset=offset,
+                                                     updated_since=updated_since(request))
+        return conditional_response(request, document(request, "Registration", page, per_page, offset))
+
+    @app.get("/events/v2/events/{event_id}/registrations/{registration_id}")
+    async def get_registration(request: Request, event_id: str, registration_id: str):
+        registration = (await service.get_registration(event_id, registration_id))["data"]
+        return conditional_response(request, {"data": to_resource("Registration", registration)})
+
+    return app
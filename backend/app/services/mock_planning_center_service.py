@@ -1,235 +1,304 @@
 """
 Mock Planning Center API Service
 Simulates Planning Center API responses for development and testing
+
+Records are generated on demand from ``(seed, index)`` rather than stored, so
+the mock can stand in for a directory of any size (100k+ people, thousands
+of events) without holding it in memory, and every run with the same seed
+serves identical data. ``updated_at`` rises with the record index, so
+``updated_since`` filters are answered with a binary search.
 """
 
-import json
-from datetime import datetime, date, timedelta
+import bisect
+import random
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException, status
-import random
+
+from app.core.config import settings
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Emily", "Robert", "Lisa",
+               "James", "Mary", "William", "Jennifer", "Richard", "Linda", "Charles", "Patricia"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas"]
+EVENT_NAMES = [
+    "Sunday Service", "Bible Study", "Youth Group", "Women's Ministry",
+    "Men's Fellowship", "Children's Church", "Prayer Meeting", "Community Outreach",
+    "Leadership Training", "New Member Class", "Marriage Counseling", "Financial Peace",
+    "Alpha Course", "Discipleship Program", "Mission Trip Planning"
+]
+
+# People and events were last updated within this window, oldest index first
+UPDATE_WINDOW = timedelta(days=30)
+
+
+def pc_timestamp(value: datetime) -> str:
+    """Format a naive UTC datetime the way PC does"""
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_updated_since(value: Any) -> Optional[datetime]:
+    """Parse an ``updated_since`` filter into a naive UTC datetime"""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 class MockPlanningCenterService:
     """Mock service that simulates Planning Center API responses"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        people_count: Optional[int] = None,
+        events_count: Optional[int] = None,
+        registrations_per_event: Optional[int] = None,
+        reference_time: Optional[datetime] = None
+    ):
         self.base_url = "https://api.planningcenteronline.com"
-        self.mock_data = self._generate_mock_data()
+        self.seed = settings.MOCK_PLANNING_CENTER_SEED if seed is None else seed
+        self.people_count = settings.MOCK_PLANNING_CENTER_PEOPLE if people_count is None else people_count
+        self.events_count = settings.MOCK_PLANNING_CENTER_EVENTS if events_count is None else events_count
+        self.registrations_per_event = (settings.MOCK_PLANNING_CENTER_REGISTRATIONS_PER_EVENT
+                                        if registrations_per_event is None else registrations_per_event)
+        # Dates are relative to this; pass one to make them reproducible across days
+        self.reference_time = reference_time or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        # Registrations created, changed or deleted (None) through the API, per event id
+        self._registration_changes: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        self._registrations_created = 0
     
-    def _generate_mock_data(self) -> Dict[str, Any]:
-        """Generate realistic mock data for Planning Center"""
-        
-        # Mock people data
-        people_data = []
-        first_names = ["John", "Jane", "Michael", "Sarah", "David", "Emily", "Robert", "Lisa", 
-                       "James", "Mary", "William", "Jennifer", "Richard", "Linda", "Charles", "Patricia"]
-        last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
-                      "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas"]
-        
-        for i in range(50):  # Generate 50 mock people
-            person = {
-                "id": f"pc_person_{i+1:03d}",
-                "first_name": random.choice(first_names),
-                "last_name": random.choice(last_names),
-                "email": f"person{i+1}@example.com",
-                "phone": f"555-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-                "date_of_birth": (date.today() - timedelta(days=random.randint(18*365, 80*365))).isoformat(),
-                "gender": random.choice(["Male", "Female", "Other"]),
-                "address1": f"{random.randint(100, 9999)} {random.choice(['Main', 'Oak', 'Pine', 'Maple', 'Cedar'])} St",
-                "city": random.choice(["Anytown", "Springfield", "Riverside", "Hillside", "Valley"]),
-                "state": random.choice(["CA", "TX", "FL", "NY", "IL"]),
-                "zip": f"{random.randint(10000, 99999)}",
-                "household_id": f"hh_{random.randint(1, 20):03d}",
-                "household_name": f"{random.choice(['Smith', 'Johnson', 'Williams'])} Family",
-                "status": random.choice(["active", "inactive", "pending"]),
-                "join_date": (date.today() - timedelta(days=random.randint(30, 3650))).isoformat(),
-                "created_at": (datetime.now() - timedelta(days=random.randint(1, 365))).isoformat(),
-                "updated_at": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
-            }
-            people_data.append(person)
-        
-        # Mock events data
-        events_data = []
-        event_names = [
-            "Sunday Service", "Bible Study", "Youth Group", "Women's Ministry", 
-            "Men's Fellowship", "Children's Church", "Prayer Meeting", "Community Outreach",
-            "Leadership Training", "New Member Class", "Marriage Counseling", "Financial Peace",
-            "Alpha Course", "Discipleship Program", "Mission Trip Planning"
-        ]
-        
-        for i in range(20):  # Generate 20 mock events
-            start_date = datetime.now() + timedelta(days=random.randint(-30, 90))
-            end_date = start_date + timedelta(hours=random.randint(1, 4))
-            
-            event = {
-                "id": f"pc_event_{i+1:03d}",
-                "name": random.choice(event_names),
-                "description": f"Join us for {random.choice(event_names).lower()}",
-                "start_time": start_date.isoformat(),
-                "end_time": end_date.isoformat(),
-                "location": random.choice(["Main Sanctuary", "Fellowship Hall", "Youth Room", "Conference Room"]),
-                "capacity": random.randint(20, 200),
-                "registration_open": start_date > datetime.now(),
-                "registration_deadline": (start_date - timedelta(days=1)).isoformat(),
-                "created_at": (datetime.now() - timedelta(days=random.randint(1, 365))).isoformat(),
-                "updated_at": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
-            }
-            events_data.append(event)
-        
-        # Mock registrations data
-        registrations_data = []
-        for event in events_data[:10]:  # Only first 10 events have registrations
-            num_registrations = random.randint(0, min(50, event["capacity"]))
-            for i in range(num_registrations):
-                person = random.choice(people_data)
-                registration = {
-                    "id": f"pc_registration_{len(registrations_data)+1:03d}",
-                    "person_id": person["id"],
-                    "event_id": event["id"],
-                    "status": random.choice(["registered", "waitlisted", "cancelled"]),
-                    "registration_date": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat(),
-                    "notes": random.choice(["", "First time attendee", "Returning member", "Special needs"]) if random.random() > 0.7 else "",
-                    "created_at": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat(),
-                    "updated_at": (datetime.now() - timedelta(days=random.randint(1, 7))).isoformat()
-                }
-                registrations_data.append(registration)
-        
+    def _rng(self, kind: str, key: Any) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{key}")
+    
+    def _days_ago(self, rng: random.Random, low: int, high: int) -> datetime:
+        return self.reference_time - timedelta(days=rng.randint(low, high))
+    
+    def _updated_at(self, index: int, count: int) -> datetime:
+        """Spread updates across UPDATE_WINDOW so a later index is never older"""
+        return (self.reference_time - UPDATE_WINDOW * (count - index) / count).replace(microsecond=0)
+    
+    def _first_updated_since(self, count: int, updated_since: Optional[datetime]) -> int:
+        if updated_since is None:
+            return 0
+        return bisect.bisect_left(range(count), updated_since, key=lambda index: self._updated_at(index, count))
+    
+    def _index(self, record_id: str, prefix: str, count: int) -> Optional[int]:
+        """Index of a generated record from its id, or None if there is no such record"""
+        if not record_id or not record_id.startswith(prefix):
+            return None
+        try:
+            index = int(record_id[len(prefix):]) - 1
+        except ValueError:
+            return None
+        return index if 0 <= index < count else None
+    
+    def _person(self, index: int) -> Dict[str, Any]:
+        rng = self._rng("person", index)
         return {
-            "people": people_data,
-            "events": events_data,
-            "registrations": registrations_data
+            "id": f"pc_person_{index + 1:03d}",
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "email": f"person{index + 1}@example.com",
+            "phone": f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            "date_of_birth": (self.reference_time.date() - timedelta(days=rng.randint(18 * 365, 80 * 365))).isoformat(),
+            "gender": rng.choice(["Male", "Female", "Other"]),
+            "address1": f"{rng.randint(100, 9999)} {rng.choice(['Main', 'Oak', 'Pine', 'Maple', 'Cedar'])} St",
+            "city": rng.choice(["Anytown", "Springfield", "Riverside", "Hillside", "Valley"]),
+            "state": rng.choice(["CA", "TX", "FL", "NY", "IL"]),
+            "zip": f"{rng.randint(10000, 99999)}",
+            "household_id": f"hh_{rng.randint(1, max(1, self.people_count // 3)):03d}",
+            "household_name": f"{rng.choice(['Smith', 'Johnson', 'Williams'])} Family",
+            "status": rng.choice(["active", "inactive", "pending"]),
+            "join_date": self._days_ago(rng, 30, 3650).date().isoformat(),
+            "created_at": pc_timestamp(self._days_ago(rng, 31, 365)),
+            "updated_at": pc_timestamp(self._updated_at(index, self.people_count))
         }
     
-    async def test_connection(self) -> bool:
-        """Test connection to mock Planning Center API"""
-        return True
+    def _event(self, index: int) -> Dict[str, Any]:
+        rng = self._rng("event", index)
+        start_date = self.reference_time + timedelta(days=rng.randint(-30, 90), hours=rng.randint(8, 19))
+        end_date = start_date + timedelta(hours=rng.randint(1, 4))
+        return {
+            "id": f"pc_event_{index + 1:03d}",
+            "name": rng.choice(EVENT_NAMES),
+            "description": f"Join us for {rng.choice(EVENT_NAMES).lower()}",
+            "start_time": pc_timestamp(start_date),
+            "end_time": pc_timestamp(end_date),
+            "location": rng.choice(["Main Sanctuary", "Fellowship Hall", "Youth Room", "Conference Room"]),
+            "capacity": rng.randint(20, 200),
+            "registration_open": start_date > self.reference_time,
+            "registration_deadline": pc_timestamp(start_date - timedelta(days=1)),
+            "created_at": pc_timestamp(self._days_ago(rng, 31, 365)),
+            "updated_at": pc_timestamp(self._updated_at(index, self.events_count))
+        }
     
-    async def get_people(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """Get people from mock Planning Center API"""
-        people = self.mock_data["people"][offset:offset + limit]
-        
+    def _registration_count(self, event_index: int) -> int:
+        capacity = self._event(event_index)["capacity"]
+        return self._rng("registrations", event_index).randint(0, min(self.registrations_per_event, capacity))
+    
+    def _registration(self, event_index: int, index: int) -> Dict[str, Any]:
+        rng = self._rng("registration", f"{event_index}:{index}")
+        registered_at = self.reference_time - timedelta(days=rng.randint(1, 30), minutes=rng.randint(0, 1439))
+        return {
+            "id": f"pc_registration_{event_index + 1:03d}_{index + 1:03d}",
+            "person_id": f"pc_person_{rng.randrange(max(1, self.people_count)) + 1:03d}",
+            "event_id": f"pc_event_{event_index + 1:03d}",
+            "status": rng.choice(["registered", "waitlisted", "cancelled"]),
+            "registration_date": pc_timestamp(registered_at),
+            "notes": rng.choice(["", "First time attendee", "Returning member", "Special needs"]) if rng.random() > 0.7 else "",
+            "created_at": pc_timestamp(registered_at),
+            "updated_at": pc_timestamp(registered_at + timedelta(days=rng.randint(0, 7)))
+        }
+    
+    def _event_registrations(self, event_id: str) -> List[Dict[str, Any]]:
+        """Every registration of an event, including changes made through the API"""
+        event_index = self._index(event_id, "pc_event_", self.events_count)
+        if event_index is None:
+            return []
+        registrations = [self._registration(event_index, index) for index in range(self._registration_count(event_index))]
+        changes = self._registration_changes.get(event_id)
+        if changes:
+            generated_ids = {registration["id"] for registration in registrations}
+            registrations = [changes.get(registration["id"], registration) for registration in registrations]
+            registrations += [registration for registration_id, registration in changes.items() if registration_id not in generated_ids]
+            registrations = [registration for registration in registrations if registration is not None]
+        return registrations
+    
+    def _page(self, records: List[Dict[str, Any]], total_count: int, limit: int, offset: int, path: str) -> Dict[str, Any]:
         return {
-            "data": people,
+            "data": records,
             "meta": {
-                "total_count": len(self.mock_data["people"]),
-                "count": len(people),
-                "next": f"{self.base_url}/people/v2/people?per_page={limit}&offset={offset + limit}" if offset + limit < len(self.mock_data["people"]) else None,
-                "prev": f"{self.base_url}/people/v2/people?per_page={limit}&offset={max(0, offset - limit)}" if offset > 0 else None
+                "total_count": total_count,
+                "count": len(records),
+                "next": f"{self.base_url}{path}?per_page={limit}&offset={offset + limit}" if offset + limit < total_count else None,
+                "prev": f"{self.base_url}{path}?per_page={limit}&offset={max(0, offset - limit)}" if offset > 0 else None
             }
         }
     
+    async def test_connection(self) -> bool:
+        """Test connection to mock Planning Center API"""
+        return True
+    
+    async def get_people(self, limit: int = 50, offset: int = 0, updated_since: Any = None) -> Dict[str, Any]:
+        """Get people from mock Planning Center API"""
+        indexes = range(self._first_updated_since(self.people_count, parse_updated_since(updated_since)), self.people_count)
+        people = [self._person(index) for index in indexes[offset:offset + limit]]
+        return self._page(people, len(indexes), limit, offset, "/people/v2/people")
+    
     async def get_person(self, person_id: str) -> Dict[str, Any]:
         """Get a specific person from mock Planning Center API"""
-        person = next((p for p in self.mock_data["people"] if p["id"] == person_id), None)
-        if not person:
+        index = self._index(person_id, "pc_person_", self.people_count)
+        if index is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Person with ID {person_id} not found"
             )
-        return {"data": person}
+        return {"data": self._person(index)}
     
-    async def get_events(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    async def get_events(self, limit: int = 50, offset: int = 0, updated_since: Any = None) -> Dict[str, Any]:
         """Get events from mock Planning Center API"""
-        events = self.mock_data["events"][offset:offset + limit]
-        
-        return {
-            "data": events,
-            "meta": {
-                "total_count": len(self.mock_data["events"]),
-                "count": len(events),
-                "next": f"{self.base_url}/registrations/v2/events?per_page={limit}&offset={offset + limit}" if offset + limit < len(self.mock_data["events"]) else None,
-                "prev": f"{self.base_url}/registrations/v2/events?per_page={limit}&offset={max(0, offset - limit)}" if offset > 0 else None
-            }
-        }
+        indexes = range(self._first_updated_since(self.events_count, parse_updated_since(updated_since)), self.events_count)
+        events = [self._event(index) for index in indexes[offset:offset + limit]]
+        return self._page(events, len(indexes), limit, offset, "/registrations/v2/events")
     
     async def get_event(self, event_id: str) -> Dict[str, Any]:
         """Get a specific event from mock Planning Center API"""
-        event = next((e for e in self.mock_data["events"] if e["id"] == event_id), None)
-        if not event:
+        index = self._index(event_id, "pc_event_", self.events_count)
+        if index is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
-        return {"data": event}
+        return {"data": self._event(index)}
     
-    async def get_event_registrations(self, event_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    async def get_event_registrations(self, event_id: str, limit: int = 50, offset: int = 0,
+                                      updated_since: Any = None) -> Dict[str, Any]:
         """Get registrations for a specific event"""
-        registrations = [r for r in self.mock_data["registrations"] if r["event_id"] == event_id]
+        registrations = self._event_registrations(event_id)
+        since = parse_updated_since(updated_since)
+        if since is not None:
+            since = pc_timestamp(since)
+            registrations = [r for r in registrations if r["updated_at"] >= since]
         paginated_registrations = registrations[offset:offset + limit]
-        
-        return {
-            "data": paginated_registrations,
-            "meta": {
-                "total_count": len(registrations),
-                "count": len(paginated_registrations),
-                "next": f"{self.base_url}/registrations/v2/events/{event_id}/registrations?per_page={limit}&offset={offset + limit}" if offset + limit < len(registrations) else None,
-                "prev": f"{self.base_url}/registrations/v2/events/{event_id}/registrations?per_page={limit}&offset={max(0, offset - limit)}" if offset > 0 else None
-            }
-        }
+        return self._page(paginated_registrations, len(registrations), limit, offset,
+                          f"/registrations/v2/events/{event_id}/registrations")
+    
+    async def get_registration(self, event_id: str, registration_id: str) -> Dict[str, Any]:
+        """Get a specific registration of an event"""
+        registration = next((r for r in self._event_registrations(event_id) if r["id"] == registration_id), None)
+        if not registration:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Registration with ID {registration_id} not found"
+            )
+        return {"data": registration}
     
     async def get_person_registrations(self, person_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """Get registrations for a specific person"""
-        registrations = [r for r in self.mock_data["registrations"] if r["person_id"] == person_id]
+        """Get registrations for a specific person (scans every event's registrations)"""
+        registrations = [
+            r for event_index in range(self.events_count)
+            for r in self._event_registrations(f"pc_event_{event_index + 1:03d}")
+            if r["person_id"] == person_id
+        ]
         paginated_registrations = registrations[offset:offset + limit]
-        
-        return {
-            "data": paginated_registrations,
-            "meta": {
-                "total_count": len(registrations),
-                "count": len(paginated_registrations),
-                "next": f"{self.base_url}/registrations/v2/people/{person_id}/registrations?per_page={limit}&offset={offset + limit}" if offset + limit < len(registrations) else None,
-                "prev": f"{self.base_url}/registrations/v2/people/{person_id}/registrations?per_page={limit}&offset={max(0, offset - limit)}" if offset > 0 else None
-            }
-        }
+        return self._page(paginated_registrations, len(registrations), limit, offset,
+                          f"/registrations/v2/people/{person_id}/registrations")
     
     async def create_registration(self, event_id: str, person_id: str, **kwargs) -> Dict[str, Any]:
         """Create a new registration"""
         # Check if person and event exist
-        person = next((p for p in self.mock_data["people"] if p["id"] == person_id), None)
-        event = next((e for e in self.mock_data["events"] if e["id"] == event_id), None)
-        
-        if not person:
+        if self._index(person_id, "pc_person_", self.people_count) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Person with ID {person_id} not found"
             )
         
-        if not event:
+        event_index = self._index(event_id, "pc_event_", self.events_count)
+        if event_index is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
         
         # Check if registration already exists
-        existing_registration = next((r for r in self.mock_data["registrations"] 
-                                    if r["person_id"] == person_id and r["event_id"] == event_id), None)
-        
-        if existing_registration:
+        if any(r["person_id"] == person_id for r in self._event_registrations(event_id)):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Registration already exists"
             )
         
         # Create new registration
+        self._registrations_created += 1
+        now = pc_timestamp(datetime.utcnow())
         new_registration = {
-            "id": f"pc_registration_{len(self.mock_data['registrations'])+1:03d}",
+            "id": f"pc_registration_{event_index + 1:03d}_new_{self._registrations_created:03d}",
             "person_id": person_id,
             "event_id": event_id,
             "status": "registered",
-            "registration_date": datetime.now().isoformat(),
+            "registration_date": now,
             "notes": kwargs.get("notes", ""),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
         
-        self.mock_data["registrations"].append(new_registration)
-        
+        self._registration_changes.setdefault(event_id, {})[new_registration["id"]] = new_registration
         return {"data": new_registration}
     
+    def _find_registration(self, registration_id: str) -> Optional[Dict[str, Any]]:
+        # Registration ids embed their event's number: pc_registration_<event>_<n>
+        parts = (registration_id or "").split("_")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        event_id = f"pc_event_{parts[2]}"
+        return next((r for r in self._event_registrations(event_id) if r["id"] == registration_id), None)
+    
     async def update_registration(self, registration_id: str, **kwargs) -> Dict[str, Any]:
         """Update an existing registration"""
-        registration = next((r for r in self.mock_data["registrations"] if r["id"] == registration_id), None)
+        registration = self._find_registration(registration_id)
         
         if not registration:
             raise HTTPException(
@@ -238,17 +307,19 @@ class MockPlanningCenterService:
             )
         
         # Update registration
+        registration = dict(registration)
         for key, value in kwargs.items():
             if key in registration:
                 registration[key] = value
         
-        registration["updated_at"] = datetime.now().isoformat()
+        registration["updated_at"] = pc_timestamp(datetime.utcnow())
+        self._registration_changes.setdefault(registration["event_id"], {})[registration_id] = registration
         
         return {"data": registration}
     
     async def delete_registration(self, registration_id: str) -> bool:
         """Delete a registration"""
-        registration = next((r for r in self.mock_data["registrations"] if r["id"] == registration_id), None)
+        registration = self._find_registration(registration_id)
         
         if not registration:
             raise HTTPException(
@@ -256,17 +327,22 @@ class MockPlanningCenterService:
                 detail=f"Registration with ID {registration_id} not found"
             )
         
-        self.mock_data["registrations"].remove(registration)
+        self._registration_changes.setdefault(registration["event_id"], {})[registration_id] = None
         return True
     
     def get_mock_data_summary(self) -> Dict[str, Any]:
-        """Get summary of mock data for debugging"""
+        """Get summary of mock data for debugging (walks the generated data)"""
+        now = self.reference_time
+        registrations = [r for event_index in range(self.events_count)
+                         for r in self._event_registrations(f"pc_event_{event_index + 1:03d}")]
         return {
-            "total_people": len(self.mock_data["people"]),
-            "total_events": len(self.mock_data["events"]),
-            "total_registrations": len(self.mock_data["registrations"]),
-            "active_people": len([p for p in self.mock_data["people"] if p["status"] == "active"]),
-            "upcoming_events": len([e for e in self.mock_data["events"] if datetime.fromisoformat(e["start_time"]) > datetime.now()]),
-            "recent_registrations": len([r for r in self.mock_data["registrations"] 
-                                       if datetime.fromisoformat(r["registration_date"]) > datetime.now() - timedelta(days=7)])
+            "seed": self.seed,
+            "total_people": self.people_count,
+            "total_events": self.events_count,
+            "total_registrations": len(registrations),
+            "active_people": len([index for index in range(self.people_count) if self._person(index)["status"] == "active"]),
+            "upcoming_events": len([index for index in range(self.events_count) if self._event(index)["registration_open"]]),
+            "recent_registrations": len([r for r in registrations
+                                         if parse_updated_since(r["registration_date"]) > now - timedelta(days=7)])
         }
+
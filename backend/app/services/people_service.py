@@ -2,12 +2,78 @@
 People service layer (from Planning Center)
 """
 
+from sqlalchemy import Select, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
+from app.core.config import settings
 from app.schemas.people import PeopleCreate, PeopleUpdate
 from app.models.member import People as PeopleModel
+from app.services.planning_center_fingerprint import fingerprint
+
+# People columns populated from Planning Center person attributes
+PC_PERSON_FIELDS = (
+    "first_name", "last_name", "email", "phone", "date_of_birth", "gender",
+    "address1", "address2", "city", "state", "zip", "household_id",
+    "household_name", "status", "join_date",
+)
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """Coerce a PC date/datetime string into a date"""
+    if value is None or isinstance(value, date):
+        return value.date() if isinstance(value, datetime) else value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def map_pc_person(pc_person_data: dict) -> Dict[str, Any]:
+    """Map a flattened PC person payload onto People column values"""
+    row = {field: pc_person_data.get(field) for field in PC_PERSON_FIELDS}
+    row["planning_center_id"] = pc_person_data.get("id")
+    row["first_name"] = row["first_name"] or ""
+    row["last_name"] = row["last_name"] or ""
+    row["status"] = row["status"] or "active"
+    row["date_of_birth"] = _parse_date(row["date_of_birth"])
+    row["join_date"] = _parse_date(row["join_date"])
+    return row
+
+
+def validated_pc_person(pc_person_data: dict) -> Dict[str, Any]:
+    """Map a PC person payload and validate it as PeopleCreate; raises ValueError if it is invalid"""
+    person = PeopleCreate(**map_pc_person(pc_person_data))
+    return person.dict(include={"planning_center_id", *PC_PERSON_FIELDS})
+
+
+def person_fingerprint(row: Dict[str, Any]) -> str:
+    """Fingerprint of a row produced by validated_pc_person"""
+    return fingerprint(row)
+
+
+def _is_unchanged(stored_fingerprint: Optional[str], pc_missing_since: Optional[datetime], row_fingerprint: str) -> bool:
+    """A stored person matches the payload and was not deactivated as gone from PC"""
+    return stored_fingerprint == row_fingerprint and pc_missing_since is None
+
+
+def people_query(skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> Select:
+    """Page of people, optionally filtered by active flag"""
+    query = select(PeopleModel)
+    if is_active is not None:
+        query = query.where(PeopleModel.is_active == is_active)
+    return query.offset(skip).limit(limit)
+
+
+def people_search_query(search_term: str, limit: int = 50) -> Select:
+    """People whose name or email contains the search term"""
+    return select(PeopleModel).where(
+        (PeopleModel.first_name.ilike(f"%{search_term}%")) |
+        (PeopleModel.last_name.ilike(f"%{search_term}%")) |
+        (PeopleModel.email.ilike(f"%{search_term}%"))
+    ).limit(limit)
 
 
 class PeopleService:
@@ -18,28 +84,21 @@ class PeopleService:
     
     def get_people(self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> List[PeopleModel]:
         """Get all people with pagination and optional filtering"""
-        query = self.db.query(PeopleModel)
-        if is_active is not None:
-            query = query.filter(PeopleModel.is_active == is_active)
-        return query.offset(skip).limit(limit).all()
+        return list(self.db.scalars(people_query(skip, limit, is_active)))
     
     def get_person(self, person_id: int) -> Optional[PeopleModel]:
         """Get a specific person by ID"""
-        return self.db.query(PeopleModel).filter(PeopleModel.id == person_id).first()
+        return self.db.scalars(select(PeopleModel).where(PeopleModel.id == person_id).limit(1)).first()
     
     def get_person_by_pc_id(self, pc_id: str) -> Optional[PeopleModel]:
         """Get a person by Planning Center ID"""
-        return self.db.query(PeopleModel).filter(
-            PeopleModel.planning_center_id == pc_id
+        return self.db.scalars(
+            select(PeopleModel).where(PeopleModel.planning_center_id == pc_id).limit(1)
         ).first()
     
     def search_people(self, search_term: str, limit: int = 50) -> List[PeopleModel]:
         """Search people by name or email"""
-        return self.db.query(PeopleModel).filter(
-            (PeopleModel.first_name.ilike(f"%{search_term}%")) |
-            (PeopleModel.last_name.ilike(f"%{search_term}%")) |
-            (PeopleModel.email.ilike(f"%{search_term}%"))
-        ).limit(limit).all()
+        return list(self.db.scalars(people_search_query(search_term, limit)))
     
     def create_person(self, person: PeopleCreate, created_by: Optional[int] = None) -> PeopleModel:
         """Create a new person"""
@@ -79,54 +138,195 @@ class PeopleService:
         self.db.commit()
         return True
     
-    def sync_from_planning_center(self, pc_person_data: dict, updated_by: Optional[int] = None) -> PeopleModel:
-        """Sync person data from Planning Center"""
-        pc_id = pc_person_data.get("id")
+    def sync_from_planning_center(self, pc_person_data: dict, updated_by: Optional[int] = None,
+                                  commit: bool = True) -> PeopleModel:
+        """Sync person data from Planning Center; unchanged people are not rewritten.
+        
+        With ``commit=False`` the write is only flushed, for callers that
+        commit it as part of a larger batch.
+        """
+        row = validated_pc_person(pc_person_data)
+        row_fingerprint = person_fingerprint(row)
         
         # Check if person already exists
-        existing_person = self.get_person_by_pc_id(pc_id)
+        existing_person = self.get_person_by_pc_id(row["planning_center_id"])
         
         if existing_person:
+            if _is_unchanged(existing_person.pc_fingerprint, existing_person.pc_missing_since, row_fingerprint):
+                return existing_person
+            
             # Update existing person
-            existing_person.first_name = pc_person_data.get("first_name", "")
-            existing_person.last_name = pc_person_data.get("last_name", "")
-            existing_person.email = pc_person_data.get("email")
-            existing_person.phone = pc_person_data.get("phone")
-            existing_person.date_of_birth = pc_person_data.get("date_of_birth")
-            existing_person.gender = pc_person_data.get("gender")
-            existing_person.address1 = pc_person_data.get("address1")
-            existing_person.address2 = pc_person_data.get("address2")
-            existing_person.city = pc_person_data.get("city")
-            existing_person.state = pc_person_data.get("state")
-            existing_person.zip = pc_person_data.get("zip")
-            existing_person.household_id = pc_person_data.get("household_id")
-            existing_person.household_name = pc_person_data.get("household_name")
-            existing_person.status = pc_person_data.get("status", "active")
-            existing_person.join_date = pc_person_data.get("join_date")
+            for field in PC_PERSON_FIELDS:
+                setattr(existing_person, field, row[field])
+            existing_person.data_source = "api"
+            if existing_person.pc_missing_since is not None:
+                # Listed again after a sync deactivated it as gone; admin deactivations stay
+                existing_person.is_active = True
+                existing_person.pc_missing_since = None
+            existing_person.pc_fingerprint = row_fingerprint
             existing_person.last_synced_at = datetime.utcnow()
             existing_person.updated_at = datetime.utcnow()
             existing_person.updated_by = updated_by
-            self.db.commit()
-            self.db.refresh(existing_person)
+            self._save(existing_person, commit)
             return existing_person
         else:
             # Create new person
-            person_data = PeopleCreate(
-                planning_center_id=pc_id,
-                first_name=pc_person_data.get("first_name", ""),
-                last_name=pc_person_data.get("last_name", ""),
-                email=pc_person_data.get("email"),
-                phone=pc_person_data.get("phone"),
-                date_of_birth=pc_person_data.get("date_of_birth"),
-                gender=pc_person_data.get("gender"),
-                address1=pc_person_data.get("address1"),
-                address2=pc_person_data.get("address2"),
-                city=pc_person_data.get("city"),
-                state=pc_person_data.get("state"),
-                zip=pc_person_data.get("zip"),
-                household_id=pc_person_data.get("household_id"),
-                household_name=pc_person_data.get("household_name"),
-                status=pc_person_data.get("status", "active"),
-                join_date=pc_person_data.get("join_date")
+            db_person = PeopleModel(**row, data_source="api", is_active=True, pc_fingerprint=row_fingerprint)
+            db_person.last_synced_at = datetime.utcnow()
+            db_person.created_at = datetime.utcnow()
+            db_person.updated_at = datetime.utcnow()
+            db_person.created_by = updated_by
+            
+            self.db.add(db_person)
+            self._save(db_person, commit)
+            return db_person
+    
+    def _save(self, db_person: PeopleModel, commit: bool):
+        """Commit a synced person, or only flush it into the caller's transaction"""
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_person)
+        else:
+            self.db.flush()
+    
+    def bulk_sync_from_planning_center(
+        self,
+        pc_people_data: List[dict],
+        updated_by: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        commit: bool = True
+    ) -> Dict[str, Any]:
+        """Upsert a batch of PC person payloads, one transaction per chunk.
+        
+        Existing rows for each chunk are prefetched with a single IN query and
+        the chunk is written with a native INSERT ... ON CONFLICT upsert on
+        PostgreSQL and SQLite (executemany insert/update elsewhere). People
+        whose stored fingerprint matches the payload are counted as
+        ``unchanged`` and not written. Payloads are validated and mapped
+        exactly as ``sync_from_planning_center`` does it. Each chunk is
+        written in a savepoint; if it fails it is rolled back and replayed
+        record by record so a single bad payload only fails itself.
+        
+        With ``commit=False`` nothing is committed, so the caller can commit
+        the batch together with its own bookkeeping (sync run checkpoints).
+        """
+        chunk_size = chunk_size or settings.PLANNING_CENTER_SYNC_CHUNK_SIZE
+        result = {"processed": 0, "inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+        
+        for start in range(0, len(pc_people_data), chunk_size):
+            chunk = pc_people_data[start:start + chunk_size]
+            result["processed"] += len(chunk)
+            try:
+                with self.db.begin_nested():
+                    inserted, updated, unchanged = self._upsert_people_chunk(chunk, updated_by)
+                result["inserted"] += inserted
+                result["updated"] += updated
+                result["unchanged"] += unchanged
+            except Exception:
+                for pc_person_data in chunk:
+                    try:
+                        existing = self.get_person_by_pc_id(pc_person_data.get("id"))
+                        if existing is not None and _is_unchanged(
+                            existing.pc_fingerprint, existing.pc_missing_since,
+                            person_fingerprint(validated_pc_person(pc_person_data))
+                        ):
+                            result["unchanged"] += 1
+                            continue
+                        with self.db.begin_nested():
+                            self.sync_from_planning_center(pc_person_data, updated_by=updated_by, commit=False)
+                        result["updated" if existing is not None else "inserted"] += 1
+                    except Exception as e:
+                        result["failed"] += 1
+                        result["errors"].append(f"Person {pc_person_data.get('id')}: {str(e)}")
+            if commit:
+                self.db.commit()
+        
+        return result
+    
+    def _upsert_people_chunk(self, chunk: List[dict], updated_by: Optional[int]) -> tuple:
+        """Write one chunk of PC people without committing; returns (inserted, updated, unchanged)"""
+        now = datetime.utcnow()
+        rows = {}
+        for pc_person_data in chunk:
+            row = validated_pc_person(pc_person_data)
+            row["pc_fingerprint"] = person_fingerprint(row)
+            row.update(data_source="api", pc_missing_since=None,
+                       last_synced_at=now, updated_at=now, updated_by=updated_by)
+            rows[row["planning_center_id"]] = row  # last payload for an id wins
+        
+        stored = {
+            pc_id: (stored_fingerprint, missing_since)
+            for pc_id, stored_fingerprint, missing_since in self.db.execute(
+                select(PeopleModel.planning_center_id, PeopleModel.pc_fingerprint, PeopleModel.pc_missing_since).where(
+                    PeopleModel.planning_center_id.in_(list(rows))
+                )
             )
-            return self.create_person(person_data, created_by=updated_by)
+        }
+        unchanged = [pc_id for pc_id, row in rows.items()
+                     if pc_id in stored and _is_unchanged(*stored[pc_id], row["pc_fingerprint"])]
+        for pc_id in unchanged:
+            del rows[pc_id]
+        existing_ids = set(stored) & set(rows)
+        if not rows:
+            return 0, 0, len(unchanged)
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            
+            values = [dict(row, is_active=True, created_at=now, created_by=updated_by) for row in rows.values()]
+            stmt = insert(PeopleModel)
+            set_ = {
+                column: getattr(stmt.excluded, column)
+                for column in PC_PERSON_FIELDS + ("data_source", "pc_missing_since", "pc_fingerprint",
+                                                  "last_synced_at", "updated_at", "updated_by")
+            }
+            # Only reactivate people a sync deactivated as gone from PC
+            set_["is_active"] = case((PeopleModel.pc_missing_since.isnot(None), True), else_=PeopleModel.is_active)
+            stmt = stmt.on_conflict_do_update(index_elements=[PeopleModel.planning_center_id], set_=set_)
+            self.db.execute(stmt, values)
+        else:
+            inserts = [dict(row, is_active=True, created_at=now, created_by=updated_by)
+                       for pc_id, row in rows.items() if pc_id not in existing_ids]
+            if inserts:
+                self.db.bulk_insert_mappings(PeopleModel, inserts)
+            if existing_ids:
+                id_by_pc_id = dict(self.db.execute(
+                    select(PeopleModel.planning_center_id, PeopleModel.id).where(
+                        PeopleModel.planning_center_id.in_(list(existing_ids))
+                    )
+                ).all())
+                self.db.bulk_update_mappings(PeopleModel, [
+                    dict(row, id=id_by_pc_id[pc_id], **({"is_active": True} if stored[pc_id][1] is not None else {}))
+                    for pc_id, row in rows.items() if pc_id in existing_ids
+                ])
+        
+        return len(rows) - len(existing_ids), len(existing_ids), len(unchanged)
+
+
+class AsyncPeopleService:
+    """Read-only people queries on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_people(self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None) -> List[PeopleModel]:
+        """Get all people with pagination and optional filtering"""
+        return list(await self.db.scalars(people_query(skip, limit, is_active)))
+    
+    async def get_person(self, person_id: int) -> Optional[PeopleModel]:
+        """Get a specific person by ID"""
+        return (await self.db.scalars(select(PeopleModel).where(PeopleModel.id == person_id).limit(1))).first()
+    
+    async def get_person_by_pc_id(self, pc_id: str) -> Optional[PeopleModel]:
+        """Get a person by Planning Center ID"""
+        return (await self.db.scalars(
+            select(PeopleModel).where(PeopleModel.planning_center_id == pc_id).limit(1)
+        )).first()
+    
+    async def search_people(self, search_term: str, limit: int = 50) -> List[PeopleModel]:
+        """Search people by name or email"""
+        return list(await self.db.scalars(people_search_query(search_term, limit)))
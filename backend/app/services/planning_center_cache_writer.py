@@ -0,0 +1,91 @@
+"""
+Batch writers for the Planning Center cache tables
+
+``upsert_cache_rows`` writes ``PlanningCenterEventsCache`` and
+``PlanningCenterRegistrationsCache`` rows in chunks. Each chunk looks up its
+stored ids and fingerprints with a single ``IN`` query, drops the rows whose
+fingerprint is unchanged and writes the rest with a native
+``INSERT ... ON CONFLICT DO UPDATE`` on PostgreSQL and SQLite (executemany
+insert/update elsewhere). Nothing is committed here; the caller commits the
+rows together with the rest of its batch.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.planning_center_fingerprint import fingerprint
+
+
+def upsert_cache_rows(
+    db: Session,
+    model,
+    key_column: str,
+    rows: List[Tuple[Any, Dict[str, Any]]],
+    protected: Sequence[str] = (),
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """Upsert ``(PC id, column values)`` pairs keyed on ``key_column``.
+
+    Columns in ``protected`` are written on insert but never updated. Returns
+    inserted/updated/unchanged counts.
+    """
+    chunk_size = chunk_size or settings.PLANNING_CENTER_SYNC_CHUNK_SIZE
+    result = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for start in range(0, len(rows), chunk_size):
+        inserted, updated, unchanged = _upsert_chunk(db, model, key_column, rows[start:start + chunk_size], protected)
+        result["inserted"] += inserted
+        result["updated"] += updated
+        result["unchanged"] += unchanged
+    return result
+
+
+def _upsert_chunk(db: Session, model, key_column: str, chunk: List[Tuple[Any, Dict[str, Any]]],
+                  protected: Sequence[str]) -> Tuple[int, int, int]:
+    now = datetime.utcnow()
+    pending = {}
+    for key, row in chunk:
+        if not key:
+            raise ValueError("Planning Center payload is missing an id")
+        pending[str(key)] = dict(row, **{key_column: str(key)}, pc_fingerprint=fingerprint(row),
+                                 last_synced_at=now, updated_at=now)  # last payload for an id wins
+
+    key_attr = getattr(model, key_column)
+    stored = {key: (row_id, row_fingerprint) for key, row_id, row_fingerprint in db.execute(
+        select(key_attr, model.id, model.pc_fingerprint).where(key_attr.in_(list(pending)))
+    ).all()}
+    unchanged = [key for key, row in pending.items() if key in stored and stored[key][1] == row["pc_fingerprint"]]
+    for key in unchanged:
+        del pending[key]
+    if not pending:
+        return 0, 0, len(unchanged)
+    existing = set(stored) & set(pending)
+    update_columns = [column for column in next(iter(pending.values()))
+                      if column != key_column and column not in protected]
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_attr],
+            set_={column: getattr(stmt.excluded, column) for column in update_columns}
+        )
+        db.execute(stmt, list(pending.values()))
+    else:
+        inserts = [row for key, row in pending.items() if key not in existing]
+        if inserts:
+            db.bulk_insert_mappings(model, inserts)
+        if existing:
+            db.bulk_update_mappings(model, [
+                dict({column: row[column] for column in update_columns}, id=stored[key][0])
+                for key, row in pending.items() if key in existing
+            ])
+    return len(pending) - len(existing), len(existing), len(unchanged)
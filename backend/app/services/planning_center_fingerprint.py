@@ -0,0 +1,18 @@
+"""
+Content fingerprints for Planning Center synced rows
+
+Each synced row stores a hash of the values it was last written from. A sync
+recomputes the hash from the incoming payload and skips the write when they
+match, so an unchanged record costs no UPDATE, no ``updated_at`` bump and no
+WAL traffic.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+
+def fingerprint(values: Dict[str, Any]) -> str:
+    """SHA-256 of mapped column values, independent of key order"""
+    payload = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
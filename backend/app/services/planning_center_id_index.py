@@ -0,0 +1,63 @@
+"""
+Planning Center ID resolution index
+
+Registrations reference people and events by their Planning Center ids, but
+enrollments need the local ``People.id`` and ``Course.id``. The index holds
+both mappings as plain dicts for the length of a sync run, loaded with one
+column-only query per table, so resolving a registration costs no queries.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.course import Course
+from app.models.member import People
+
+
+class PlanningCenterIdIndex:
+    """Maps PC person ids to People.id and PC event ids to Course.id"""
+
+    def __init__(self, db: Session, people: Optional[Dict[str, int]] = None, courses: Optional[Dict[str, int]] = None):
+        self.db = db
+        self.people: Dict[str, Optional[int]] = people or {}
+        self.courses: Dict[str, Optional[int]] = courses or {}
+
+    @classmethod
+    def load(cls, db: Session) -> "PlanningCenterIdIndex":
+        """Load every synced person and course id in two column-only queries"""
+        people = dict(db.query(People.planning_center_id, People.id).filter(
+            People.planning_center_id.isnot(None)
+        ).all())
+        courses = dict(db.query(Course.planning_center_event_id, Course.id).filter(
+            Course.planning_center_event_id.isnot(None)
+        ).all())
+        return cls(db, people, courses)
+
+    def person_id(self, planning_center_id: Optional[str]) -> Optional[int]:
+        """Local People.id for a PC person id, or None if that person is not synced"""
+        if not planning_center_id:
+            return None
+        planning_center_id = str(planning_center_id)
+        if planning_center_id not in self.people:
+            # Rows written after the index was loaded (e.g. by a webhook); the
+            # answer is cached, so each unknown id is looked up at most once
+            row = self.db.query(People.id).filter(People.planning_center_id == planning_center_id).first()
+            self.people[planning_center_id] = row[0] if row else None
+        return self.people[planning_center_id]
+
+    def course_id(self, planning_center_event_id: Optional[str]) -> Optional[int]:
+        """Local Course.id for a PC event id, or None if that event is not synced"""
+        if not planning_center_event_id:
+            return None
+        planning_center_event_id = str(planning_center_event_id)
+        if planning_center_event_id not in self.courses:
+            row = self.db.query(Course.id).filter(Course.planning_center_event_id == planning_center_event_id).first()
+            self.courses[planning_center_event_id] = row[0] if row else None
+        return self.courses[planning_center_event_id]
+
+    def add_person(self, planning_center_id: str, people_id: int):
+        self.people[str(planning_center_id)] = people_id
+
+    def add_course(self, planning_center_event_id: str, course_id: int):
+        self.courses[str(planning_center_event_id)] = course_id
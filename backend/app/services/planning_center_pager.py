@@ -0,0 +1,317 @@
+"""
+Planning Center paging engine
+
+Walks every page of a Planning Center JSON:API list endpoint and prefetches
+upcoming pages concurrently, so records reach the processing stage as a stream.
+Each page body is decoded incrementally as it arrives, so with the bounded
+prefetch window peak memory stays flat however large the directory is.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import httpx
+
+from app.core.config import settings
+from app.core.planning_center_response_cache import CACHE_HEADER
+from app.services.planning_center_stream import PlanningCenterStreamDecoder
+
+
+def flatten_resource(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a JSON:API resource into the flat dict the sync services expect.
+
+    Attributes are lifted to the top level and to-one relationships become
+    ``<name>_id`` keys (e.g. ``event_id``, ``person_id``). Records that are
+    already flat (such as the mock API's) are returned unchanged.
+    """
+    if "attributes" not in resource and "relationships" not in resource:
+        return resource
+
+    flat = {"id": resource.get("id")}
+    flat.update(resource.get("attributes") or {})
+    for name, relationship in (resource.get("relationships") or {}).items():
+        data = (relationship or {}).get("data")
+        if isinstance(data, dict) and data.get("id") is not None:
+            flat.setdefault(f"{name}_id", data["id"])
+    return flat
+
+
+def _offset_from_url(url: Optional[str]) -> Optional[int]:
+    """Extract the ``offset`` query parameter from a paging link"""
+    if not url:
+        return None
+    values = parse_qs(urlparse(url).query).get("offset")
+    if not values:
+        return None
+    try:
+        return int(values[0])
+    except ValueError:
+        return None
+
+
+class PlanningCenterPage:
+    """A single decoded page of a Planning Center list response"""
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        included: List[Dict[str, Any]],
+        offset: int,
+        total_count: Optional[int],
+        next_offset: Optional[int]
+    ):
+        self.records = records
+        self.included = included
+        self.offset = offset
+        self.total_count = total_count
+        self.next_offset = next_offset
+
+    @classmethod
+    def from_body(cls, body: Dict[str, Any], offset: int) -> "PlanningCenterPage":
+        """Build a page from a decoded JSON:API response body"""
+        return cls.from_parts(
+            records=[flatten_resource(item) for item in body.get("data") or []],
+            included=body.get("included") or [],
+            meta=body.get("meta") or {},
+            links=body.get("links") or {},
+            offset=offset
+        )
+
+    @classmethod
+    def from_parts(
+        cls,
+        records: List[Dict[str, Any]],
+        included: List[Dict[str, Any]],
+        meta: Dict[str, Any],
+        links: Dict[str, Any],
+        offset: int
+    ) -> "PlanningCenterPage":
+        """Build a page from already flattened records and the top-level members"""
+        # PC reports the next page as meta.next.offset and links.next; the
+        # mock API reports it as a URL in meta.next.
+        next_meta = meta.get("next")
+        if isinstance(next_meta, dict):
+            next_offset = next_meta.get("offset")
+        else:
+            next_offset = _offset_from_url(next_meta) if isinstance(next_meta, str) else None
+        if next_offset is None:
+            next_offset = _offset_from_url(links.get("next"))
+        if not records:
+            next_offset = None
+
+        return cls(
+            records=records,
+            included=included,
+            offset=offset,
+            total_count=meta.get("total_count"),
+            next_offset=next_offset
+        )
+
+
+class PlanningCenterPager:
+    """Fetches every page of a Planning Center list endpoint.
+
+    Once the first page reports ``meta.total_count`` the remaining page
+    offsets are known up front, so up to ``prefetch_pages`` of them are
+    requested concurrently while earlier pages are being processed. Pages are
+    always yielded in order. Without a total count the pager falls back to
+    following ``links.next`` one page at a time.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+        per_page: Optional[int] = None,
+        prefetch_pages: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ):
+        self.client = client
+        self.headers = headers
+        self.per_page = per_page or settings.PLANNING_CENTER_PAGE_SIZE
+        self.prefetch_pages = max(1, prefetch_pages or settings.PLANNING_CENTER_PREFETCH_PAGES)
+        self.semaphore = semaphore or asyncio.Semaphore(self.prefetch_pages)
+
+    async def fetch_page(self, url: str, params: Optional[Dict[str, Any]] = None, offset: int = 0) -> PlanningCenterPage:
+        """Fetch and decode a single page"""
+        query = dict(params or {})
+        query["per_page"] = self.per_page
+        if offset:
+            query["offset"] = offset
+
+        # Decode while the body streams in, so only the flattened records are
+        # held in memory rather than the raw body plus its decoded tree
+        records, included = [], []
+        async with self.semaphore:
+            async with self.client.stream("GET", url, headers=self.headers, params=query) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                cache, key = response.extensions.get("pc_response_cache") or (None, None)
+                etag = response.headers.get("ETag")
+                if cache is not None and response.headers.get(CACHE_HEADER) == "revalidated":
+                    parts = cache.parsed(key, etag)
+                    if parts is not None:
+                        # PC says the page is unchanged and it was decoded before
+                        return PlanningCenterPage.from_parts(
+                            records=[dict(record) for record in parts[0]],
+                            included=list(parts[1]),
+                            meta=parts[2],
+                            links=parts[3],
+                            offset=offset
+                        )
+                decoder = PlanningCenterStreamDecoder()
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    self._collect(decoder.feed(chunk), records, included)
+                self._collect(decoder.close(), records, included)
+
+        meta = decoder.document.get("meta") or {}
+        links = decoder.document.get("links") or {}
+        if cache is not None:
+            cache.remember_parsed(key, etag, size, lambda: (
+                [dict(record) for record in records], list(included), meta, links))
+        return PlanningCenterPage.from_parts(
+            records=records,
+            included=included,
+            meta=meta,
+            links=links,
+            offset=offset
+        )
+
+    @staticmethod
+    def _collect(items: List[Tuple[str, Any]], records: List[Dict[str, Any]], included: List[Dict[str, Any]]):
+        for member, item in items:
+            if member == "data":
+                records.append(flatten_resource(item))
+            else:
+                included.append(item)
+
+    async def fetch_record(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a single resource, flattened; returns None if PC no longer has it"""
+        async with self.semaphore:
+            response = await self.client.get(url, headers=self.headers, params=params)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json().get("data")
+        return flatten_resource(data) if isinstance(data, dict) else None
+
+    async def iter_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        offset: int = 0
+    ) -> AsyncIterator[PlanningCenterPage]:
+        """Yield every page of ``url`` in order, starting ``offset`` records in"""
+        first = await self.fetch_page(url, params, offset)
+        yield first
+        if first.next_offset is None:
+            return
+
+        if first.total_count is None:
+            page = first
+            while page.next_offset is not None:
+                page = await self.fetch_page(url, params, page.next_offset)
+                yield page
+            return
+
+        step = max(1, first.next_offset - first.offset)
+        offsets = iter(range(first.next_offset, first.total_count, step))
+        pending = deque()
+
+        def schedule():
+            while len(pending) < self.prefetch_pages:
+                offset = next(offsets, None)
+                if offset is None:
+                    return
+                pending.append(asyncio.ensure_future(self.fetch_page(url, params, offset)))
+
+        try:
+            schedule()
+            page = first
+            while pending:
+                page = await pending.popleft()
+                schedule()
+                yield page
+
+            # Records added while we were paging spill past the original total
+            while page.next_offset is not None:
+                page = await self.fetch_page(url, params, page.next_offset)
+                yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_records(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        offset: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every record of ``url`` in order"""
+        async for page in self.iter_pages(url, params, offset):
+            for record in page.records:
+                yield record
+
+    async def iter_chunks(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        offset: int = 0
+    ) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """Regroup the page stream into write-sized chunks.
+
+        Yields ``(records, total_count)`` where ``total_count`` is the latest
+        ``meta.total_count`` seen, for progress reporting.
+        """
+        chunk_size = chunk_size or settings.PLANNING_CENTER_SYNC_CHUNK_SIZE
+        buffer = []
+        total_count = None
+        async for page in self.iter_pages(url, params, offset):
+            if page.total_count is not None:
+                total_count = page.total_count
+            buffer.extend(page.records)
+            while len(buffer) >= chunk_size:
+                yield buffer[:chunk_size], total_count
+                buffer = buffer[chunk_size:]
+        if buffer:
+            yield buffer, total_count
+
+    async def fan_out(
+        self,
+        keys: AsyncIterable[str],
+        url_for: Callable[[str], str],
+        params: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]], Optional[Exception]]]:
+        """Fetch every record of ``url_for(key)`` for many keys concurrently.
+
+        Up to ``concurrency`` keys are in flight at once. Results are yielded
+        as ``(key, records, error)`` in key order, so a single consumer can
+        apply the database writes; a failed key yields its HTTP error instead
+        of aborting the others.
+        """
+        concurrency = max(1, concurrency or settings.PLANNING_CENTER_EVENT_CONCURRENCY)
+        pending = deque()
+
+        async def fetch(key: str):
+            try:
+                return key, [record async for record in self.iter_records(url_for(key), params)], None
+            except httpx.HTTPError as e:
+                return key, [], e
+
+        try:
+            async for key in keys:
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+                pending.append(asyncio.ensure_future(fetch(key)))
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,119 @@
+"""
+Full-sync reconciliation against Planning Center
+
+A full people or events sync sees every id Planning Center still has. Records
+deleted or merged away in PC never show up again, so their local rows would
+otherwise stay active forever. After a complete full sync the reconciler
+sorts the ids it saw, streams the local ``planning_center_*`` key column in the
+same order and walks both lists once, like a merge join:
+
+- active rows PC no longer has are deactivated (``is_active=False``) and
+  stamped with ``pc_missing_since``
+- rows it deactivated earlier that PC lists again are reactivated
+
+Only rows a sync wrote (``data_source='api'``) are compared; CSV-loaded and
+manually created rows have keys PC never issued. Only key columns are read
+and the writes are set-based ``UPDATE ... WHERE key IN (...)`` statements,
+one per chunk, so no ORM objects are loaded.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+class ReconciliationAborted(Exception):
+    """The diff would deactivate more rows than PLANNING_CENTER_RECONCILE_MAX_FRACTION allows"""
+
+
+def merge_diff(local_rows: Iterable[Tuple[Any, ...]], seen_ids: Iterable[str]) -> Iterator[Tuple[Tuple[Any, ...], bool]]:
+    """Pair each local row (key first, ascending) with whether its key is in ``seen_ids`` (ascending)"""
+    seen = iter(seen_ids)
+    current = next(seen, None)
+    for row in local_rows:
+        while current is not None and current < row[0]:
+            current = next(seen, None)
+        yield row, current == row[0]
+
+
+class PlanningCenterReconciler:
+    """Deactivates local rows whose Planning Center record no longer exists"""
+
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.PLANNING_CENTER_SYNC_CHUNK_SIZE
+
+    def _local_rows(self, model, key_column: str) -> Iterable[Tuple[str, bool, Optional[datetime]]]:
+        """(key, is_active, pc_missing_since) of every row a sync wrote, in Python string order"""
+        key = getattr(model, key_column)
+        dialect = self.db.get_bind().dialect.name
+        query = select(key, model.is_active, model.pc_missing_since).where(
+            key.isnot(None), model.data_source == "api"
+        )
+        if dialect == "postgresql":
+            # Byte order of UTF-8 is code point order, which is how Python compares str
+            return self.db.execute(query.order_by(key.collate("C")).execution_options(yield_per=self.chunk_size))
+        if dialect == "sqlite":
+            # SQLite's default BINARY collation already compares that way
+            return self.db.execute(query.order_by(key).execution_options(yield_per=self.chunk_size))
+        # Other collations may not match Python's, so sort the keys here
+        return sorted(self.db.execute(query).all(), key=lambda row: row[0])
+
+    def reconcile(self, model, key_column: str, seen_ids: Iterable[Any],
+                  updated_by: Optional[int] = None) -> Dict[str, int]:
+        """Diff ``seen_ids`` (every id a complete full sync saw) against the local rows.
+
+        Returns checked/deactivated/reactivated counts. Raises
+        ``ReconciliationAborted`` without writing anything if more than
+        PLANNING_CENTER_RECONCILE_MAX_FRACTION of the active rows would be
+        deactivated, which points at a truncated listing rather than deletions.
+        """
+        seen = sorted({str(seen_id) for seen_id in seen_ids if seen_id})
+        missing: List[str] = []
+        returned: List[str] = []
+        checked = active = 0
+        for (key, is_active, missing_since), found in merge_diff(self._local_rows(model, key_column), seen):
+            checked += 1
+            active += bool(is_active)
+            if not found and is_active:
+                missing.append(key)
+            elif found and missing_since is not None:
+                returned.append(key)
+
+        if missing and len(missing) > active * settings.PLANNING_CENTER_RECONCILE_MAX_FRACTION:
+            raise ReconciliationAborted(
+                f"{len(missing)} of {active} active {model.__tablename__} rows are missing from Planning Center; "
+                f"not deactivating more than {settings.PLANNING_CENTER_RECONCILE_MAX_FRACTION:.0%}"
+            )
+
+        now = datetime.utcnow()
+        self._bulk_update(model, key_column, missing, is_active=False, pc_missing_since=now,
+                          updated_at=now, updated_by=updated_by)
+        self._bulk_update(model, key_column, returned, is_active=True, pc_missing_since=None,
+                          updated_at=now, updated_by=updated_by)
+        return {"checked": checked, "deactivated": len(missing), "reactivated": len(returned)}
+
+    def deactivate(self, model, key_column: str, keys: Iterable[Any], updated_by: Optional[int] = None) -> int:
+        """Deactivate the active rows of records known to be deleted in PC (``*.destroyed`` webhooks)"""
+        key = getattr(model, key_column)
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(model).where(key.in_([str(k) for k in keys]), model.is_active.is_(True))
+            .values(is_active=False, pc_missing_since=now, updated_at=now, updated_by=updated_by)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def _bulk_update(self, model, key_column: str, keys: List[str], **values):
+        key = getattr(model, key_column)
+        for start in range(0, len(keys), self.chunk_size):
+            self.db.execute(
+                update(model).where(key.in_(keys[start:start + self.chunk_size])).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
@@ -0,0 +1,129 @@
+"""
+Incremental decoder for Planning Center JSON:API responses
+
+Decodes a response body chunk by chunk and hands back each ``data[]`` and
+``included[]`` item as soon as its closing brace has arrived, so neither the
+raw body nor the fully decoded document has to be held in memory. Other
+top-level members (``meta``, ``links``) are small and are collected whole.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, List, Tuple
+
+# Top-level arrays whose items are streamed instead of collected
+STREAMED_MEMBERS = ("data", "included")
+
+_WHITESPACE = " \t\n\r"
+
+
+class PlanningCenterStreamDecoder:
+    """Push-style decoder: ``feed`` bytes, get back ``(member, item)`` pairs"""
+
+    def __init__(self):
+        self.document: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._member = None
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return every item it completed"""
+        self._buffer += self._utf8.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Finish the stream; raises ValueError if the document is incomplete"""
+        self._buffer += self._utf8.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise ValueError("Incomplete JSON document in Planning Center response")
+        return items
+
+    def _skip_whitespace(self):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    def _peek(self):
+        self._skip_whitespace()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode_value(self, final: bool):
+        """Decode the next complete value, or return (False, None) if more bytes are needed"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Malformed JSON in Planning Center response")
+            return False, None
+        # A scalar ending exactly at the buffer edge (e.g. a number) may continue
+        if end == len(self._buffer) and not final and not isinstance(value, (dict, list, str)):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Unexpected JSON in Planning Center response: expected '{char}'")
+        self._pos += 1
+
+    def _drain(self, final: bool) -> List[Tuple[str, Any]]:
+        items = []
+        while True:
+            char = self._peek()
+            if char is None:
+                break
+
+            if self._state == "start":
+                self._expect("{")
+                self._state = "key"
+            elif self._state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                if char == ",":
+                    self._pos += 1
+                    continue
+                complete, key = self._decode_value(final)
+                if not complete:
+                    break
+                self._member = key
+                self._state = "colon"
+            elif self._state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif self._state == "value":
+                if self._member in STREAMED_MEMBERS and char == "[":
+                    self._pos += 1
+                    self._state = "item"
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                self.document[self._member] = value
+                self._state = "key"
+            elif self._state == "item":
+                if char == "]":
+                    self._pos += 1
+                    self._state = "key"
+                    continue
+                if char == ",":
+                    self._pos += 1
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                items.append((self._member, value))
+            else:
+                if char not in _WHITESPACE:
+                    raise ValueError("Unexpected data after JSON document in Planning Center response")
+                self._pos += 1
+
+        # Drop what has been consumed so the buffer stays about one item long
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return items
@@ -0,0 +1,134 @@
+"""
+Dependency-aware stage executor for sync_all
+
+``run_stages`` starts every stage as soon as the stages it depends on have
+completed, with at most ``concurrency`` stages running at once, and records
+when each stage became ready, started and finished. A stage whose dependency
+did not complete is not run and is reported as "skipped". sync_all runs people
+and events side by side and starts registrations once people are in.
+
+Registrations also need the events, but not all of them at once: the events
+stage publishes each page of event ids to a ``PlanningCenterEventFeed`` after
+writing it, and the registrations stage fetches those events' registrations
+while the rest of the events are still being synced.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+
+class SyncStage:
+    """One node of the sync DAG"""
+
+    def __init__(self, name: str, run: Callable[[], Awaitable[Optional[str]]], after: Sequence[str] = ()):
+        self.name = name
+        self.run = run  # returns the stage's final status
+        self.after = tuple(after)
+
+
+async def run_stages(stages: List[SyncStage], concurrency: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Run stages in dependency order; returns per-stage timings in seconds from the start"""
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = set(stage.after) - names
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(sorted(missing))}")
+
+    done = {stage.name: asyncio.Event() for stage in stages}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    timings: Dict[str, Dict[str, Any]] = {}
+    started = time.monotonic()
+
+    def elapsed() -> float:
+        return round(time.monotonic() - started, 3)
+
+    async def run(stage: SyncStage):
+        timing = timings[stage.name] = {"after": list(stage.after)}
+        try:
+            for name in stage.after:
+                await done[name].wait()
+            timing["ready_at"] = elapsed()
+            incomplete = [name for name in stage.after if timings[name].get("status") != "completed"]
+            if incomplete:
+                timing["status"] = "skipped"
+                timing["error"] = f"Skipped because {', '.join(incomplete)} did not complete"
+                return
+            async with semaphore:
+                timing["started_at"] = elapsed()
+                try:
+                    timing["status"] = await stage.run() or "completed"
+                except Exception as e:
+                    timing["status"] = "failed"
+                    timing["error"] = str(e)
+                timing["finished_at"] = elapsed()
+                timing["seconds"] = round(timing["finished_at"] - timing["started_at"], 3)
+        finally:
+            done[stage.name].set()
+
+    await asyncio.gather(*(run(stage) for stage in stages))
+    return timings
+
+
+class PlanningCenterEventFeed:
+    """Event ids handed from the events stage to the registrations stage as they are written.
+
+    The ids arrive in PC list order. The feed is only ``usable`` when the
+    events stage reads the whole, unfiltered list from the start (a fresh full
+    sync); otherwise the registrations stage waits for the events stage to
+    ``close`` the feed and lists the events itself.
+    """
+
+    def __init__(self):
+        self.event_ids: List[str] = []
+        self.total_count: Optional[int] = None
+        self.usable: Optional[bool] = None
+        self.complete = False
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        self._changed.set()
+
+    async def _wait(self):
+        await self._changed.wait()
+        self._changed.clear()
+
+    def start(self, usable: bool):
+        self.usable = usable
+        self._notify()
+
+    def publish(self, event_ids: Iterable[Any], total_count: Optional[int] = None):
+        self.event_ids.extend(str(event_id) for event_id in event_ids)
+        if total_count is not None:
+            self.total_count = total_count
+        self._notify()
+
+    def mark_complete(self):
+        """The events stage went through every page"""
+        self.complete = True
+
+    def close(self):
+        self.closed = True
+        self._notify()
+
+    async def wait_usable(self) -> bool:
+        """Wait until the events stage says whether the feed can be used"""
+        while self.usable is None and not self.closed:
+            await self._wait()
+        return bool(self.usable)
+
+    async def wait_closed(self):
+        while not self.closed:
+            await self._wait()
+
+    async def iterate(self, start: int = 0):
+        """Yield the ids published from ``start`` on, waiting for more until the feed closes"""
+        index = start
+        while True:
+            while index < len(self.event_ids):
+                yield self.event_ids[index]
+                index += 1
+            if self.closed:
+                return
+            await self._wait()
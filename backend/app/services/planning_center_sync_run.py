@@ -0,0 +1,197 @@
+"""
+Checkpointed Planning Center sync runs
+
+A sync run keeps its counters and the position it has reached (list offset,
+events done) on its ``PlanningCenterSyncLog`` row and writes them after every
+batch it applies. When a job is restarted after its worker was recycled, or
+re-run after it failed, it picks the unfinished log back up and continues
+from that checkpoint instead of re-fetching and re-writing everything.
+
+Each batch runs in the savepoint opened by ``begin_batch``; the batch writers
+only flush their rows and ``checkpoint`` is the batch's one commit, so a
+batch's data and the position after it are stored together or not at all and
+a crash never replays a batch that was already written.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.core.planning_center_client import response_cache_stats
+from app.core.planning_center_response_cache import stats_delta
+from app.models.planning_center_sync_log import PlanningCenterSyncLog
+from app.services.sync_job_service import ACTIVE_STATUSES, SyncJobService
+
+# How many of the newest logs of a sync type to look through for a resumable run
+RESUME_LOOKBACK = 5
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class PlanningCenterSyncRun:
+    """Counters and resume point of one sync run, persisted on its sync log"""
+
+    def __init__(self, sync_log: PlanningCenterSyncLog, resumed: bool = False):
+        self.sync_log = sync_log
+        self.resumed = resumed
+        checkpoint = sync_log.checkpoint or {}
+        self.scope = checkpoint.get("scope")
+        self.position: Dict[str, Any] = dict(checkpoint.get("position") or {})
+        self.errors: List[str] = list(checkpoint.get("errors") or [])
+        self.high_water_mark = _parse_timestamp(checkpoint.get("high_water_mark"))
+        self.records_unresolved = checkpoint.get("records_unresolved", 0)
+        self.records_processed = sync_log.records_processed or 0
+        self.records_successful = sync_log.records_successful or 0
+        self.records_failed = sync_log.records_failed or 0
+        self.records_unchanged = sync_log.records_unchanged or 0
+        self.records_deactivated = sync_log.records_deactivated or 0
+        # Response cache counters are process-wide; concurrent syncs see each other's requests
+        self._cache_stats = response_cache_stats()
+        self._batch: Optional[SessionTransaction] = None
+
+    @classmethod
+    def start(
+        cls,
+        db: Session,
+        task_id: str,
+        sync_type: str,
+        mode: str,
+        updated_by: Optional[int] = None,
+        scope: Optional[str] = None
+    ) -> "PlanningCenterSyncRun":
+        """Resume the unfinished run of this sync if there is one, otherwise open a new log"""
+        sync_log = cls._resumable(db, task_id, sync_type, mode, scope)
+        if sync_log is not None:
+            sync_log.task_id = task_id
+            sync_log.completed_at = None
+            sync_log.error_details = None
+            db.commit()
+            return cls(sync_log, resumed=True)
+
+        sync_log = PlanningCenterSyncLog(
+            sync_type=sync_type,
+            sync_direction="from_pc",
+            sync_mode=mode,
+            started_at=datetime.utcnow(),
+            created_by=updated_by,
+            task_id=task_id,
+            checkpoint={"scope": scope, "position": {}}
+        )
+        db.add(sync_log)
+        db.commit()
+        return cls(sync_log)
+
+    @staticmethod
+    def _resumable(db: Session, task_id: str, sync_type: str, mode: str,
+                   scope: Optional[str]) -> Optional[PlanningCenterSyncLog]:
+        """The newest log of this sync, if it is unfinished and nobody else is running it"""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.SYNC_CHECKPOINT_MAX_AGE_HOURS)
+        recent = db.query(PlanningCenterSyncLog).filter(
+            PlanningCenterSyncLog.sync_type == sync_type,
+            PlanningCenterSyncLog.sync_direction == "from_pc"
+        ).order_by(PlanningCenterSyncLog.started_at.desc(), PlanningCenterSyncLog.id.desc()).limit(RESUME_LOOKBACK).all()
+
+        for sync_log in recent:
+            if not sync_log.checkpoint:
+                return None  # a finished run is newer than anything older we could resume
+            if sync_log.checkpoint.get("scope") != scope:
+                continue
+            if sync_log.sync_mode != mode or _as_utc(sync_log.started_at) < _as_utc(cutoff):
+                return None
+            if sync_log.task_id and sync_log.task_id != task_id:
+                owner = SyncJobService(db).get(sync_log.task_id)
+                if owner is not None and owner.status in ACTIVE_STATUSES:
+                    return None
+            return sync_log
+        return None
+
+    def _write_counts(self):
+        self.sync_log.records_processed = self.records_processed
+        self.sync_log.records_successful = self.records_successful
+        self.sync_log.records_failed = self.records_failed
+        self.sync_log.records_unchanged = self.records_unchanged
+        self.sync_log.records_deactivated = self.records_deactivated
+
+    def begin_batch(self, db: Session):
+        """Open the savepoint a batch writes in; ``checkpoint`` commits it.
+
+        pysqlite starts no transaction before a SAVEPOINT, so without this
+        outer savepoint releasing a writer's own savepoint could commit part
+        of the batch on SQLite before its checkpoint.
+        """
+        self._batch = db.begin_nested()
+
+    def checkpoint(self, db: Session, **position):
+        """Record the position reached after a batch and commit it in the batch's transaction"""
+        self.position.update(position)
+        self._write_counts()
+        self.sync_log.checkpoint = {
+            "scope": self.scope,
+            "position": dict(self.position),
+            "errors": list(self.errors),
+            "high_water_mark": self.high_water_mark.isoformat() if self.high_water_mark else None,
+            "records_unresolved": self.records_unresolved,
+        }
+        if self._batch is not None:
+            self._batch.commit()
+            self._batch = None
+        db.commit()
+
+    def safe_high_water_mark(self) -> Optional[datetime]:
+        """Max PC updated_at seen, capped at the run's start when it was resumed.
+
+        Records before the checkpoint were read by an earlier attempt, so
+        changes made to them since the run started have not been seen.
+        """
+        if self.resumed and self.high_water_mark is not None:
+            return min(self.high_water_mark, _as_utc(self.sync_log.started_at))
+        return self.high_water_mark
+
+    def complete(self, db: Session, high_water_mark: Optional[datetime] = None):
+        """Close the log of a run that went through every record"""
+        self._write_counts()
+        if high_water_mark is not None:
+            self.sync_log.high_water_mark = high_water_mark
+        self.sync_log.checkpoint = None
+        self.sync_log.completed_at = datetime.utcnow()
+        if self.errors:
+            self.sync_log.error_details = {"errors": self.errors}
+        db.commit()
+
+    def fail(self, db: Session, error: str):
+        """Close the log of a failed run; its last checkpoint is kept so a retry resumes from it"""
+        self._batch = None
+        db.rollback()
+        self.sync_log.completed_at = datetime.utcnow()
+        self.sync_log.error_details = {"error": error}
+        db.commit()
+
+    def result(self, mode: str, **extra) -> Dict[str, Any]:
+        """Task result in the shape the sync endpoints report"""
+        result = {
+            "status": "success",
+            "mode": mode,
+            "records_processed": self.records_processed,
+            "records_successful": self.records_successful,
+            "records_failed": self.records_failed,
+            "records_unchanged": self.records_unchanged,
+            "records_deactivated": self.records_deactivated,
+        }
+        result.update(extra)
+        result["errors"] = self.errors
+        cache_stats = response_cache_stats()
+        if self._cache_stats is not None and cache_stats is not None:
+            result["response_cache"] = stats_delta(self._cache_stats, cache_stats)
+        if self.resumed:
+            result["resumed"] = True
+        return result
@@ -2,26 +2,83 @@
 Planning Center Sync Service
 """
 
-import httpx
 import asyncio
-import uuid
+import time
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-import threading
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
+from app.core.planning_center_client import planning_center_client, rate_limiter, response_cache_stats
+from app.core.planning_center_response_cache import stats_delta
 from app.services.people_service import PeopleService
-from app.services.course_service import CourseService
+from app.services.course_service import CourseService, course_fingerprint
 from app.services.enrollment_service import CourseEnrollmentService
+from app.services.planning_center_cache_writer import upsert_cache_rows
+from app.services.planning_center_id_index import PlanningCenterIdIndex
+from app.services.planning_center_fingerprint import fingerprint
+from app.services.planning_center_pager import PlanningCenterPager, PlanningCenterPage
+from app.services.planning_center_reconciler import PlanningCenterReconciler, ReconciliationAborted
+from app.services.planning_center_sync_dag import PlanningCenterEventFeed, SyncStage, run_stages
+from app.services.planning_center_sync_run import PlanningCenterSyncRun
+from app.services.sync_job_service import ACTIVE_STATUSES, FINISHED_STATUSES, SyncJobService, job_status
+from app.models.course import Course
+from app.models.enrollment import CourseEnrollment
+from app.models.member import People
 from app.models.planning_center_sync_log import PlanningCenterSyncLog
-from app.models.planning_center_webhook_events import PlanningCenterWebhookEvents
 from app.models.planning_center_events_cache import PlanningCenterEventsCache
 from app.models.planning_center_registrations_cache import PlanningCenterRegistrationsCache
 
-# Global task storage for tracking async operations
-sync_tasks = {}
+SYNC_MODES = ("full", "incremental")
+
+
+def map_pc_event_cache(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a flattened PC event payload onto events cache column values"""
+    return {
+        "event_name": event_data.get("name"),
+        "event_description": event_data.get("description"),
+        "start_date": _parse_pc_datetime(event_data.get("start_date")),
+        "end_date": _parse_pc_datetime(event_data.get("end_date")),
+        "max_capacity": event_data.get("max_capacity"),
+        "current_registrations_count": event_data.get("current_registrations", 0),
+        "registration_deadline": _parse_pc_datetime(event_data.get("registration_deadline")),
+        "event_status": event_data.get("status"),
+    }
+
+
+def map_pc_registration_cache(registration_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a flattened PC registration payload onto registrations cache column values"""
+    return {
+        "planning_center_event_id": registration_data.get("event_id"),
+        "planning_center_person_id": registration_data.get("person_id"),
+        "registration_status": registration_data.get("status"),
+        "registration_date": _parse_pc_datetime(registration_data.get("created_at")),
+        "registration_notes": registration_data.get("notes"),
+        "custom_field_responses": registration_data.get("custom_field_responses"),
+    }
+
+
+# A registration's PC event and person never change, so cache updates leave them alone
+REGISTRATION_CACHE_KEYS = ("planning_center_event_id", "planning_center_person_id")
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes (as SQLite returns them) as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _parse_pc_datetime(value: Any) -> Optional[datetime]:
+    """Parse a PC ISO-8601 timestamp into an aware UTC datetime"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    try:
+        return _as_utc(datetime.fromisoformat(str(value).replace("Z", "+00:00"))).astimezone(timezone.utc)
+    except ValueError:
+        return None
 
 
 class PlanningCenterSyncService:
@@ -34,6 +91,8 @@ class PlanningCenterSyncService:
         self.enrollment_service = CourseEnrollmentService(db)
         self.base_url = "https://api.planningcenteronline.com"
         self.headers = self._get_auth_headers()
+        self._pending_task_updates: Dict[str, Dict[str, Any]] = {}
+        self._task_flushed_at: Dict[str, float] = {}
     
     def _get_db_session(self):
         """Get a new database session for background tasks"""
@@ -55,424 +114,644 @@ class PlanningCenterSyncService:
             "Content-Type": "application/json"
         }
     
-    def _create_sync_task(self, task_type: str, task_id: str = None) -> str:
-        """Create a new sync task entry"""
-        if task_id is None:
-            task_id = str(uuid.uuid4())
-        
-        sync_tasks[task_id] = {
-            "task_type": task_type,
-            "status": "pending",
-            "started_at": datetime.utcnow(),
-            "progress": 0,
-            "message": "Task queued",
-            "result": None,
-            "error": None
-        }
-        return task_id
+    def _create_sync_task(self, task_type: str, task_id: str = None, params: Optional[Dict[str, Any]] = None,
+                          parent_id: Optional[str] = None) -> str:
+        """Queue a sync job; returns the id of the already active job of this type if there is one"""
+        db = self._get_db_session()
+        try:
+            job, _ = SyncJobService(db).enqueue(task_type, params=params, task_id=task_id, parent_id=parent_id)
+            return job.id
+        finally:
+            db.close()
     
     def _update_sync_task(self, task_id: str, **kwargs):
-        """Update sync task status"""
-        if task_id in sync_tasks:
-            sync_tasks[task_id].update(kwargs)
+        """Update sync task status.
+        
+        Progress-only updates are written at most once per
+        SYNC_JOB_PROGRESS_INTERVAL; anything else is written straight away
+        together with any progress still pending.
+        """
+        pending = self._pending_task_updates.setdefault(task_id, {})
+        pending.update(kwargs)
+        now = time.monotonic()
+        progress_only = set(kwargs) <= {"progress", "message", "api"}
+        if progress_only and not self._progress_due(task_id, now):
+            return
+        
+        if "progress" in pending:
+            # Surface current PC throughput and remaining request budget
+            pending.setdefault("api", rate_limiter.stats())
+        
+        db = self._get_db_session()
+        try:
+            SyncJobService(db).update(task_id, **self._pending_task_updates.pop(task_id))
+            self._task_flushed_at[task_id] = now
+        finally:
+            db.close()
+    
+    def _progress_due(self, task_id: str, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now - self._task_flushed_at.get(task_id, 0.0) >= settings.SYNC_JOB_PROGRESS_INTERVAL
+    
+    def _report_progress(self, task_id: str, done: int, total: int, noun: str):
+        """Record per-record progress from a sync loop.
+        
+        Checks the progress interval before building the update, so the
+        record loops only pay for a clock read between writes.
+        """
+        if not self._progress_due(task_id):
+            return
+        self._update_sync_task(task_id, progress=self._progress(done, total),
+                               message=f"Processed {done}/{total} {noun}")
     
     def get_sync_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get sync task status"""
-        return sync_tasks.get(task_id)
+        db = self._get_db_session()
+        try:
+            job = SyncJobService(db).get(task_id)
+            return job_status(job) if job else None
+        finally:
+            db.close()
     
     def list_sync_tasks(self, task_type: str = None) -> List[Dict[str, Any]]:
-        """List all sync tasks, optionally filtered by type"""
-        tasks = list(sync_tasks.values())
-        if task_type:
-            tasks = [task for task in tasks if task.get("task_type") == task_type]
-        return tasks
-    
-    def start_sync_people(self, updated_by: Optional[int] = None) -> str:
-        """Start async sync of people from Planning Center"""
-        task_id = self._create_sync_task("sync_people")
-        
-        # Start background task
-        def run_sync():
-            asyncio.run(self._sync_people_background(task_id, updated_by))
-        
-        thread = threading.Thread(target=run_sync, daemon=True)
-        thread.start()
-        
-        return task_id
+        """List recent sync tasks, optionally filtered by type"""
+        db = self._get_db_session()
+        try:
+            return [job_status(job) for job in SyncJobService(db).list_jobs(task_type=task_type)]
+        finally:
+            db.close()
     
-    def start_sync_events(self, updated_by: Optional[int] = None) -> str:
-        """Start async sync of events from Planning Center"""
-        task_id = self._create_sync_task("sync_events")
-        
-        # Start background task
-        def run_sync():
-            asyncio.run(self._sync_events_background(task_id, updated_by))
+    async def stream_sync_task(self, task_id: str, interval: Optional[float] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Follow a task until it finishes.
         
-        thread = threading.Thread(target=run_sync, daemon=True)
-        thread.start()
-        
-        return task_id
+        Yields ``("progress", status)`` whenever the task's status, progress
+        or message changes, checked at most once per ``interval``, then a
+        final ``("result", status)``. ``("ping", {})`` is yielded when nothing
+        has changed for SYNC_TASK_STREAM_KEEPALIVE_SECONDS. The status is
+        read in a worker thread so the event loop is never blocked.
+        """
+        interval = settings.SYNC_TASK_STREAM_INTERVAL if interval is None else interval
+        last = None
+        last_sent = time.monotonic()
+        while True:
+            task = await asyncio.to_thread(self.get_sync_task_status, task_id)
+            if task is None:
+                return
+            if task["status"] in FINISHED_STATUSES:
+                yield "result", task
+                return
+            
+            snapshot = (task["status"], task.get("progress"), task.get("message"))
+            if snapshot != last:
+                last = snapshot
+                last_sent = time.monotonic()
+                yield "progress", task
+            elif time.monotonic() - last_sent >= settings.SYNC_TASK_STREAM_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield "ping", {}
+            await asyncio.sleep(interval)
     
-    def start_sync_registrations(self, event_id: Optional[str] = None, updated_by: Optional[int] = None) -> str:
-        """Start async sync of registrations from Planning Center"""
-        task_id = self._create_sync_task("sync_registrations")
-        
-        # Start background task
-        def run_sync():
-            asyncio.run(self._sync_registrations_background(task_id, event_id, updated_by))
-        
-        thread = threading.Thread(target=run_sync, daemon=True)
-        thread.start()
-        
-        return task_id
+    def cancel_sync_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued task, or ask the worker running it to stop"""
+        db = self._get_db_session()
+        try:
+            job = SyncJobService(db).request_cancel(task_id)
+            return job_status(job) if job else None
+        finally:
+            db.close()
     
-    def start_sync_all(self, updated_by: Optional[int] = None) -> str:
-        """Start async sync of all data from Planning Center"""
-        task_id = self._create_sync_task("sync_all")
-        
-        # Start background task
-        def run_sync():
-            asyncio.run(self._sync_all_background(task_id, updated_by))
-        
-        thread = threading.Thread(target=run_sync, daemon=True)
-        thread.start()
+    async def run_sync_job(self, task_id: str, task_type: str, params: Dict[str, Any]):
+        """Run a claimed sync job (called by the worker pool)"""
+        runners = {
+            "sync_people": self._sync_people_background,
+            "sync_events": self._sync_events_background,
+            "sync_registrations": self._sync_registrations_background,
+            "sync_all": self._sync_all_background,
+        }
+        if task_type not in runners:
+            raise ValueError(f"Unknown sync task type '{task_type}'")
+        await runners[task_type](task_id, **params)
+    
+    def _start_sync_job(self, task_type: str, **params) -> str:
+        """Queue a sync job and wake the local worker pool"""
+        from app.services.sync_job_worker import sync_job_worker
         
+        task_id = self._create_sync_task(task_type, params=params)
+        sync_job_worker.notify()
         return task_id
     
-    async def _sync_people_background(self, task_id: str, updated_by: Optional[int] = None):
-        """Background sync of people from Planning Center"""
+    def _page_total(self, page: PlanningCenterPage, current_total: int, records_processed: int) -> int:
+        """Best known record total for progress reporting, taken from meta.total_count"""
+        if page.total_count is not None:
+            return max(page.total_count, records_processed + len(page.records))
+        return max(current_total, records_processed + len(page.records))
+    
+    def _progress(self, done: int, total: int) -> int:
+        """Map processed/total onto the 20-90% band used while records are processed"""
+        if total <= 0:
+            return 20
+        return 20 + int(min(done, total) / total * 70)
+    
+    def _registrations_url(self, event_id: str) -> str:
+        return f"{self.base_url}/events/v2/events/{event_id}/registrations"
+    
+    def _registrations_pager(self, client) -> PlanningCenterPager:
+        """Pager whose in-flight request limit covers the per-event fan-out"""
+        concurrency = max(settings.PLANNING_CENTER_EVENT_CONCURRENCY, settings.PLANNING_CENTER_PREFETCH_PAGES)
+        return PlanningCenterPager(client, self.headers, semaphore=asyncio.Semaphore(concurrency))
+    
+    def _validate_sync_mode(self, mode: Optional[str]):
+        """Reject unknown sync modes before a task is queued"""
+        if mode is not None and mode not in SYNC_MODES:
+            raise ValueError(f"Invalid sync mode '{mode}'. Expected one of: {', '.join(SYNC_MODES)}")
+    
+    def get_sync_watermark(self, sync_type: str, db: Optional[Session] = None) -> Optional[datetime]:
+        """Latest high-water mark (max PC updated_at) recorded for a sync type"""
+        db = db or self.db
+        sync_log = db.query(PlanningCenterSyncLog).filter(
+            PlanningCenterSyncLog.sync_type == sync_type,
+            PlanningCenterSyncLog.high_water_mark.isnot(None)
+        ).order_by(PlanningCenterSyncLog.high_water_mark.desc()).first()
+        return _as_utc(sync_log.high_water_mark) if sync_log else None
+    
+    def _resolve_sync_mode(self, db: Session, sync_type: str, mode: Optional[str]) -> str:
+        """Default to incremental once a watermark exists, otherwise full"""
+        self._validate_sync_mode(mode)
+        if mode is not None:
+            return mode
+        return "incremental" if self.get_sync_watermark(sync_type, db=db) else "full"
+    
+    def _delta_params(self, watermark: Optional[datetime], mode: str) -> Dict[str, Any]:
+        """PC query filter for an incremental run, rewound by the safety overlap"""
+        if mode != "incremental" or watermark is None:
+            return {}
+        since = watermark - timedelta(minutes=settings.PLANNING_CENTER_SYNC_OVERLAP_MINUTES)
+        return {"where[updated_at][gte]": since.strftime("%Y-%m-%dT%H:%M:%SZ")}
+    
+    def _max_updated_at(self, records: List[Dict[str, Any]], current: Optional[datetime]) -> Optional[datetime]:
+        """Fold the records' PC updated_at values into the running maximum"""
+        for record in records:
+            updated_at = _parse_pc_datetime(record.get("updated_at"))
+            if updated_at and (current is None or updated_at > current):
+                current = updated_at
+        return current
+    
+    def _next_watermark(self, previous: Optional[datetime], seen: Optional[datetime], records_failed: int) -> Optional[datetime]:
+        """Advance the watermark only when every record was applied"""
+        if records_failed or seen is None:
+            return previous
+        if previous is None or seen > previous:
+            return seen
+        return previous
+    
+    def start_sync_people(self, updated_by: Optional[int] = None, mode: Optional[str] = None) -> str:
+        """Queue a sync of people from Planning Center"""
+        self._validate_sync_mode(mode)
+        return self._start_sync_job("sync_people", updated_by=updated_by, mode=mode)
+    
+    def start_sync_events(self, updated_by: Optional[int] = None, mode: Optional[str] = None) -> str:
+        """Queue a sync of events from Planning Center"""
+        self._validate_sync_mode(mode)
+        return self._start_sync_job("sync_events", updated_by=updated_by, mode=mode)
+    
+    def start_sync_registrations(self, event_id: Optional[str] = None, updated_by: Optional[int] = None, mode: Optional[str] = None) -> str:
+        """Queue a sync of registrations from Planning Center"""
+        self._validate_sync_mode(mode)
+        return self._start_sync_job("sync_registrations", event_id=event_id, updated_by=updated_by, mode=mode)
+    
+    def start_sync_all(self, updated_by: Optional[int] = None, mode: Optional[str] = None) -> str:
+        """Queue a sync of all data from Planning Center"""
+        self._validate_sync_mode(mode)
+        return self._start_sync_job("sync_all", updated_by=updated_by, mode=mode)
+    
+    async def _sync_people_background(self, task_id: str, updated_by: Optional[int] = None, mode: Optional[str] = None):
+        """Background sync of people from Planning Center, resumable from its last checkpoint"""
         db = self._get_db_session()
         try:
             self._update_sync_task(task_id, status="running", message="Starting people sync...")
             
-            sync_log = PlanningCenterSyncLog(
-                sync_type="people",
-                sync_direction="from_pc",
-                started_at=datetime.utcnow(),
-                created_by=updated_by
-            )
-            db.add(sync_log)
-            db.commit()
+            mode = self._resolve_sync_mode(db, "people", mode)
+            previous_watermark = self.get_sync_watermark("people", db=db)
+            params = self._delta_params(previous_watermark, mode)
+            self._update_sync_task(task_id, mode=mode)
             
-            async with httpx.AsyncClient() as client:
-                # Get all people from Planning Center
-                self._update_sync_task(task_id, progress=10, message="Fetching people from Planning Center...")
-                response = await client.get(
-                    f"{self.base_url}/people/v2/people",
-                    headers=self.headers,
-                    params={"per_page": 100}
-                )
-                response.raise_for_status()
-                
-                people_data = response.json()
-                records_processed = 0
-                records_successful = 0
-                records_failed = 0
-                errors = []
+            run = PlanningCenterSyncRun.start(db, task_id, "people", mode, updated_by=updated_by)
+            offset = run.position.get("offset", 0)
+            
+            async with planning_center_client() as client:
+                pager = PlanningCenterPager(client, self.headers)
                 
-                total_records = len(people_data.get("data", []))
-                self._update_sync_task(task_id, progress=20, message=f"Processing {total_records} people...")
+                # Get all people from Planning Center
+                message = f"Resuming people sync at record {offset}..." if offset else "Fetching people from Planning Center..."
+                self._update_sync_task(task_id, progress=10, message=message)
                 
-                for i, person_data in enumerate(people_data.get("data", [])):
-                    records_processed += 1
-                    try:
-                        people_service = PeopleService(db)
-                        people_service.sync_from_planning_center(
-                            person_data, updated_by=updated_by
-                        )
-                        records_successful += 1
-                    except Exception as e:
-                        records_failed += 1
-                        errors.append(f"Person {person_data.get('id')}: {str(e)}")
+                people_service = PeopleService(db)
+                # Only a full read from the top sees every id PC still has
+                seen_ids = [] if mode == "full" and offset == 0 else None
+                async for chunk, total_count in pager.iter_chunks(f"{self.base_url}/people/v2/people", params, offset=offset):
+                    if seen_ids is not None:
+                        seen_ids.extend(person.get("id") for person in chunk)
+                    run.begin_batch(db)
+                    batch = people_service.bulk_sync_from_planning_center(chunk, updated_by=updated_by, commit=False)
+                    run.high_water_mark = self._max_updated_at(chunk, run.high_water_mark)
+                    run.records_processed += batch["processed"]
+                    run.records_successful += batch["processed"] - batch["failed"]
+                    run.records_failed += batch["failed"]
+                    run.records_unchanged += batch["unchanged"]
+                    run.errors.extend(batch["errors"])
+                    offset += len(chunk)
+                    run.checkpoint(db, offset=offset)
                     
                     # Update progress
-                    progress = 20 + int((i + 1) / total_records * 70)
-                    self._update_sync_task(task_id, progress=progress, 
-                                         message=f"Processed {i + 1}/{total_records} people")
+                    total_records = max(total_count or 0, run.records_processed)
+                    self._report_progress(task_id, run.records_processed, total_records, "people")
                 
-                # Update sync log
-                sync_log.records_processed = records_processed
-                sync_log.records_successful = records_successful
-                sync_log.records_failed = records_failed
-                sync_log.completed_at = datetime.utcnow()
-                if errors:
-                    sync_log.error_details = {"errors": errors}
-                
-                db.commit()
-                
-                result = {
-                    "status": "success",
-                    "records_processed": records_processed,
-                    "records_successful": records_successful,
-                    "records_failed": records_failed,
-                    "errors": errors
-                }
+                reconciliation = None
+                if seen_ids is not None:
+                    reconciliation = self._reconcile(db, People, "planning_center_id", seen_ids, updated_by, run.errors)
+                    run.records_deactivated = (reconciliation or {}).get("deactivated", 0)
+                run.complete(db, self._next_watermark(previous_watermark, run.safe_high_water_mark(), run.records_failed))
                 
                 self._update_sync_task(task_id, status="completed", progress=100, 
-                                     message="People sync completed successfully", result=result)
+                                     message="People sync completed successfully",
+                                     result=run.result(mode, reconciliation=reconciliation))
                 
         except Exception as e:
+            # Drop the unfinished batch before another session writes the job status
+            if 'run' in locals():
+                run.fail(db, str(e))
             self._update_sync_task(task_id, status="failed", 
                                  message=f"People sync failed: {str(e)}", error=str(e))
-            if 'sync_log' in locals():
-                sync_log.completed_at = datetime.utcnow()
-                sync_log.error_details = {"error": str(e)}
-                db.commit()
         finally:
             db.close()
     
-    async def _sync_events_background(self, task_id: str, updated_by: Optional[int] = None):
-        """Background sync of events from Planning Center"""
+    async def _sync_events_background(self, task_id: str, updated_by: Optional[int] = None, mode: Optional[str] = None,
+                                      event_feed: Optional[PlanningCenterEventFeed] = None):
+        """Background sync of events from Planning Center, resumable from its last checkpoint.
+        
+        With an ``event_feed`` each page of event ids is published once it is
+        written, so a concurrent registrations stage can start on them.
+        """
         db = self._get_db_session()
         try:
             self._update_sync_task(task_id, status="running", message="Starting events sync...")
             
-            sync_log = PlanningCenterSyncLog(
-                sync_type="events",
-                sync_direction="from_pc",
-                started_at=datetime.utcnow(),
-                created_by=updated_by
-            )
-            db.add(sync_log)
-            db.commit()
+            mode = self._resolve_sync_mode(db, "events", mode)
+            previous_watermark = self.get_sync_watermark("events", db=db)
+            params = self._delta_params(previous_watermark, mode)
+            self._update_sync_task(task_id, mode=mode)
             
-            async with httpx.AsyncClient() as client:
-                # Get all events from Planning Center
-                self._update_sync_task(task_id, progress=10, message="Fetching events from Planning Center...")
-                response = await client.get(
-                    f"{self.base_url}/events/v2/events",
-                    headers=self.headers,
-                    params={"per_page": 100}
-                )
-                response.raise_for_status()
-                
-                events_data = response.json()
-                records_processed = 0
-                records_successful = 0
-                records_failed = 0
-                errors = []
+            run = PlanningCenterSyncRun.start(db, task_id, "events", mode, updated_by=updated_by)
+            offset = run.position.get("offset", 0)
+            if event_feed is not None:
+                # Only a full read from the top yields every event in list order
+                event_feed.start(usable=mode == "full" and offset == 0)
+            
+            async with planning_center_client() as client:
+                pager = PlanningCenterPager(client, self.headers)
                 
-                total_records = len(events_data.get("data", []))
-                self._update_sync_task(task_id, progress=20, message=f"Processing {total_records} events...")
+                # Get all events from Planning Center
+                message = f"Resuming events sync at record {offset}..." if offset else "Fetching events from Planning Center..."
+                self._update_sync_task(task_id, progress=10, message=message)
+                total_records = 0
+                seen_ids = [] if mode == "full" and offset == 0 else None
                 
-                for i, event_data in enumerate(events_data.get("data", [])):
-                    records_processed += 1
-                    try:
-                        # Cache event data
-                        self._cache_event_data(db, event_data)
-                        
-                        # Sync course
-                        course_service = CourseService(db)
-                        course_service.sync_from_planning_center(
-                            event_data, updated_by=updated_by
-                        )
-                        records_successful += 1
-                    except Exception as e:
-                        records_failed += 1
-                        errors.append(f"Event {event_data.get('id')}: {str(e)}")
+                async for page in pager.iter_pages(f"{self.base_url}/events/v2/events", params, offset=offset):
+                    if seen_ids is not None:
+                        seen_ids.extend(event_data.get("id") for event_data in page.records)
+                    total_records = self._page_total(page, total_records, run.records_processed)
+                    run.high_water_mark = self._max_updated_at(page.records, run.high_water_mark)
+                    run.begin_batch(db)
+                    unchanged = self._unchanged_events(db, page.records)
+                    # Cache the page's changed events in one batch
+                    cache_errors = self._cache_events_batch(
+                        db, [event_data for event_data in page.records if str(event_data.get("id")) not in unchanged]
+                    )
                     
-                    # Update progress
-                    progress = 20 + int((i + 1) / total_records * 70)
-                    self._update_sync_task(task_id, progress=progress, 
-                                         message=f"Processed {i + 1}/{total_records} events")
-                
-                # Update sync log
-                sync_log.records_processed = records_processed
-                sync_log.records_successful = records_successful
-                sync_log.records_failed = records_failed
-                sync_log.completed_at = datetime.utcnow()
-                if errors:
-                    sync_log.error_details = {"errors": errors}
-                
-                db.commit()
+                    for event_data in page.records:
+                        run.records_processed += 1
+                        try:
+                            if str(event_data.get("id")) in unchanged:
+                                run.records_unchanged += 1
+                            else:
+                                if str(event_data.get("id")) in cache_errors:
+                                    raise RuntimeError(cache_errors[str(event_data.get("id"))])
+                                
+                                # Sync course
+                                with db.begin_nested():
+                                    CourseService(db).sync_from_planning_center(
+                                        event_data, updated_by=updated_by, commit=False
+                                    )
+                            run.records_successful += 1
+                        except Exception as e:
+                            run.records_failed += 1
+                            run.errors.append(f"Event {event_data.get('id')}: {str(e)}")
+                    
+                    # The page's writes commit with its checkpoint
+                    run.checkpoint(db, offset=page.offset + len(page.records))
+                    self._report_progress(task_id, run.records_processed, total_records, "events")
+                    if event_feed is not None:
+                        event_feed.publish((event_data.get("id") for event_data in page.records), page.total_count)
                 
-                result = {
-                    "status": "success",
-                    "records_processed": records_processed,
-                    "records_successful": records_successful,
-                    "records_failed": records_failed,
-                    "errors": errors
-                }
+                if event_feed is not None:
+                    event_feed.mark_complete()
+                reconciliation = None
+                if seen_ids is not None:
+                    reconciliation = self._reconcile(db, Course, "planning_center_event_id", seen_ids, updated_by, run.errors)
+                    run.records_deactivated = (reconciliation or {}).get("deactivated", 0)
+                run.complete(db, self._next_watermark(previous_watermark, run.safe_high_water_mark(), run.records_failed))
                 
                 self._update_sync_task(task_id, status="completed", progress=100, 
-                                     message="Events sync completed successfully", result=result)
+                                     message="Events sync completed successfully",
+                                     result=run.result(mode, reconciliation=reconciliation))
                 
         except Exception as e:
+            # Drop the unfinished batch before another session writes the job status
+            if 'run' in locals():
+                run.fail(db, str(e))
             self._update_sync_task(task_id, status="failed", 
                                  message=f"Events sync failed: {str(e)}", error=str(e))
-            if 'sync_log' in locals():
-                sync_log.completed_at = datetime.utcnow()
-                sync_log.error_details = {"error": str(e)}
-                db.commit()
         finally:
             db.close()
     
-    async def _sync_registrations_background(self, task_id: str, event_id: Optional[str] = None, updated_by: Optional[int] = None):
-        """Background sync of registrations from Planning Center"""
+    def _apply_registrations(self, db: Session, run: PlanningCenterSyncRun, registrations: List[Dict[str, Any]],
+                             enrollment_service: CourseEnrollmentService, id_index: PlanningCenterIdIndex,
+                             updated_by: Optional[int] = None):
+        """Cache registrations and sync their enrollments, counting the outcome on the run.
+        
+        Nothing is committed here; each registration is written in a
+        savepoint and the caller commits the batch.
+        """
+        unchanged = self._unchanged_registrations(db, registrations)
+        # Cache the changed registrations in one batch
+        cache_errors = self._cache_registrations_batch(
+            db, [registration_data for registration_data in registrations if str(registration_data.get("id")) not in unchanged]
+        )
+        for registration_data in registrations:
+            run.records_processed += 1
+            try:
+                if str(registration_data.get("id")) in unchanged:
+                    run.records_unchanged += 1
+                else:
+                    if str(registration_data.get("id")) in cache_errors:
+                        raise RuntimeError(cache_errors[str(registration_data.get("id"))])
+                    
+                    # Sync enrollment
+                    with db.begin_nested():
+                        enrollment = enrollment_service.sync_from_planning_center(
+                            registration_data, updated_by=updated_by, id_index=id_index, commit=False
+                        )
+                    if enrollment is None:
+                        run.records_unresolved += 1
+                run.records_successful += 1
+            except Exception as e:
+                run.records_failed += 1
+                run.errors.append(f"Registration {registration_data.get('id')}: {str(e)}")
+    
+    async def _sync_registrations_background(self, task_id: str, event_id: Optional[str] = None, updated_by: Optional[int] = None, mode: Optional[str] = None,
+                                             event_feed: Optional[PlanningCenterEventFeed] = None):
+        """Background sync of registrations from Planning Center, resumable from its last checkpoint.
+        
+        With an ``event_feed`` (sync_all) the events come from the concurrent
+        events stage as they are written; if the feed is not usable the stage
+        waits for the events stage to finish and lists the events itself.
+        """
         db = self._get_db_session()
         try:
             self._update_sync_task(task_id, status="running", message="Starting registrations sync...")
             
-            sync_log = PlanningCenterSyncLog(
-                sync_type="registrations",
-                sync_direction="from_pc",
-                started_at=datetime.utcnow(),
-                created_by=updated_by
-            )
-            db.add(sync_log)
-            db.commit()
+            single_event = event_id is not None
+            mode = self._resolve_sync_mode(db, "registrations", mode)
+            previous_watermark = self.get_sync_watermark("registrations", db=db)
+            params = self._delta_params(previous_watermark, mode)
+            self._update_sync_task(task_id, mode=mode)
             
-            async with httpx.AsyncClient() as client:
-                records_processed = 0
-                records_successful = 0
-                records_failed = 0
-                errors = []
+            run = PlanningCenterSyncRun.start(db, task_id, "registrations", mode, updated_by=updated_by, scope=event_id)
+            
+            async with planning_center_client() as client:
+                pager = self._registrations_pager(client)
+                # Resolve PC person/event ids to local ids without per-record queries
+                enrollment_service = CourseEnrollmentService(db)
+                id_index = PlanningCenterIdIndex.load(db)
                 
                 if event_id:
                     # Sync registrations for specific event
+                    offset = run.position.get("offset", 0)
                     self._update_sync_task(task_id, progress=10, message=f"Fetching registrations for event {event_id}...")
-                    response = await client.get(
-                        f"{self.base_url}/events/v2/events/{event_id}/registrations",
-                        headers=self.headers,
-                        params={"per_page": 100}
-                    )
-                    response.raise_for_status()
-                    registrations_data = response.json()
-                    
-                    total_records = len(registrations_data.get("data", []))
-                    self._update_sync_task(task_id, progress=20, message=f"Processing {total_records} registrations...")
+                    total_records = 0
                     
-                    for i, registration_data in enumerate(registrations_data.get("data", [])):
-                        records_processed += 1
-                        try:
-                            # Cache registration data
-                            self._cache_registration_data(db, registration_data)
-                            
-                            # Sync enrollment
-                            enrollment_service = CourseEnrollmentService(db)
-                            enrollment_service.sync_from_planning_center(
-                                registration_data, updated_by=updated_by
-                            )
-                            records_successful += 1
-                        except Exception as e:
-                            records_failed += 1
-                            errors.append(f"Registration {registration_data.get('id')}: {str(e)}")
+                    async for page in pager.iter_pages(self._registrations_url(event_id), params, offset=offset):
+                        total_records = self._page_total(page, total_records, run.records_processed)
+                        run.begin_batch(db)
+                        self._apply_registrations(db, run, page.records, enrollment_service, id_index, updated_by)
+                        run.checkpoint(db, offset=page.offset + len(page.records))
                         
                         # Update progress
-                        progress = 20 + int((i + 1) / total_records * 70)
-                        self._update_sync_task(task_id, progress=progress, 
-                                             message=f"Processed {i + 1}/{total_records} registrations")
+                        self._report_progress(task_id, run.records_processed, total_records, "registrations")
                 else:
-                    # Sync all registrations (this could be expensive)
-                    self._update_sync_task(task_id, progress=10, message="Fetching all events for registration sync...")
-                    events_response = await client.get(
-                        f"{self.base_url}/events/v2/events",
-                        headers=self.headers,
-                        params={"per_page": 100}
-                    )
-                    events_response.raise_for_status()
-                    events_data = events_response.json()
+                    # Sync all registrations: fetch several events' registrations
+                    # at once and apply the writes here, one event at a time.
+                    # Events are checkpointed in list order, so a resumed run
+                    # skips the events it has already done. The checkpoint
+                    # stops at the first event whose fetch failed, so a resume
+                    # fetches that event again.
+                    events_processed = run.position.get("events_done", 0)
+                    fetch_failed = False
+                    message = (f"Resuming registration sync after {events_processed} events..." if events_processed
+                               else "Fetching all events for registration sync...")
+                    self._update_sync_task(task_id, progress=10, message=message)
+                    total_events = 0
                     
-                    total_events = len(events_data.get("data", []))
-                    self._update_sync_task(task_id, progress=20, message=f"Processing registrations for {total_events} events...")
+                    async def event_ids():
+                        nonlocal total_events
+                        offset = events_processed
+                        if event_feed is not None:
+                            if await event_feed.wait_usable():
+                                async for feed_event_id in event_feed.iterate(offset):
+                                    total_events = max(event_feed.total_count or 0, len(event_feed.event_ids))
+                                    yield feed_event_id
+                                if event_feed.complete:
+                                    return
+                                # The events stage stopped early; list the rest
+                                offset = max(offset, len(event_feed.event_ids))
+                            else:
+                                # Enrollments need the courses, so let the events stage finish first
+                                await event_feed.wait_closed()
+                        async for events_page in pager.iter_pages(f"{self.base_url}/events/v2/events", offset=offset):
+                            total_events = self._page_total(events_page, total_events, events_page.offset)
+                            for event_data in events_page.records:
+                                yield event_data.get("id")
                     
-                    for event_idx, event_data in enumerate(events_data.get("data", [])):
-                        event_id = event_data.get("id")
-                        registrations_response = await client.get(
-                            f"{self.base_url}/events/v2/events/{event_id}/registrations",
-                            headers=self.headers,
-                            params={"per_page": 100}
-                        )
-                        registrations_response.raise_for_status()
-                        registrations_data = registrations_response.json()
-                        
-                        for registration_data in registrations_data.get("data", []):
-                            records_processed += 1
-                            try:
-                                # Cache registration data
-                                self._cache_registration_data(db, registration_data)
-                                
-                                # Sync enrollment
-                                enrollment_service = CourseEnrollmentService(db)
-                                enrollment_service.sync_from_planning_center(
-                                    registration_data, updated_by=updated_by
-                                )
-                                records_successful += 1
-                            except Exception as e:
-                                records_failed += 1
-                                errors.append(f"Registration {registration_data.get('id')}: {str(e)}")
+                    async for event_id, registrations, error in pager.fan_out(
+                        event_ids(), self._registrations_url, params
+                    ):
+                        if error is not None:
+                            # Counted as a failure so the watermark stays put
+                            run.records_failed += 1
+                            run.errors.append(f"Event {event_id}: {str(error)}")
+                            fetch_failed = True
+                        run.high_water_mark = self._max_updated_at(registrations, run.high_water_mark)
+                        run.begin_batch(db)
+                        self._apply_registrations(db, run, registrations, enrollment_service, id_index, updated_by)
                         
                         # Update progress
-                        progress = 20 + int((event_idx + 1) / total_events * 70)
-                        self._update_sync_task(task_id, progress=progress, 
-                                             message=f"Processed {event_idx + 1}/{total_events} events")
+                        events_processed += 1
+                        if fetch_failed:
+                            run.checkpoint(db)
+                        else:
+                            run.checkpoint(db, events_done=events_processed)
+                        self._report_progress(task_id, events_processed, total_events, "events")
                 
-                # Update sync log
-                sync_log.records_processed = records_processed
-                sync_log.records_successful = records_successful
-                sync_log.records_failed = records_failed
-                sync_log.completed_at = datetime.utcnow()
-                if errors:
-                    sync_log.error_details = {"errors": errors}
-                
-                db.commit()
-                
-                result = {
-                    "status": "success",
-                    "records_processed": records_processed,
-                    "records_successful": records_successful,
-                    "records_failed": records_failed,
-                    "errors": errors
-                }
+                # A single-event run only covers part of the data, so it never moves the watermark
+                high_water_mark = None
+                if not single_event:
+                    high_water_mark = self._next_watermark(previous_watermark, run.safe_high_water_mark(), run.records_failed)
+                run.complete(db, high_water_mark)
                 
+                # records_unresolved: person or course not synced yet
+                result = run.result(mode, records_unresolved=run.records_unresolved)
                 self._update_sync_task(task_id, status="completed", progress=100, 
                                      message="Registrations sync completed successfully", result=result)
                 
         except Exception as e:
+            # Drop the unfinished batch before another session writes the job status
+            if 'run' in locals():
+                run.fail(db, str(e))
             self._update_sync_task(task_id, status="failed", 
                                  message=f"Registrations sync failed: {str(e)}", error=str(e))
-            if 'sync_log' in locals():
-                sync_log.completed_at = datetime.utcnow()
-                sync_log.error_details = {"error": str(e)}
-                db.commit()
         finally:
             db.close()
     
-    async def _sync_all_background(self, task_id: str, updated_by: Optional[int] = None):
-        """Background sync of all data from Planning Center"""
+    async def _stage_task(self, parent_id: str, task_type: str) -> Tuple[str, bool]:
+        """Stage job of a sync_all run, reusing one left by an earlier attempt; returns (task id, completed).
+        
+        Stages take their type's lock like standalone jobs. A standalone job of
+        the same type that is still queued is superseded by the stage; one that
+        is already running is waited for.
+        """
+        waiting = False
+        while True:
+            db = self._get_db_session()
+            try:
+                jobs = SyncJobService(db)
+                stage = jobs.get_stage(parent_id, task_type)
+                if stage is not None and stage.status in ("completed",) + ACTIVE_STATUSES:
+                    return stage.id, stage.status == "completed"
+                
+                stage, created = jobs.enqueue(task_type, parent_id=parent_id)
+                if created:
+                    return stage.id, False
+                if stage.status == "pending" and jobs.supersede(stage.id, f"Superseded by sync_all task {parent_id}"):
+                    continue
+                holder_id = stage.id
+            finally:
+                db.close()
+            
+            if not waiting:
+                waiting = True
+                self._update_sync_task(parent_id, message=f"Waiting for {task_type} task {holder_id} to finish...")
+            await asyncio.sleep(settings.SYNC_WORKER_POLL_SECONDS)
+    
+    async def _sync_all_background(self, task_id: str, updated_by: Optional[int] = None, mode: Optional[str] = None):
+        """Background sync of all data from Planning Center.
+        
+        Runs as a small DAG: people and events side by side, registrations as
+        soon as people are in, fed with events as the events stage writes
+        them. At most PLANNING_CENTER_SYNC_STAGE_CONCURRENCY stages run at
+        once, and a stage whose prerequisite failed is skipped. A restarted
+        job keeps stages that completed and resumes the unfinished ones. Stage
+        timings go to the task result and an "all" sync log; the job fails if
+        any stage did not complete.
+        """
+        db = self._get_db_session()
         try:
             self._update_sync_task(task_id, status="running", message="Starting full sync...")
             
-            # Sync in order: people, events, then registrations
-            self._update_sync_task(task_id, progress=10, message="Starting people sync...")
-            people_task_id = self._create_sync_task("sync_people")
-            await self._sync_people_background(people_task_id, updated_by)
+            sync_log = PlanningCenterSyncLog(
+                sync_type="all",
+                sync_direction="from_pc",
+                sync_mode=mode,
+                started_at=datetime.utcnow(),
+                created_by=updated_by,
+                task_id=task_id
+            )
+            db.add(sync_log)
+            db.commit()
+            
+            cache_stats = response_cache_stats()
+            stage_task_ids: Dict[str, str] = {}
+            finished: List[str] = []
+            event_feed = PlanningCenterEventFeed()
+            
+            async def run_stage(task_type: str, runner) -> Optional[str]:
+                stage_task_id, completed = await self._stage_task(task_id, task_type)
+                stage_task_ids[task_type] = stage_task_id
+                try:
+                    if completed:
+                        return "completed"
+                    await runner(stage_task_id)
+                    status = self.get_sync_task_status(stage_task_id)
+                    return status["status"] if status else None
+                finally:
+                    finished.append(task_type)
+                    self._update_sync_task(task_id, progress=10 + 30 * len(finished),
+                                           message=f"Finished {task_type.replace('sync_', '')} sync")
             
-            self._update_sync_task(task_id, progress=40, message="Starting events sync...")
-            events_task_id = self._create_sync_task("sync_events")
-            await self._sync_events_background(events_task_id, updated_by)
+            async def run_events_stage() -> Optional[str]:
+                try:
+                    return await run_stage("sync_events", lambda stage_task_id: self._sync_events_background(
+                        stage_task_id, updated_by, mode, event_feed=event_feed))
+                finally:
+                    event_feed.close()  # also when the stage was skipped or failed
             
-            self._update_sync_task(task_id, progress=70, message="Starting registrations sync...")
-            registrations_task_id = self._create_sync_task("sync_registrations")
-            await self._sync_registrations_background(registrations_task_id, None, updated_by)
+            self._update_sync_task(task_id, progress=10, message="Syncing people and events...")
+            timings = await run_stages([
+                SyncStage("sync_people", lambda: run_stage("sync_people", lambda stage_task_id: self._sync_people_background(
+                    stage_task_id, updated_by, mode))),
+                SyncStage("sync_events", run_events_stage),
+                SyncStage("sync_registrations", lambda: run_stage("sync_registrations", lambda stage_task_id: self._sync_registrations_background(
+                    stage_task_id, None, updated_by, mode, event_feed=event_feed)), after=("sync_people",)),
+            ], concurrency=settings.PLANNING_CENTER_SYNC_STAGE_CONCURRENCY)
             
             # Get results from individual syncs
-            people_result = self.get_sync_task_status(people_task_id)
-            events_result = self.get_sync_task_status(events_task_id)
-            registrations_result = self.get_sync_task_status(registrations_task_id)
+            results = {}
+            for task_type, key in (("sync_people", "people"), ("sync_events", "events"), ("sync_registrations", "registrations")):
+                status = self.get_sync_task_status(stage_task_ids[task_type]) if task_type in stage_task_ids else None
+                results[key] = status.get("result") if status else None
             
-            result = {
-                "people": people_result.get("result") if people_result else None,
-                "events": events_result.get("result") if events_result else None,
-                "registrations": registrations_result.get("result") if registrations_result else None
-            }
+            wall_seconds = round(max((timing.get("finished_at") or 0) for timing in timings.values()), 3)
+            stage_timings = {task_type.replace("sync_", ""): timing for task_type, timing in timings.items()}
+            for key in ("records_processed", "records_successful", "records_failed", "records_unchanged", "records_deactivated"):
+                setattr(sync_log, key, sum((result or {}).get(key, 0) for result in results.values()))
+            sync_log.stage_timings = {"wall_seconds": wall_seconds, "stages": stage_timings}
+            incomplete = {name: timing["status"] for name, timing in stage_timings.items() if timing["status"] != "completed"}
+            if incomplete:
+                sync_log.error_details = {"stages": incomplete}
+            sync_log.completed_at = datetime.utcnow()
+            db.commit()
             
-            self._update_sync_task(task_id, status="completed", progress=100, 
-                                 message="Full sync completed successfully", result=result)
+            result = dict(results, timings=sync_log.stage_timings)
+            if cache_stats is not None:
+                result["response_cache"] = stats_delta(cache_stats, response_cache_stats())
+            if incomplete:
+                summary = ", ".join(f"{name} {status}" for name, status in incomplete.items())
+                self._update_sync_task(task_id, status="failed", progress=100,
+                                     message=f"Full sync incomplete: {summary}",
+                                     error=f"Stages did not complete: {summary}", result=result)
+            else:
+                self._update_sync_task(task_id, status="completed", progress=100, 
+                                     message="Full sync completed successfully", result=result)
             
         except Exception as e:
             self._update_sync_task(task_id, status="failed", 
                                  message=f"Full sync failed: {str(e)}", error=str(e))
+            if 'sync_log' in locals():
+                db.rollback()
+                sync_log.completed_at = datetime.utcnow()
+                sync_log.error_details = {"error": str(e)}
+                db.commit()
+        finally:
+            db.close()
     
     # Keep the original sync methods for backward compatibility
     async def sync_people(self, updated_by: Optional[int] = None) -> Dict[str, Any]:
@@ -487,36 +766,34 @@ class PlanningCenterSyncService:
         self.db.commit()
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Get all people from Planning Center
-                response = await client.get(
-                    f"{self.base_url}/people/v2/people",
-                    headers=self.headers,
-                    params={"per_page": 100}
-                )
-                response.raise_for_status()
-                
-                people_data = response.json()
+            async with planning_center_client() as client:
+                pager = PlanningCenterPager(client, self.headers)
                 records_processed = 0
                 records_successful = 0
                 records_failed = 0
+                records_unchanged = 0
                 errors = []
                 
-                for person_data in people_data.get("data", []):
-                    records_processed += 1
-                    try:
-                        self.people_service.sync_from_planning_center(
-                            person_data, updated_by=updated_by
-                        )
-                        records_successful += 1
-                    except Exception as e:
-                        records_failed += 1
-                        errors.append(f"Person {person_data.get('id')}: {str(e)}")
+                seen_ids = []
+                
+                # Get all people from Planning Center
+                async for chunk, _ in pager.iter_chunks(f"{self.base_url}/people/v2/people"):
+                    seen_ids.extend(person.get("id") for person in chunk)
+                    batch = self.people_service.bulk_sync_from_planning_center(chunk, updated_by=updated_by)
+                    records_processed += batch["processed"]
+                    records_successful += batch["processed"] - batch["failed"]
+                    records_failed += batch["failed"]
+                    records_unchanged += batch["unchanged"]
+                    errors.extend(batch["errors"])
+                
+                reconciliation = self._reconcile(self.db, People, "planning_center_id", seen_ids, updated_by, errors)
                 
                 # Update sync log
                 sync_log.records_processed = records_processed
                 sync_log.records_successful = records_successful
                 sync_log.records_failed = records_failed
+                sync_log.records_unchanged = records_unchanged
+                sync_log.records_deactivated = (reconciliation or {}).get("deactivated", 0)
                 sync_log.completed_at = datetime.utcnow()
                 if errors:
                     sync_log.error_details = {"errors": errors}
@@ -528,6 +805,8 @@ class PlanningCenterSyncService:
                     "records_processed": records_processed,
                     "records_successful": records_successful,
                     "records_failed": records_failed,
+                    "records_unchanged": records_unchanged,
+                    "reconciliation": reconciliation,
                     "errors": errors
                 }
                 
@@ -553,40 +832,51 @@ class PlanningCenterSyncService:
         self.db.commit()
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Get all events from Planning Center
-                response = await client.get(
-                    f"{self.base_url}/events/v2/events",
-                    headers=self.headers,
-                    params={"per_page": 100}
-                )
-                response.raise_for_status()
-                
-                events_data = response.json()
+            async with planning_center_client() as client:
+                pager = PlanningCenterPager(client, self.headers)
                 records_processed = 0
                 records_successful = 0
                 records_failed = 0
+                records_unchanged = 0
                 errors = []
                 
-                for event_data in events_data.get("data", []):
-                    records_processed += 1
-                    try:
-                        # Cache event data
-                        self._cache_event_data(event_data)
-                        
-                        # Sync course
-                        self.course_service.sync_from_planning_center(
-                            event_data, updated_by=updated_by
-                        )
-                        records_successful += 1
-                    except Exception as e:
-                        records_failed += 1
-                        errors.append(f"Event {event_data.get('id')}: {str(e)}")
+                seen_ids = []
+                
+                # Get all events from Planning Center
+                async for page in pager.iter_pages(f"{self.base_url}/events/v2/events"):
+                    seen_ids.extend(event_data.get("id") for event_data in page.records)
+                    unchanged = self._unchanged_events(self.db, page.records)
+                    cache_errors = self._cache_events_batch(
+                        self.db, [event_data for event_data in page.records if str(event_data.get("id")) not in unchanged]
+                    )
+                    for event_data in page.records:
+                        records_processed += 1
+                        try:
+                            if str(event_data.get("id")) in unchanged:
+                                records_unchanged += 1
+                            else:
+                                if str(event_data.get("id")) in cache_errors:
+                                    raise RuntimeError(cache_errors[str(event_data.get("id"))])
+                                
+                                # Sync course
+                                with self.db.begin_nested():
+                                    self.course_service.sync_from_planning_center(
+                                        event_data, updated_by=updated_by, commit=False
+                                    )
+                            records_successful += 1
+                        except Exception as e:
+                            records_failed += 1
+                            errors.append(f"Event {event_data.get('id')}: {str(e)}")
+                    self.db.commit()
+                
+                reconciliation = self._reconcile(self.db, Course, "planning_center_event_id", seen_ids, updated_by, errors)
                 
                 # Update sync log
                 sync_log.records_processed = records_processed
                 sync_log.records_successful = records_successful
                 sync_log.records_failed = records_failed
+                sync_log.records_unchanged = records_unchanged
+                sync_log.records_deactivated = (reconciliation or {}).get("deactivated", 0)
                 sync_log.completed_at = datetime.utcnow()
                 if errors:
                     sync_log.error_details = {"errors": errors}
@@ -598,6 +888,8 @@ class PlanningCenterSyncService:
                     "records_processed": records_processed,
                     "records_successful": records_successful,
                     "records_failed": records_failed,
+                    "records_unchanged": records_unchanged,
+                    "reconciliation": reconciliation,
                     "errors": errors
                 }
                 
@@ -623,88 +915,50 @@ class PlanningCenterSyncService:
         self.db.commit()
         
         try:
-            async with httpx.AsyncClient() as client:
-                records_processed = 0
-                records_successful = 0
-                records_failed = 0
-                errors = []
+            async with planning_center_client() as client:
+                pager = self._registrations_pager(client)
+                id_index = PlanningCenterIdIndex.load(self.db)
+                # Counters only; this run is not checkpointed
+                run = PlanningCenterSyncRun(sync_log)
                 
                 if event_id:
                     # Sync registrations for specific event
-                    response = await client.get(
-                        f"{self.base_url}/events/v2/events/{event_id}/registrations",
-                        headers=self.headers,
-                        params={"per_page": 100}
-                    )
-                    response.raise_for_status()
-                    registrations_data = response.json()
-                    
-                    for registration_data in registrations_data.get("data", []):
-                        records_processed += 1
-                        try:
-                            # Cache registration data
-                            self._cache_registration_data(registration_data)
-                            
-                            # Sync enrollment
-                            self.enrollment_service.sync_from_planning_center(
-                                registration_data, updated_by=updated_by
-                            )
-                            records_successful += 1
-                        except Exception as e:
-                            records_failed += 1
-                            errors.append(f"Registration {registration_data.get('id')}: {str(e)}")
+                    async for page in pager.iter_pages(self._registrations_url(event_id)):
+                        self._apply_registrations(self.db, run, page.records, self.enrollment_service, id_index, updated_by)
+                        self.db.commit()
                 else:
-                    # Sync all registrations (this could be expensive)
-                    # Get all events first, then get registrations for each
-                    events_response = await client.get(
-                        f"{self.base_url}/events/v2/events",
-                        headers=self.headers,
-                        params={"per_page": 100}
-                    )
-                    events_response.raise_for_status()
-                    events_data = events_response.json()
+                    # Sync all registrations: get all events, then fetch their
+                    # registrations concurrently and write them in event order
+                    async def event_ids():
+                        async for event_data in pager.iter_records(f"{self.base_url}/events/v2/events"):
+                            yield event_data.get("id")
                     
-                    for event_data in events_data.get("data", []):
-                        event_id = event_data.get("id")
-                        registrations_response = await client.get(
-                            f"{self.base_url}/events/v2/events/{event_id}/registrations",
-                            headers=self.headers,
-                            params={"per_page": 100}
-                        )
-                        registrations_response.raise_for_status()
-                        registrations_data = registrations_response.json()
-                        
-                        for registration_data in registrations_data.get("data", []):
-                            records_processed += 1
-                            try:
-                                # Cache registration data
-                                self._cache_registration_data(registration_data)
-                                
-                                # Sync enrollment
-                                self.enrollment_service.sync_from_planning_center(
-                                    registration_data, updated_by=updated_by
-                                )
-                                records_successful += 1
-                            except Exception as e:
-                                records_failed += 1
-                                errors.append(f"Registration {registration_data.get('id')}: {str(e)}")
+                    async for event_id, registrations, error in pager.fan_out(event_ids(), self._registrations_url):
+                        if error is not None:
+                            run.records_failed += 1
+                            run.errors.append(f"Event {event_id}: {str(error)}")
+                        self._apply_registrations(self.db, run, registrations, self.enrollment_service, id_index, updated_by)
+                        self.db.commit()
                 
                 # Update sync log
-                sync_log.records_processed = records_processed
-                sync_log.records_successful = records_successful
-                sync_log.records_failed = records_failed
+                sync_log.records_processed = run.records_processed
+                sync_log.records_successful = run.records_successful
+                sync_log.records_failed = run.records_failed
+                sync_log.records_unchanged = run.records_unchanged
                 sync_log.completed_at = datetime.utcnow()
-                if errors:
-                    sync_log.error_details = {"errors": errors}
+                if run.errors:
+                    sync_log.error_details = {"errors": run.errors}
                 
                 self.db.commit()
                 
                 return {
                     "status": "success",
-                    "records_processed": records_processed,
-                    "records_successful": records_successful,
-                    "records_failed": records_failed,
-                    "errors": errors
+                    "records_processed": run.records_processed,
+                    "records_successful": run.records_successful,
+                    "records_failed": run.records_failed,
+                    "records_unchanged": run.records_unchanged,
+                    "records_unresolved": run.records_unresolved,  # person or course not synced yet
+                    "errors": run.errors
                 }
                 
         except Exception as e:
@@ -717,9 +971,106 @@ class PlanningCenterSyncService:
                 "error": str(e)
             }
     
-    def _cache_event_data(self, db: Session, event_data: Dict[str, Any]):
-        """Cache event data from Planning Center"""
+    def _unchanged_events(self, db: Session, events: List[Dict[str, Any]]) -> set:
+        """PC event ids whose course and cache rows already hold these values.
+        
+        Courses a sync deactivated as gone from PC are never unchanged, so
+        they are reactivated when PC lists them again.
+        """
+        ids = [str(event_data.get("id")) for event_data in events if event_data.get("id") is not None]
+        if not ids:
+            return set()
+        courses = dict(db.query(Course.planning_center_event_id, Course.pc_fingerprint).filter(
+            Course.planning_center_event_id.in_(ids), Course.pc_missing_since.is_(None)
+        ).all())
+        caches = dict(db.query(PlanningCenterEventsCache.planning_center_event_id, PlanningCenterEventsCache.pc_fingerprint).filter(
+            PlanningCenterEventsCache.planning_center_event_id.in_(ids)
+        ).all())
+        return {
+            str(event_data.get("id")) for event_data in events
+            if courses.get(str(event_data.get("id"))) == course_fingerprint(event_data)
+            and caches.get(str(event_data.get("id"))) == fingerprint(map_pc_event_cache(event_data))
+        }
+    
+    def _unchanged_registrations(self, db: Session, registrations: List[Dict[str, Any]]) -> set:
+        """PC registration ids whose cache row already holds these values.
+        
+        Registrations whose enrollment is missing or still unresolved are
+        never reported unchanged, so they are retried once the person or
+        course has been synced.
+        """
+        ids = [str(registration_data.get("id")) for registration_data in registrations if registration_data.get("id") is not None]
+        if not ids:
+            return set()
+        caches = dict(db.query(
+            PlanningCenterRegistrationsCache.planning_center_registration_id, PlanningCenterRegistrationsCache.pc_fingerprint
+        ).filter(
+            PlanningCenterRegistrationsCache.planning_center_registration_id.in_(ids)
+        ).all())
+        resolved = {registration_id for (registration_id,) in db.query(CourseEnrollment.planning_center_registration_id).filter(
+            CourseEnrollment.planning_center_registration_id.in_(ids),
+            CourseEnrollment.people_id > 0,
+            CourseEnrollment.course_id > 0
+        ).all()}
+        return {
+            str(registration_data.get("id")) for registration_data in registrations
+            if str(registration_data.get("id")) in resolved
+            and caches.get(str(registration_data.get("id"))) == fingerprint(map_pc_registration_cache(registration_data))
+        }
+    
+    def _reconcile(self, db: Session, model, key_column: str, seen_ids: List[Any],
+                   updated_by: Optional[int], errors: List[str]) -> Optional[Dict[str, int]]:
+        """Deactivate rows a complete full sync did not see; returns None (and records why) if aborted"""
+        try:
+            return PlanningCenterReconciler(db).reconcile(model, key_column, seen_ids, updated_by=updated_by)
+        except ReconciliationAborted as e:
+            db.rollback()
+            errors.append(f"Reconciliation skipped: {str(e)}")
+            return None
+    
+    def _cache_each(self, db: Session, records: List[Dict[str, Any]], cache) -> Dict[str, str]:
+        """Write cache rows one savepoint at a time; returns {PC id: error} for the ones that failed"""
+        errors = {}
+        for record in records:
+            try:
+                with db.begin_nested():
+                    cache(db, record, commit=False)
+            except Exception as e:
+                errors[str(record.get("id"))] = str(e)
+        return errors
+    
+    def _cache_events_batch(self, db: Session, events: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Upsert events cache rows in a savepoint; returns {PC event id: error} for rows not written.
+        
+        Nothing is committed; the rows go out with the caller's batch. If the
+        upsert fails it is rolled back and replayed record by record, so a
+        single bad payload only fails itself.
+        """
+        try:
+            with db.begin_nested():
+                upsert_cache_rows(db, PlanningCenterEventsCache, "planning_center_event_id",
+                                  [(event_data.get("id"), map_pc_event_cache(event_data)) for event_data in events])
+            return {}
+        except Exception:
+            return self._cache_each(db, events, self._cache_event_data)
+    
+    def _cache_registrations_batch(self, db: Session, registrations: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Upsert registrations cache rows in a savepoint; returns {PC registration id: error} for rows not written"""
+        try:
+            with db.begin_nested():
+                upsert_cache_rows(db, PlanningCenterRegistrationsCache, "planning_center_registration_id",
+                                  [(registration_data.get("id"), map_pc_registration_cache(registration_data))
+                                   for registration_data in registrations],
+                                  protected=REGISTRATION_CACHE_KEYS)
+            return {}
+        except Exception:
+            return self._cache_each(db, registrations, self._cache_registration_data)
+    
+    def _cache_event_data(self, db: Session, event_data: Dict[str, Any], commit: bool = True):
+        """Cache event data from Planning Center; unchanged rows are not rewritten"""
         pc_event_id = event_data.get("id")
+        row = map_pc_event_cache(event_data)
+        row_fingerprint = fingerprint(row)
         
         # Check if already cached
         existing_cache = db.query(PlanningCenterEventsCache).filter(
@@ -727,38 +1078,35 @@ class PlanningCenterSyncService:
         ).first()
         
         if existing_cache:
+            if existing_cache.pc_fingerprint == row_fingerprint:
+                return
+            
             # Update existing cache
-            existing_cache.event_name = event_data.get("name")
-            existing_cache.event_description = event_data.get("description")
-            existing_cache.start_date = event_data.get("start_date")
-            existing_cache.end_date = event_data.get("end_date")
-            existing_cache.max_capacity = event_data.get("max_capacity")
-            existing_cache.current_registrations_count = event_data.get("current_registrations", 0)
-            existing_cache.registration_deadline = event_data.get("registration_deadline")
-            existing_cache.event_status = event_data.get("status")
+            for field, value in row.items():
+                setattr(existing_cache, field, value)
+            existing_cache.pc_fingerprint = row_fingerprint
             existing_cache.last_synced_at = datetime.utcnow()
             existing_cache.updated_at = datetime.utcnow()
         else:
             # Create new cache entry
             cache_entry = PlanningCenterEventsCache(
                 planning_center_event_id=pc_event_id,
-                event_name=event_data.get("name"),
-                event_description=event_data.get("description"),
-                start_date=event_data.get("start_date"),
-                end_date=event_data.get("end_date"),
-                max_capacity=event_data.get("max_capacity"),
-                current_registrations_count=event_data.get("current_registrations", 0),
-                registration_deadline=event_data.get("registration_deadline"),
-                event_status=event_data.get("status"),
-                last_synced_at=datetime.utcnow()
+                pc_fingerprint=row_fingerprint,
+                last_synced_at=datetime.utcnow(),
+                **row
             )
             db.add(cache_entry)
         
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
     
-    def _cache_registration_data(self, db: Session, registration_data: Dict[str, Any]):
-        """Cache registration data from Planning Center"""
+    def _cache_registration_data(self, db: Session, registration_data: Dict[str, Any], commit: bool = True):
+        """Cache registration data from Planning Center; unchanged rows are not rewritten"""
         pc_registration_id = registration_data.get("id")
+        row = map_pc_registration_cache(registration_data)
+        row_fingerprint = fingerprint(row)
         
         # Check if already cached
         existing_cache = db.query(PlanningCenterRegistrationsCache).filter(
@@ -766,67 +1114,38 @@ class PlanningCenterSyncService:
         ).first()
         
         if existing_cache:
+            if existing_cache.pc_fingerprint == row_fingerprint:
+                return
+            
             # Update existing cache
-            existing_cache.registration_status = registration_data.get("status")
-            existing_cache.registration_date = registration_data.get("created_at")
-            existing_cache.registration_notes = registration_data.get("notes")
-            existing_cache.custom_field_responses = registration_data.get("custom_field_responses")
+            for field, value in row.items():
+                if field not in REGISTRATION_CACHE_KEYS:
+                    setattr(existing_cache, field, value)
+            existing_cache.pc_fingerprint = row_fingerprint
             existing_cache.last_synced_at = datetime.utcnow()
             existing_cache.updated_at = datetime.utcnow()
         else:
             # Create new cache entry
             cache_entry = PlanningCenterRegistrationsCache(
                 planning_center_registration_id=pc_registration_id,
-                planning_center_event_id=registration_data.get("event_id"),
-                planning_center_person_id=registration_data.get("person_id"),
-                registration_status=registration_data.get("status"),
-                registration_date=registration_data.get("created_at"),
-                registration_notes=registration_data.get("notes"),
-                custom_field_responses=registration_data.get("custom_field_responses"),
-                last_synced_at=datetime.utcnow()
+                pc_fingerprint=row_fingerprint,
+                last_synced_at=datetime.utcnow(),
+                **row
             )
             db.add(cache_entry)
         
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
     
     def process_webhook_event(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process webhook event from Planning Center"""
+        """Queue a webhook event from Planning Center for background processing"""
+        from app.services.planning_center_webhook_service import enqueue_webhook_event
+        
         try:
-            # Store webhook event
-            webhook_event = PlanningCenterWebhookEvents(
-                event_type=webhook_data.get("event_type"),
-                planning_center_id=webhook_data.get("id"),
-                payload=webhook_data
-            )
-            self.db.add(webhook_event)
-            self.db.commit()
-            
-            # Process based on event type
-            event_type = webhook_data.get("event_type")
-            if event_type == "person.created" or event_type == "person.updated":
-                # Sync person data
-                asyncio.create_task(self.sync_people())
-            elif event_type == "event.created" or event_type == "event.updated":
-                # Sync event data
-                asyncio.create_task(self.sync_events())
-            elif event_type == "registration.created" or event_type == "registration.updated":
-                # Sync registration data
-                event_id = webhook_data.get("event_id")
-                asyncio.create_task(self.sync_registrations(event_id=event_id))
-            
-            # Mark webhook as processed
-            webhook_event.processed = True
-            webhook_event.processed_at = datetime.utcnow()
-            self.db.commit()
-            
-            return {"status": "success", "message": "Webhook processed successfully"}
-            
+            webhook_event = enqueue_webhook_event(self.db, webhook_data)
+            return {"status": "success", "message": "Webhook queued for processing", "webhook_id": webhook_event.id}
         except Exception as e:
-            # Mark webhook as failed
-            if 'webhook_event' in locals():
-                webhook_event.processed = True
-                webhook_event.processed_at = datetime.utcnow()
-                webhook_event.error_message = str(e)
-                self.db.commit()
-            
+            self.db.rollback()
             return {"status": "error", "error": str(e)}
@@ -0,0 +1,339 @@
+"""
+Planning Center webhook processing
+
+The webhook endpoint only stores the payload. A background processor on the
+sync worker loop claims unprocessed rows in batches, groups them by record and
+fetches each referenced record once (``/people/v2/people/{id}`` etc.) before
+upserting it and marking its rows processed. Rows younger than the
+debounce window are left for the next batch, so a burst of webhooks for the
+same record collapses into a single fetch, and a webhook storm becomes a queue
+drained at a controlled rate.
+
+A record whose latest webhook is ``*.destroyed``, or whose fetch returns 404,
+is gone from PC and is not fetched or upserted. Its local row is deactivated
+the way a full-sync reconcile would: people and courses get ``is_active=False``,
+and enrollments get the "cancelled" registration status.
+
+A record that fails to fetch or apply has its rows released for a later poll
+with their attempt count raised; after ``PLANNING_CENTER_WEBHOOK_MAX_ATTEMPTS``
+failures (or a failure no retry can fix) the rows are marked processed with
+the error.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.planning_center_client import planning_center_client
+from app.models.course import Course
+from app.models.enrollment import CourseEnrollment
+from app.models.member import People
+from app.models.planning_center_webhook_events import PlanningCenterWebhookEvents
+from app.services.course_service import CourseService
+from app.services.enrollment_service import CourseEnrollmentService
+from app.services.people_service import PeopleService
+from app.services.planning_center_id_index import PlanningCenterIdIndex
+from app.services.planning_center_pager import PlanningCenterPager
+from app.services.planning_center_reconciler import PlanningCenterReconciler
+
+logger = logging.getLogger(__name__)
+
+# Webhook resources we sync, keyed by the prefix of the event type
+WEBHOOK_RESOURCES = ("person", "event", "registration")
+
+
+def webhook_resource(event_type: Optional[str]) -> Optional[str]:
+    """Map an event type such as ``person.updated`` to the resource it refers to"""
+    resource = (event_type or "").split(".")[0]
+    return resource if resource in WEBHOOK_RESOURCES else None
+
+
+def is_destroyed(event_type: Optional[str]) -> bool:
+    """Whether an event type such as ``person.destroyed`` reports a deletion"""
+    return (event_type or "").endswith(".destroyed")
+
+
+def enqueue_webhook_event(db: Session, webhook_data: Dict[str, Any]) -> PlanningCenterWebhookEvents:
+    """Store a webhook payload for the background processor (a single insert)"""
+    webhook_event = PlanningCenterWebhookEvents(
+        event_type=webhook_data.get("event_type"),
+        planning_center_id=str(webhook_data.get("id") or ""),
+        payload=webhook_data,
+        processed=False,
+        created_at=datetime.utcnow()  # compared against utcnow() for the debounce window
+    )
+    db.add(webhook_event)
+    db.commit()
+    return webhook_event
+
+
+class PendingWebhook:
+    """Claimed webhooks that refer to the same record"""
+
+    def __init__(self, resource: str, planning_center_id: str, event_id: Optional[str]):
+        self.resource = resource
+        self.planning_center_id = planning_center_id
+        self.event_id = event_id
+        self.destroyed = False  # deleted in PC, per the latest webhook or a 404 fetch
+        self.retry = True  # False once a failure cannot succeed on a later attempt
+        self.webhook_event_ids: List[int] = []
+
+
+class PlanningCenterWebhookProcessor:
+    """Drains stored webhooks in batches and applies them with targeted fetches"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        debounce_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.debounce_seconds = settings.PLANNING_CENTER_WEBHOOK_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        self.batch_size = batch_size or settings.PLANNING_CENTER_WEBHOOK_BATCH_SIZE
+        self._future = None
+
+    def _session(self) -> Session:
+        if self.session_factory is not None:
+            return self.session_factory()
+        from app.core.database import SessionLocal
+        return SessionLocal()
+
+    def claim_batch(self, db: Session, force: bool = False) -> List[PlanningCenterWebhookEvents]:
+        """Claim up to batch_size unprocessed webhooks that are past the debounce window"""
+        now = datetime.utcnow()
+        claimable = [
+            PlanningCenterWebhookEvents.processed == False,  # noqa: E712
+            (PlanningCenterWebhookEvents.claimed_at.is_(None)) |
+            (PlanningCenterWebhookEvents.claimed_at < now - timedelta(seconds=settings.PLANNING_CENTER_WEBHOOK_CLAIM_SECONDS))
+        ]
+        if not force:
+            claimable.append(PlanningCenterWebhookEvents.created_at <= now - timedelta(seconds=self.debounce_seconds))
+
+        ids = [webhook_id for (webhook_id,) in db.query(PlanningCenterWebhookEvents.id).filter(
+            *claimable
+        ).order_by(PlanningCenterWebhookEvents.id).limit(self.batch_size).all()]
+        if not ids:
+            return []
+
+        # Re-check the claim conditions so concurrent processors never share a row
+        token = str(uuid.uuid4())
+        db.query(PlanningCenterWebhookEvents).filter(
+            PlanningCenterWebhookEvents.id.in_(ids), *claimable
+        ).update({"claim_token": token, "claimed_at": now}, synchronize_session=False)
+        db.commit()
+        return db.query(PlanningCenterWebhookEvents).filter(
+            PlanningCenterWebhookEvents.claim_token == token
+        ).order_by(PlanningCenterWebhookEvents.id).all()
+
+    def _group(self, webhooks: List[PlanningCenterWebhookEvents]) -> Tuple[List[PendingWebhook], List[int]]:
+        """Coalesce claimed webhooks per record; returns (records, ids with nothing to sync)"""
+        grouped: Dict[Tuple[str, str], PendingWebhook] = {}
+        ignored = []
+        for webhook in webhooks:
+            resource = webhook_resource(webhook.event_type)
+            if resource is None or not webhook.planning_center_id:
+                ignored.append(webhook.id)
+                continue
+            key = (resource, webhook.planning_center_id)
+            event_id = (webhook.payload or {}).get("event_id")
+            pending = grouped.setdefault(key, PendingWebhook(resource, webhook.planning_center_id, event_id))
+            pending.event_id = event_id or pending.event_id
+            pending.destroyed = is_destroyed(webhook.event_type)  # rows come in id order, so the latest wins
+            pending.webhook_event_ids.append(webhook.id)
+        return list(grouped.values()), ignored
+
+    def _record_url(self, base_url: str, pending: PendingWebhook) -> Optional[str]:
+        if pending.resource == "person":
+            return f"{base_url}/people/v2/people/{pending.planning_center_id}"
+        if pending.resource == "event":
+            return f"{base_url}/events/v2/events/{pending.planning_center_id}"
+        if pending.event_id:
+            return f"{base_url}/events/v2/events/{pending.event_id}/registrations/{pending.planning_center_id}"
+        return None
+
+    async def _fetch(self, pager: PlanningCenterPager, base_url: str,
+                     pending: PendingWebhook) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if pending.destroyed:
+            return None, None
+        url = self._record_url(base_url, pending)
+        if url is None:
+            pending.retry = False
+            return None, "Registration webhook has no event_id"
+        try:
+            record = await pager.fetch_record(url)
+        except Exception as e:
+            return None, str(e)
+        if record is None:
+            pending.destroyed = True
+            return None, None
+        if pending.resource == "registration":
+            record.setdefault("event_id", pending.event_id)
+        return record, None
+
+    def _apply(self, db: Session, sync_service, pending: PendingWebhook, record: Dict[str, Any],
+               id_index: PlanningCenterIdIndex):
+        """Upsert a freshly fetched record the same way the list syncs do"""
+        if pending.resource == "person":
+            person = PeopleService(db).sync_from_planning_center(record)
+            id_index.add_person(person.planning_center_id, person.id)
+        elif pending.resource == "event":
+            sync_service._cache_event_data(db, record)
+            course = CourseService(db).sync_from_planning_center(record)
+            id_index.add_course(course.planning_center_event_id, course.id)
+        else:
+            sync_service._cache_registration_data(db, record)
+            CourseEnrollmentService(db).sync_from_planning_center(record, id_index=id_index)
+
+    def _deactivate(self, db: Session, pending: PendingWebhook):
+        """Deactivate the local row of a record deleted in Planning Center"""
+        if pending.resource == "person":
+            PlanningCenterReconciler(db).deactivate(People, "planning_center_id", [pending.planning_center_id])
+        elif pending.resource == "event":
+            PlanningCenterReconciler(db).deactivate(Course, "planning_center_event_id", [pending.planning_center_id])
+        else:
+            db.query(CourseEnrollment).filter(
+                CourseEnrollment.planning_center_registration_id == pending.planning_center_id
+            ).update({
+                "registration_status": "cancelled",
+                "updated_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+
+    def _mark_processed(self, db: Session, webhook_event_ids: List[int], error: Optional[str] = None):
+        if not webhook_event_ids:
+            return
+        db.query(PlanningCenterWebhookEvents).filter(
+            PlanningCenterWebhookEvents.id.in_(webhook_event_ids)
+        ).update({
+            "processed": True,
+            "processed_at": datetime.utcnow(),
+            "error_message": error,
+            "claim_token": None
+        }, synchronize_session=False)
+        db.commit()
+
+    def _release_failed(self, db: Session, webhook_event_ids: List[int], attempts: Dict[int, int], error: str) -> int:
+        """Count a failed attempt and release the rows for a later batch; returns how many were released.
+        
+        Rows that have used up their attempts are marked processed with the
+        error instead.
+        """
+        if not webhook_event_ids:
+            return 0
+        exhausted = [webhook_id for webhook_id in webhook_event_ids
+                     if attempts[webhook_id] + 1 >= settings.PLANNING_CENTER_WEBHOOK_MAX_ATTEMPTS]
+        db.query(PlanningCenterWebhookEvents).filter(
+            PlanningCenterWebhookEvents.id.in_(webhook_event_ids)
+        ).update({
+            "attempts": PlanningCenterWebhookEvents.attempts + 1,
+            "error_message": error,
+            "claim_token": None,
+            "claimed_at": None
+        }, synchronize_session=False)
+        db.commit()
+        self._mark_processed(db, exhausted, error)
+        return len(webhook_event_ids) - len(exhausted)
+
+    async def process_batch(self, force: bool = False) -> Tuple[int, int]:
+        """Claim and apply one batch of stored webhooks.
+        
+        Returns how many rows the batch covered and how many of them were
+        released to be retried.
+        """
+        from app.services.planning_center_sync_service import PlanningCenterSyncService
+
+        db = self._session()
+        try:
+            webhooks = self.claim_batch(db, force=force)
+            if not webhooks:
+                return 0, 0
+            attempts = {webhook.id: webhook.attempts for webhook in webhooks}
+            due, ignored = self._group(webhooks)
+
+            try:
+                sync_service = PlanningCenterSyncService(db)
+            except ValueError as e:
+                self._mark_processed(db, ignored)
+                released = self._release_failed(db, [webhook.id for webhook in webhooks if webhook.id not in ignored],
+                                                attempts, str(e))
+                return len(webhooks), released
+
+            # Fetch concurrently, then write one record at a time
+            async with planning_center_client() as client:
+                pager = PlanningCenterPager(client, sync_service.headers,
+                                            semaphore=asyncio.Semaphore(settings.PLANNING_CENTER_EVENT_CONCURRENCY))
+                fetched = await asyncio.gather(*(self._fetch(pager, sync_service.base_url, pending) for pending in due))
+
+            # Shared by the batch so a person or event created here resolves
+            # for registrations later in the same batch
+            id_index = PlanningCenterIdIndex(db)
+            done = list(ignored)
+            failed = defaultdict(list)
+            abandoned = defaultdict(list)
+            for pending, (record, error) in zip(due, fetched):
+                if record is not None or pending.destroyed:
+                    try:
+                        if pending.destroyed:
+                            self._deactivate(db, pending)
+                        else:
+                            self._apply(db, sync_service, pending, record, id_index)
+                    except Exception as e:
+                        db.rollback()
+                        error = str(e)
+                if error:
+                    logger.warning(f"Webhook for {pending.resource} {pending.planning_center_id} failed: {error}")
+                    (failed if pending.retry else abandoned)[error].extend(pending.webhook_event_ids)
+                else:
+                    done.extend(pending.webhook_event_ids)
+
+            self._mark_processed(db, done)
+            for error, webhook_event_ids in abandoned.items():
+                self._mark_processed(db, webhook_event_ids, error)
+            released = 0
+            for error, webhook_event_ids in failed.items():
+                released += self._release_failed(db, webhook_event_ids, attempts, error)
+            return len(webhooks), released
+        finally:
+            db.close()
+
+    async def drain(self, force: bool = False) -> int:
+        """Process batches until no claimable webhooks remain.
+        
+        Stops after a batch that released failed rows, so they are retried on
+        the next poll rather than straight away.
+        """
+        total = 0
+        while True:
+            processed, released = await self.process_batch(force=force)
+            total += processed
+            if not processed or released:
+                return total
+
+    async def run(self):
+        """Drain stored webhooks every poll interval until cancelled"""
+        while True:
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Error processing Planning Center webhooks: {e}")
+            await asyncio.sleep(settings.PLANNING_CENTER_WEBHOOK_POLL_SECONDS)
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Run the processor on a long-lived loop owned by another thread"""
+        if self._future is None or self._future.done():
+            self._future = asyncio.run_coroutine_threadsafe(self.run(), loop)
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+
+webhook_processor = PlanningCenterWebhookProcessor()
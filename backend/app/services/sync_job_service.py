@@ -0,0 +1,259 @@
+"""
+Planning Center sync job queue (database-backed)
+
+Jobs live in ``planning_center_sync_jobs`` so any API instance can report on
+them and any worker can claim them. Every job, top-level or a stage of
+sync_all, holds ``lock_key`` (its task type) while pending or running, so the
+unique constraint stops a second sync of the same type from being queued, even
+from another instance.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.planning_center_sync_job import PlanningCenterSyncJob
+
+ACTIVE_STATUSES = ("pending", "running")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Status fields stored in their own columns; anything else goes into details
+JOB_STATUS_COLUMNS = ("status", "progress", "message", "result", "error")
+
+
+def job_status(job: PlanningCenterSyncJob) -> Dict[str, Any]:
+    """Render a job in the shape the sync task endpoints have always returned"""
+    status = dict(job.details or {})
+    status.update({
+        "task_id": job.id,
+        "task_type": job.task_type,
+        "parent_id": job.parent_id,
+        "status": job.status,
+        "started_at": job.started_at or job.created_at,
+        "completed_at": job.completed_at,
+        "progress": job.progress,
+        "message": job.message,
+        "result": job.result,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "attempts": job.attempts
+    })
+    return status
+
+
+class SyncJobService:
+    """Service for queueing, claiming and tracking sync jobs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        task_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        task_id: Optional[str] = None,
+        parent_id: Optional[str] = None
+    ) -> Tuple[PlanningCenterSyncJob, bool]:
+        """Queue a job and return ``(job, created)``.
+
+        If a job of the same type is already pending or running, that job is
+        returned with ``created=False``; this includes a sync_all stage of that
+        type. Stages of a parent job are never claimed by workers.
+        """
+        job = PlanningCenterSyncJob(
+            id=task_id or str(uuid.uuid4()),
+            task_type=task_type,
+            parent_id=parent_id,
+            status="pending",
+            lock_key=task_type,
+            params=params or {},
+            progress=0,
+            message="Task queued",
+            cancel_requested=False,
+            attempts=0
+        )
+        self.db.add(job)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            existing = self.db.query(PlanningCenterSyncJob).filter(
+                PlanningCenterSyncJob.lock_key == task_type
+            ).first()
+            if existing is None:
+                raise
+            return existing, False
+        return job, True
+
+    def get(self, job_id: str) -> Optional[PlanningCenterSyncJob]:
+        return self.db.get(PlanningCenterSyncJob, job_id)
+
+    def get_stage(self, parent_id: str, task_type: str) -> Optional[PlanningCenterSyncJob]:
+        """The stage of ``task_type`` already queued under a parent job, if any"""
+        return self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.parent_id == parent_id,
+            PlanningCenterSyncJob.task_type == task_type
+        ).order_by(PlanningCenterSyncJob.created_at.desc()).first()
+
+    def list_jobs(self, task_type: Optional[str] = None, limit: int = 100) -> List[PlanningCenterSyncJob]:
+        """Most recent jobs first"""
+        query = self.db.query(PlanningCenterSyncJob)
+        if task_type:
+            query = query.filter(PlanningCenterSyncJob.task_type == task_type)
+        return query.order_by(PlanningCenterSyncJob.created_at.desc()).limit(limit).all()
+
+    def update(self, job_id: str, **fields) -> Optional[PlanningCenterSyncJob]:
+        """Apply status fields to a job, releasing its lock once it finishes"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        details = dict(job.details or {})
+        for key, value in fields.items():
+            if key in JOB_STATUS_COLUMNS:
+                setattr(job, key, value)
+            else:
+                details[key] = value
+        job.details = details
+
+        now = datetime.utcnow()
+        if job.status == "running" and job.started_at is None:
+            job.started_at = now
+        if job.status in FINISHED_STATUSES:
+            job.completed_at = job.completed_at or now
+            job.lock_key = None
+        self.db.commit()
+        return job
+
+    def finish(self, job_id: str, status: str, **fields):
+        """Finish a job and any of its stages that are still active"""
+        self.update(job_id, status=status, **fields)
+        self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.parent_id == job_id,
+            PlanningCenterSyncJob.status.in_(ACTIVE_STATUSES)
+        ).update({
+            "status": status,
+            "lock_key": None,
+            "completed_at": datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def supersede(self, job_id: str, message: str) -> bool:
+        """Cancel a queued job whose work another job is taking over; False if a worker claimed it first"""
+        superseded = self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.id == job_id,
+            PlanningCenterSyncJob.status == "pending"
+        ).update({
+            "status": "cancelled",
+            "lock_key": None,
+            "message": message,
+            "completed_at": datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(superseded)
+
+    def request_cancel(self, job_id: str) -> Optional[PlanningCenterSyncJob]:
+        """Cancel a pending job now, or flag a running job for its worker to stop"""
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return job
+        if job.status == "pending":
+            self.finish(job_id, "cancelled", message="Task cancelled")
+        else:
+            job.cancel_requested = True
+            self.db.commit()
+        return self.get(job_id)
+
+    def claim_next(self, worker_id: str) -> Optional[PlanningCenterSyncJob]:
+        """Atomically move the oldest pending top-level job to running"""
+        candidates = self.db.query(PlanningCenterSyncJob.id).filter(
+            PlanningCenterSyncJob.status == "pending",
+            PlanningCenterSyncJob.parent_id.is_(None)
+        ).order_by(PlanningCenterSyncJob.created_at).limit(5).all()
+
+        for (job_id,) in candidates:
+            now = datetime.utcnow()
+            # The status guard makes this a compare-and-set across instances
+            claimed = self.db.query(PlanningCenterSyncJob).filter(
+                PlanningCenterSyncJob.id == job_id,
+                PlanningCenterSyncJob.status == "pending"
+            ).update({
+                "status": "running",
+                "worker_id": worker_id,
+                "started_at": now,
+                "heartbeat_at": now,
+                "attempts": PlanningCenterSyncJob.attempts + 1,
+                "message": "Task started"
+            }, synchronize_session=False)
+            self.db.commit()
+            if claimed:
+                return self.get(job_id)
+        return None
+
+    def heartbeat(self, job_id: str) -> bool:
+        """Record that the worker is alive; returns True if cancellation was requested"""
+        self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.id == job_id
+        ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+        self.db.commit()
+        job = self.get(job_id)
+        if job is None:
+            return False
+        self.db.refresh(job)
+        return bool(job.cancel_requested)
+
+    def release(self, job_id: str):
+        """Put a running job back in the queue (its worker is shutting down)"""
+        self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.id == job_id,
+            PlanningCenterSyncJob.status == "running"
+        ).update({
+            "status": "pending",
+            "worker_id": None,
+            "message": "Task requeued after worker shutdown"
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def recover_stale(self, lease_seconds: Optional[int] = None, max_attempts: Optional[int] = None) -> int:
+        """Requeue (or fail) running jobs whose worker stopped sending heartbeats"""
+        lease_seconds = lease_seconds or settings.SYNC_JOB_LEASE_SECONDS
+        max_attempts = max_attempts or settings.SYNC_JOB_MAX_ATTEMPTS
+        cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+        stale = self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.status == "running",
+            PlanningCenterSyncJob.parent_id.is_(None),
+            PlanningCenterSyncJob.heartbeat_at < cutoff
+        ).all()
+
+        for job in stale:
+            if job.attempts < max_attempts and not job.cancel_requested:
+                job.status = "pending"
+                job.worker_id = None
+                job.message = "Task requeued after its worker stopped responding"
+            else:
+                self.finish(job.id, "failed", error="Worker stopped responding",
+                            message="Task failed: worker stopped responding")
+        self.db.commit()
+        return len(stale)
+
+    def prune(self, retention_days: Optional[int] = None, max_retained: Optional[int] = None) -> int:
+        """Delete finished jobs older than the retention window or beyond the retained count"""
+        retention_days = retention_days or settings.SYNC_JOB_RETENTION_DAYS
+        max_retained = max_retained or settings.SYNC_JOB_MAX_RETAINED
+        finished = self.db.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.status.in_(FINISHED_STATUSES)
+        )
+
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        deleted = finished.filter(PlanningCenterSyncJob.completed_at < cutoff).delete(synchronize_session=False)
+
+        keep = [job_id for (job_id,) in finished.with_entities(PlanningCenterSyncJob.id).order_by(
+            PlanningCenterSyncJob.completed_at.desc()
+        ).limit(max_retained).all()]
+        deleted += finished.filter(PlanningCenterSyncJob.id.notin_(keep)).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
@@ -0,0 +1,179 @@
+"""
+Planning Center sync worker pool
+
+Runs queued sync jobs on a single long-lived event loop in a background
+thread, so the pooled Planning Center client and its connections survive
+from one job to the next. Every API instance may run a pool; jobs are
+claimed through the database, so each runs exactly once.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.planning_center_client import close_planning_center_client
+from app.services.sync_job_service import SyncJobService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncJobWorker:
+    """Pool of sync workers sharing one event loop"""
+
+    def __init__(self, session_factory: Optional[Callable] = None, concurrency: Optional[int] = None):
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency or settings.SYNC_WORKER_CONCURRENCY)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._main: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def _session(self):
+        if self.session_factory is not None:
+            return self.session_factory()
+        from app.core.database import SessionLocal
+        return SessionLocal()
+
+    def _jobs(self, action: Callable[[SyncJobService], object]):
+        """Run one job-store operation in its own short session"""
+        db = self._session()
+        try:
+            return action(SyncJobService(db))
+        finally:
+            db.close()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the worker thread and its event loop"""
+        if self.is_running:
+            return
+        self._stopping = False
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), name="pc-sync-worker", daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.info(f"Sync worker pool {self.worker_id} started with {self.concurrency} workers")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the workers; jobs still running are requeued for another worker"""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self.loop.call_soon_threadsafe(self._main.cancel)
+        self._thread.join(timeout)
+        logger.info(f"Sync worker pool {self.worker_id} stopped")
+
+    def notify(self):
+        """Wake idle workers after a job is queued on this instance"""
+        if self.is_running and self._wakeup is not None:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _run_loop(self, ready: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        self._wakeup = asyncio.Event()
+        self._main = self.loop.create_task(self._serve())
+        ready.set()
+        try:
+            self.loop.run_until_complete(self._main)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.run_until_complete(close_planning_center_client())
+            self.loop.close()
+
+    async def _serve(self):
+        tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.create_task(self._housekeeping()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _work(self):
+        while True:
+            try:
+                job = self._jobs(lambda jobs: jobs.claim_next(self.worker_id))
+            except Exception as e:
+                logger.error(f"Error claiming sync job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.SYNC_WORKER_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self.run_job(job.id, job.task_type, job.params or {})
+
+    async def _housekeeping(self):
+        """Recover jobs from dead workers and prune old ones"""
+        while True:
+            try:
+                self._jobs(lambda jobs: jobs.recover_stale())
+                self._jobs(lambda jobs: jobs.prune())
+            except Exception as e:
+                logger.error(f"Error during sync job housekeeping: {e}")
+            await asyncio.sleep(settings.SYNC_JOB_LEASE_SECONDS / 2)
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Task):
+        while not task.done():
+            await asyncio.sleep(settings.SYNC_JOB_HEARTBEAT_SECONDS)
+            try:
+                if self._jobs(lambda jobs: jobs.heartbeat(job_id)):
+                    logger.info(f"Cancelling sync job {job_id}")
+                    task.cancel()
+            except Exception as e:
+                logger.error(f"Error recording heartbeat for sync job {job_id}: {e}")
+
+    async def _execute(self, job_id: str, task_type: str, params: dict):
+        from app.services.planning_center_sync_service import PlanningCenterSyncService
+
+        db = self._session()
+        try:
+            await PlanningCenterSyncService(db).run_sync_job(job_id, task_type, params)
+        finally:
+            db.close()
+
+    async def run_job(self, job_id: str, task_type: str, params: dict):
+        """Run a claimed job to completion, cancellation or failure"""
+        task = asyncio.ensure_future(self._execute(job_id, task_type, params))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, task))
+        try:
+            await task
+        except asyncio.CancelledError:
+            if self._stopping:
+                self._jobs(lambda jobs: jobs.release(job_id))
+                raise
+            self._jobs(lambda jobs: jobs.finish(job_id, "cancelled", message="Task cancelled"))
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Sync job {job_id} failed: {error}")
+            self._jobs(lambda jobs: jobs.finish(job_id, "failed", message=f"Task failed: {error}", error=error))
+        else:
+            # Sync methods record their own outcome; close out any that did not
+            job = self._jobs(lambda jobs: jobs.get(job_id))
+            if job is not None and job.status in ("pending", "running"):
+                self._jobs(lambda jobs: jobs.finish(job_id, "completed"))
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+
+
+sync_job_worker = SyncJobWorker()
@@ -2,15 +2,16 @@
 Planning Center sync service
 """
 
-import httpx
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.planning_center_client import planning_center_client
 from app.schemas.sync import SyncResponse, SyncStatus
-from app.models.member import People as MemberModel
 from app.services.mock_planning_center_service import MockPlanningCenterService
+from app.services.people_service import PeopleService
+from app.services.planning_center_pager import PlanningCenterPager
 
 
 class SyncService:
@@ -30,7 +31,7 @@ class SyncService:
             return await self.mock_service.test_connection()
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with planning_center_client() as client:
                 headers = self._get_auth_headers()
                 response = await client.get(
                     f"{self.api_url}/people/v2/people",
@@ -47,30 +48,23 @@ class SyncService:
             raise ValueError("Database session required for sync")
         
         try:
+            people_service = PeopleService(self.db)
+            synced_count = 0
+            
             if self.use_mock:
                 # Use mock service for development
                 people_data = await self.mock_service.get_people(limit=100, offset=0)
-                people = people_data.get("data", [])
+                batch = people_service.bulk_sync_from_planning_center(people_data.get("data", []))
+                synced_count += batch["processed"] - batch["failed"]
             else:
                 # Use real Planning Center API
-                async with httpx.AsyncClient() as client:
-                    headers = self._get_auth_headers()
+                async with planning_center_client() as client:
+                    pager = PlanningCenterPager(client, self._get_auth_headers())
                     
                     # Fetch people from Planning Center
-                    response = await client.get(
-                        f"{self.api_url}/people/v2/people",
-                        headers=headers,
-                        params={"per_page": 100}
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    people = data.get("data", [])
-            
-            synced_count = 0
-            for person in people:
-                if await self._sync_person(person):
-                    synced_count += 1
+                    async for chunk, _ in pager.iter_chunks(f"{self.api_url}/people/v2/people"):
+                        batch = people_service.bulk_sync_from_planning_center(chunk)
+                        synced_count += batch["processed"] - batch["failed"]
             
             return SyncResponse(
                 success=True,
@@ -87,44 +81,6 @@ class SyncService:
                 sync_time=datetime.utcnow()
             )
     
-    async def _sync_person(self, person_data: dict) -> bool:
-        """Sync a single person from Planning Center"""
-        try:
-            person_id = person_data.get("id")
-            attributes = person_data.get("attributes", {})
-            
-            # Check if member already exists
-            existing_member = self.db.query(MemberModel).filter(
-                MemberModel.planning_center_id == person_id
-            ).first()
-            
-            if existing_member:
-                # Update existing member
-                existing_member.first_name = attributes.get("first_name", "")
-                existing_member.last_name = attributes.get("last_name", "")
-                existing_member.email = attributes.get("email", "")
-                existing_member.phone = attributes.get("phone", "")
-                existing_member.updated_at = datetime.utcnow()
-            else:
-                # Create new member
-                new_member = MemberModel(
-                    planning_center_id=person_id,
-                    first_name=attributes.get("first_name", ""),
-                    last_name=attributes.get("last_name", ""),
-                    email=attributes.get("email", ""),
-                    phone=attributes.get("phone", ""),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                self.db.add(new_member)
-            
-            self.db.commit()
-            return True
-            
-        except Exception:
-            self.db.rollback()
-            return False
-    
     def get_sync_status(self) -> SyncStatus:
         """Get current sync status"""
         # This would typically be stored in a sync status table
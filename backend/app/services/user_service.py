@@ -2,6 +2,8 @@
 User service layer
 """
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -91,3 +93,14 @@ class UserService:
         """Verify a password"""
         from app.core.security import verify_password
         return verify_password(plain_password, hashed_password)
+
+
+class AsyncUserService:
+    """Read-only user lookups on an AsyncSession; used to authenticate every request"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_user(self, user_id: int) -> Optional[UserModel]:
+        """Get a specific user by ID"""
+        return (await self.db.scalars(select(UserModel).where(UserModel.id == user_id).limit(1))).first()
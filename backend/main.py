@@ -7,11 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sqlalchemy_exc
 import uvicorn
 import time
 import logging
 
 from app.core.config import settings
+from app.core.query_stats import start_request_stats, stop_request_stats
 from app.api.v1.api import api_router
 from app.core.csv_loader import load_csv_data_on_startup
 
@@ -54,7 +56,8 @@ app.add_middleware(
         "X-Page-Count",
         "X-Rate-Limit-Limit",
         "X-Rate-Limit-Remaining",
-        "X-Rate-Limit-Reset"
+        "X-Rate-Limit-Reset",
+        "Server-Timing"
     ],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
@@ -108,11 +111,24 @@ async def log_requests(request: Request, call_next):
     # Log request
     logger.info(f"Request: {request.method} {request.url.path} from {request.client.host}")
     
-    response = await call_next(request)
+    # Collect the request's SQL statement count and time
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        query_stats = None
+        response = await call_next(request)
+    else:
+        query_stats, token = start_request_stats(f"{request.method} {request.url.path}")
+        try:
+            response = await call_next(request)
+        finally:
+            stop_request_stats(token)
     
     # Log response
     process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} in {process_time:.4f}s")
+    if query_stats is None:
+        logger.info(f"Response: {response.status_code} in {process_time:.4f}s")
+    else:
+        response.headers["Server-Timing"] = f'{query_stats.server_timing()}, total;dur={process_time * 1000:.1f}'
+        logger.info(f"Response: {response.status_code} in {process_time:.4f}s ({query_stats.summary()})")
     
     return response
 
@@ -186,6 +202,17 @@ if settings.RATE_LIMIT_ENABLED:
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(sqlalchemy_exc.TimeoutError)
+async def pool_timeout_handler(request: Request, exc: sqlalchemy_exc.TimeoutError):
+    """Answer database pool exhaustion with 503 so clients back off and retry"""
+    logger.warning(f"Database pool exhausted for {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy. Please try again shortly."},
+        headers={"Retry-After": str(settings.DATABASE_POOL_RETRY_AFTER)}
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup event handler"""
@@ -197,6 +224,21 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error loading CSV data on startup: {e}")
     
+    # Start periodic SQLite maintenance (SQLite production mode only)
+    from app.core.database import sqlite_maintenance
+    if sqlite_maintenance is not None:
+        sqlite_maintenance.start()
+    
+    # Start the Planning Center sync worker pool and webhook processor
+    if settings.SYNC_WORKERS_ENABLED:
+        try:
+            from app.services.sync_job_worker import sync_job_worker
+            from app.services.planning_center_webhook_service import webhook_processor
+            sync_job_worker.start()
+            webhook_processor.start(sync_job_worker.loop)
+        except Exception as e:
+            logger.error(f"Error starting sync workers: {e}")
+    
     logger.info("Application startup completed")
 
 
@@ -204,6 +246,30 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event handler"""
     logger.info("Shutting down Church Course Tracker API...")
+    
+    # Stop sync workers; jobs they were running go back in the queue
+    try:
+        from app.services.sync_job_worker import sync_job_worker
+        from app.services.planning_center_webhook_service import webhook_processor
+        webhook_processor.stop()
+        sync_job_worker.stop()
+    except Exception as e:
+        logger.error(f"Error stopping sync workers: {e}")
+    
+    # Stop SQLite maintenance; runs PRAGMA optimize one last time
+    try:
+        from app.core.database import sqlite_maintenance
+        if sqlite_maintenance is not None:
+            sqlite_maintenance.stop()
+    except Exception as e:
+        logger.error(f"Error stopping SQLite maintenance: {e}")
+    
+    # Close pooled Planning Center connections
+    try:
+        from app.core.planning_center_client import close_planning_center_client
+        await close_planning_center_client()
+    except Exception as e:
+        logger.error(f"Error closing Planning Center client: {e}")
 
 @app.get("/")
 async def root():
@@ -217,7 +283,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Comprehensive health check endpoint"""
-    from app.core.database import SessionLocal
+    from app.core.database import SessionLocal, get_pool_status
     from sqlalchemy import text
     import time
     
@@ -238,6 +304,12 @@ async def health_check():
         health_status["checks"]["database"] = f"unhealthy: {str(e)}"
         health_status["status"] = "unhealthy"
     
+    # Connection pool telemetry
+    try:
+        health_status["checks"]["database_pool"] = get_pool_status()
+    except Exception as e:
+        health_status["checks"]["database_pool"] = f"unavailable: {str(e)}"
+    
     # Application configuration check
     try:
         health_status["checks"]["configuration"] = "healthy"
@@ -0,0 +1,29 @@
+"""add_sync_log_watermarks
+
+Revision ID: a3f1c2d4e5b6
+Revises: 69026e93dba9
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c2d4e5b6'
+down_revision = '69026e93dba9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sync mode and high-water mark for incremental Planning Center syncs
+    op.add_column('planning_center_sync_log', sa.Column('sync_mode', sa.String(length=20), nullable=True))
+    op.add_column('planning_center_sync_log', sa.Column('high_water_mark', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('idx_pc_sync_log_type_watermark', 'planning_center_sync_log', ['sync_type', 'high_water_mark'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_pc_sync_log_type_watermark', table_name='planning_center_sync_log')
+    op.drop_column('planning_center_sync_log', 'high_water_mark')
+    op.drop_column('planning_center_sync_log', 'sync_mode')
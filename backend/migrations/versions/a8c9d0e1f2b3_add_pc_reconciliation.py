@@ -0,0 +1,32 @@
+"""add_pc_reconciliation
+
+Revision ID: a8c9d0e1f2b3
+Revises: f7b8c9d0e1a2
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c9d0e1f2b3'
+down_revision = 'f7b8c9d0e1a2'
+branch_labels = None
+depends_on = None
+
+RECONCILED_TABLES = ('people', 'courses')
+
+
+def upgrade() -> None:
+    # Rows a full sync deactivated because PC no longer has them
+    for table in RECONCILED_TABLES:
+        op.add_column(table, sa.Column('pc_missing_since', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('planning_center_sync_log',
+                  sa.Column('records_deactivated', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('planning_center_sync_log', 'records_deactivated')
+    for table in reversed(RECONCILED_TABLES):
+        op.drop_column(table, 'pc_missing_since')
@@ -0,0 +1,55 @@
+"""add_planning_center_sync_jobs
+
+Revision ID: b7d2e9f0a1c3
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e9f0a1c3'
+down_revision = 'a3f1c2d4e5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Durable sync job queue shared by every API instance
+    op.create_table('planning_center_sync_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('task_type', sa.String(length=50), nullable=False),
+        sa.Column('parent_id', sa.String(length=36), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('lock_key', sa.String(length=50), nullable=True),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('lock_key')
+    )
+    op.create_index(op.f('ix_planning_center_sync_jobs_task_type'), 'planning_center_sync_jobs', ['task_type'], unique=False)
+    op.create_index(op.f('ix_planning_center_sync_jobs_parent_id'), 'planning_center_sync_jobs', ['parent_id'], unique=False)
+    op.create_index(op.f('ix_planning_center_sync_jobs_status'), 'planning_center_sync_jobs', ['status'], unique=False)
+    # Workers claim the oldest pending job
+    op.create_index('idx_pc_sync_jobs_status_created', 'planning_center_sync_jobs', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_pc_sync_jobs_status_created', table_name='planning_center_sync_jobs')
+    op.drop_index(op.f('ix_planning_center_sync_jobs_status'), table_name='planning_center_sync_jobs')
+    op.drop_index(op.f('ix_planning_center_sync_jobs_parent_id'), table_name='planning_center_sync_jobs')
+    op.drop_index(op.f('ix_planning_center_sync_jobs_task_type'), table_name='planning_center_sync_jobs')
+    op.drop_table('planning_center_sync_jobs')
@@ -0,0 +1,30 @@
+"""tag_pc_synced_rows
+
+Revision ID: b9d0e1f2a3c4
+Revises: a8c9d0e1f2b3
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d0e1f2a3c4'
+down_revision = 'a8c9d0e1f2b3'
+branch_labels = None
+depends_on = None
+
+RECONCILED_TABLES = ('people', 'courses')
+
+
+def upgrade() -> None:
+    # Reconciliation only diffs rows tagged as written by a PC sync; rows the
+    # sync wrote before it tagged them are the ones carrying a fingerprint
+    for table in RECONCILED_TABLES:
+        op.execute(f"UPDATE {table} SET data_source = 'api' "
+                   f"WHERE data_source IS NULL AND pc_fingerprint IS NOT NULL")
+
+
+def downgrade() -> None:
+    # The tag is harmless without the filter, and earlier sources are unknown
+    pass
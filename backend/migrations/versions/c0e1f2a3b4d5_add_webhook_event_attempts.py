@@ -0,0 +1,26 @@
+"""add_webhook_event_attempts
+
+Revision ID: c0e1f2a3b4d5
+Revises: b9d0e1f2a3c4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c0e1f2a3b4d5'
+down_revision = 'b9d0e1f2a3c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Failed webhooks are released for another attempt instead of being marked processed
+    op.add_column('planning_center_webhook_events',
+                  sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('planning_center_webhook_events', 'attempts')
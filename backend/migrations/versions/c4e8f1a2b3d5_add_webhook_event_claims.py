@@ -0,0 +1,32 @@
+"""add_webhook_event_claims
+
+Revision ID: c4e8f1a2b3d5
+Revises: b7d2e9f0a1c3
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8f1a2b3d5'
+down_revision = 'b7d2e9f0a1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Batch claims for the background webhook processor
+    op.add_column('planning_center_webhook_events', sa.Column('claim_token', sa.String(length=36), nullable=True))
+    op.add_column('planning_center_webhook_events', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_planning_center_webhook_events_claim_token'), 'planning_center_webhook_events', ['claim_token'], unique=False)
+    # The processor scans for unprocessed rows in arrival order
+    op.create_index('idx_pc_webhook_events_processed_id', 'planning_center_webhook_events', ['processed', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_pc_webhook_events_processed_id', table_name='planning_center_webhook_events')
+    op.drop_index(op.f('ix_planning_center_webhook_events_claim_token'), table_name='planning_center_webhook_events')
+    op.drop_column('planning_center_webhook_events', 'claimed_at')
+    op.drop_column('planning_center_webhook_events', 'claim_token')
@@ -0,0 +1,32 @@
+"""add_sync_fingerprints
+
+Revision ID: d5f2a3b4c6e7
+Revises: c4e8f1a2b3d5
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f2a3b4c6e7'
+down_revision = 'c4e8f1a2b3d5'
+branch_labels = None
+depends_on = None
+
+FINGERPRINTED_TABLES = ('people', 'courses', 'planning_center_events_cache', 'planning_center_registrations_cache')
+
+
+def upgrade() -> None:
+    # Content hashes let syncs skip rows whose PC values have not changed
+    for table in FINGERPRINTED_TABLES:
+        op.add_column(table, sa.Column('pc_fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('planning_center_sync_log',
+                  sa.Column('records_unchanged', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('planning_center_sync_log', 'records_unchanged')
+    for table in reversed(FINGERPRINTED_TABLES):
+        op.drop_column(table, 'pc_fingerprint')
@@ -0,0 +1,29 @@
+"""add_sync_checkpoints
+
+Revision ID: e6a7b8c9d0f1
+Revises: d5f2a3b4c6e7
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a7b8c9d0f1'
+down_revision = 'd5f2a3b4c6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets a restarted or retried sync job continue from its last committed batch
+    op.add_column('planning_center_sync_log', sa.Column('task_id', sa.String(length=36), nullable=True))
+    op.add_column('planning_center_sync_log', sa.Column('checkpoint', sa.JSON(), nullable=True))
+    op.create_index('ix_planning_center_sync_log_task_id', 'planning_center_sync_log', ['task_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_planning_center_sync_log_task_id', table_name='planning_center_sync_log')
+    op.drop_column('planning_center_sync_log', 'checkpoint')
+    op.drop_column('planning_center_sync_log', 'task_id')
@@ -0,0 +1,25 @@
+"""add_sync_stage_timings
+
+Revision ID: f7b8c9d0e1a2
+Revises: e6a7b8c9d0f1
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b8c9d0e1a2'
+down_revision = 'e6a7b8c9d0f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-stage timings of a sync_all run
+    op.add_column('planning_center_sync_log', sa.Column('stage_timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('planning_center_sync_log', 'stage_timings')
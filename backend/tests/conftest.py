@@ -13,6 +13,9 @@ from datetime import datetime, date, timezone
 # Override database configuration for tests
 os.environ["DATABASE_URL"] = "sqlite:///./data/church_course_tracker.db"
 os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["SYNC_WORKERS_ENABLED"] = "false"
+# Tests that exercise the Planning Center response cache build their own
+os.environ["PLANNING_CENTER_RESPONSE_CACHE_PATH"] = ""
 
 # Test database URL - use the migrated database for tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/church_course_tracker.db"
@@ -32,7 +35,7 @@ db_module.engine = engine
 db_module.SessionLocal = TestingSessionLocal
 
 # Import after setting environment variables
-from app.core.database import Base, get_db
+from app.core.database import Base, get_async_db, get_db
 from main import app
 
 # Import all models to ensure they are registered with SQLAlchemy
@@ -91,16 +94,66 @@ def db_session():
         session.close()
 
 
+@pytest.fixture(scope="function")
+def memory_engine():
+    """Create a private in-memory SQLite engine with all tables for each test."""
+    from sqlalchemy.pool import StaticPool
+
+    memory_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=memory_engine)
+    yield memory_engine
+    memory_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def memory_db_session(memory_engine):
+    """Create a session on the private in-memory database."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)()
+    yield session
+    session.close()
+
+
+class SessionBackedAsyncSession:
+    """AsyncSession stand-in that runs queries on the test's sync session.
+    
+    The async read endpoints then see the rows a test added through
+    ``db_session``, committed or not, just like the sync endpoints do.
+    """
+    
+    def __init__(self, session):
+        self.session = session
+    
+    async def scalars(self, statement, *args, **kwargs):
+        return self.session.scalars(statement, *args, **kwargs)
+    
+    async def scalar(self, statement, *args, **kwargs):
+        return self.session.scalar(statement, *args, **kwargs)
+    
+    async def execute(self, statement, *args, **kwargs):
+        return self.session.execute(statement, *args, **kwargs)
+    
+    async def get(self, entity, ident, **kwargs):
+        return self.session.get(entity, ident, **kwargs)
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
-    """Create a test client with database dependency override."""
+    """Create a test client with database dependency overrides."""
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
     
+    async def override_get_async_db():
+        yield SessionBackedAsyncSession(db_session)
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Ensure tables are created for the test client
     Base.metadata.create_all(bind=engine)
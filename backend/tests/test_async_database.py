@@ -0,0 +1,150 @@
+"""
+Tests for the async engine, AsyncSession dependency and async read services
+"""
+
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, get_async_database_url, get_async_db
+from app.models.course import Course
+from app.models.course_content import ContentType, CourseContent, CourseModule, StorageType
+from app.models.member import People
+from app.services.content_service import AsyncContentService
+from app.services.course_service import AsyncCourseService
+from app.services.people_service import AsyncPeopleService, PeopleService
+from main import app
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """A file database with a few people and a course with one module, set up synchronously"""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        People(planning_center_id="pc-1", first_name="Ada", last_name="Lovelace", email="ada@example.com"),
+        People(planning_center_id="pc-2", first_name="Alan", last_name="Turing", email="alan@example.com"),
+        People(planning_center_id="pc-3", first_name="Grace", last_name="Hopper", is_active=False),
+    ])
+    course = Course(title="Foundations", planning_center_event_id="ev-1")
+    session.add(course)
+    session.flush()
+    module = CourseModule(course_id=course.id, title="Week 1", order_index=1)
+    session.add(module)
+    session.flush()
+    session.add(CourseContent(course_id=course.id, module_id=module.id, title="Notes",
+                              content_type=ContentType.DOCUMENT, storage_type=StorageType.DATABASE))
+    session.commit()
+    session.close()
+    engine.dispose()
+    return url
+
+
+def run_async(url, work):
+    async def run():
+        engine = create_async_engine(get_async_database_url(url))
+        try:
+            async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+                return await work(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+class TestAsyncDatabaseUrl:
+    """Test mapping DATABASE_URL onto the asyncio drivers"""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./data/app.db", "sqlite+aiosqlite:///./data/app.db"),
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgres://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ])
+    def test_urls_use_async_drivers(self, url, expected):
+        """Test sync URLs are rewritten to their async driver and async URLs are kept"""
+        assert get_async_database_url(url) == expected
+
+
+class TestAsyncServices:
+    """Test the async read services against the sync ones"""
+
+    def test_people_queries_match_sync_service(self, database_url):
+        """Test AsyncPeopleService returns the same rows as PeopleService"""
+        async def work(db):
+            service = AsyncPeopleService(db)
+            return (
+                [person.planning_center_id for person in await service.get_people(is_active=True)],
+                [person.planning_center_id for person in await service.search_people("la")],
+                (await service.get_person_by_pc_id("pc-3")).first_name,
+                await service.get_person(999),
+            )
+
+        active, matches, by_pc_id, missing = run_async(database_url, work)
+
+        engine = create_engine(database_url)
+        session = sessionmaker(bind=engine)()
+        sync_service = PeopleService(session)
+        assert active == [person.planning_center_id for person in sync_service.get_people(is_active=True)]
+        assert matches == [person.planning_center_id for person in sync_service.search_people("la")]
+        session.close()
+        engine.dispose()
+
+        assert active == ["pc-1", "pc-2"]
+        assert sorted(matches) == ["pc-1", "pc-2"]
+        assert by_pc_id == "Grace"
+        assert missing is None
+
+    def test_modules_are_returned_with_their_content(self, database_url):
+        """Test module content items are loaded eagerly, so they read fine after the session closes"""
+        async def work(db):
+            course = await AsyncCourseService(db).get_course_by_pc_event_id("ev-1")
+            return await AsyncContentService(db).get_modules(course.id)
+
+        modules = run_async(database_url, work)
+
+        assert [module.title for module in modules] == ["Week 1"]
+        assert [item.title for item in modules[0].content_items] == ["Notes"]
+
+
+class TestAsyncEndpoints:
+    """Test the async read endpoints on get_async_db"""
+
+    def test_people_endpoint_reads_through_async_session(self, database_url):
+        """Test GET /people/ is served from the AsyncSession dependency"""
+        async def run():
+            engine = create_async_engine(get_async_database_url(database_url))
+            sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+            async def override_get_async_db():
+                async with sessions() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_db] = override_get_async_db
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+                    return await client.get("/api/v1/people/", params={"is_active": True})
+            finally:
+                app.dependency_overrides.pop(get_async_db, None)
+                await engine.dispose()
+
+        response = asyncio.run(run())
+
+        assert response.status_code == 200
+        assert [person["planning_center_id"] for person in response.json()] == ["pc-1", "pc-2"]
+
+    def test_client_fixture_reads_the_test_session(self, client, db_session):
+        """Test async endpoints behind the shared client see rows the test has not committed"""
+        person = People(planning_center_id="pc-uncommitted", first_name="Katherine", last_name="Johnson")
+        db_session.add(person)
+        db_session.flush()
+
+        response = client.get(f"/api/v1/people/{person.id}")
+
+        assert response.status_code == 200
+        assert response.json()["planning_center_id"] == "pc-uncommitted"
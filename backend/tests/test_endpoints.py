@@ -797,11 +797,24 @@ class TestPlanningCenterSyncEndpoints:
         }
         
         response = client.post("/api/v1/planning-center/webhook", json=webhook_data)
-        assert response.status_code == 200
+        assert response.status_code == 202
         
         data = response.json()
-        assert data["status"] == "success"
-        assert data["message"] == "Webhook processed successfully"
+        assert data["status"] == "accepted"
+        assert data["message"] == "Webhook queued for processing"
+        assert "webhook_id" in data
+    
+    def test_process_webhook_store_failure(self, client, monkeypatch):
+        """Test POST /planning-center/webhook when the event cannot be stored"""
+        from app.api.v1.endpoints import planning_center_sync
+
+        def fail(db, webhook_data):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(planning_center_sync, "enqueue_webhook_event", fail)
+        response = client.post("/api/v1/planning-center/webhook", json={"event_type": "person.created", "id": "pc_123"})
+        assert response.status_code == 500
+        assert "database unavailable" in response.json()["detail"]
     
     def test_process_webhook_invalid_json(self, client):
         """Test POST /planning-center/webhook with invalid JSON"""
@@ -0,0 +1,193 @@
+"""
+Tests for the seedable Planning Center stand-in (mock service and ASGI app)
+"""
+
+import asyncio
+import httpx
+from datetime import datetime
+from sqlalchemy.orm import sessionmaker
+
+import app.core.planning_center_client as planning_center_client
+from app.core.config import settings
+from app.models.member import People
+from app.services.mock_planning_center_app import MockPlanningCenterFaults, create_mock_planning_center_app
+from app.services.mock_planning_center_service import MockPlanningCenterService
+from app.services.planning_center_pager import PlanningCenterPager
+from app.services.planning_center_sync_service import PlanningCenterSyncService
+
+
+BASE_URL = "https://api.planningcenteronline.com"
+REFERENCE_TIME = datetime(2026, 1, 31)
+
+
+async def _no_sleep(delay):
+    return None
+
+
+def make_service(**kwargs) -> MockPlanningCenterService:
+    kwargs.setdefault("seed", 7)
+    kwargs.setdefault("reference_time", REFERENCE_TIME)
+    return MockPlanningCenterService(**kwargs)
+
+
+async def fetch_all(app, url: str, params=None, limiter=None):
+    """Page through ``url`` on the mock app; returns the flattened records"""
+    transport = httpx.ASGITransport(app=app)
+    if limiter is not None:
+        transport = planning_center_client.RateLimitedTransport(transport, limiter, max_retries=10)
+    async with httpx.AsyncClient(transport=transport) as client:
+        pager = PlanningCenterPager(client, {}, per_page=100, prefetch_pages=4)
+        return [record async for record in pager.iter_records(url, params)]
+
+
+class TestMockPlanningCenterService:
+    """Test MockPlanningCenterService data generation"""
+
+    def test_same_seed_same_data(self):
+        """Test data depends only on the seed"""
+        first = asyncio.run(make_service(people_count=200).get_people(limit=50, offset=100))
+        again = asyncio.run(make_service(people_count=200).get_people(limit=50, offset=100))
+        other = asyncio.run(make_service(seed=8, people_count=200).get_people(limit=50, offset=100))
+
+        assert first == again
+        assert first["data"] != other["data"]
+
+    def test_large_directory_is_generated_on_demand(self):
+        """Test a deep page of a 100k directory is served without building the rest"""
+        service = make_service(people_count=100_000, events_count=5_000)
+
+        page = asyncio.run(service.get_people(limit=100, offset=99_950))
+
+        assert page["meta"]["total_count"] == 100_000
+        assert [person["id"] for person in page["data"]][-1] == "pc_person_100000"
+        assert len(page["data"]) == 50
+        assert page["meta"]["next"] is None
+        assert asyncio.run(service.get_event("pc_event_5000"))["data"]["id"] == "pc_event_5000"
+
+    def test_updated_since_matches_scan(self):
+        """Test the binary-searched filter returns exactly the recently updated people"""
+        service = make_service(people_count=500)
+        since = "2026-01-20T00:00:00Z"
+
+        page = asyncio.run(service.get_people(limit=500, updated_since=since))
+        everyone = asyncio.run(service.get_people(limit=500))["data"]
+
+        assert page["data"] == [person for person in everyone if person["updated_at"] >= since]
+        assert 0 < page["meta"]["total_count"] < 500
+
+    def test_registration_changes_are_served(self):
+        """Test created, updated and deleted registrations show up in the event's list"""
+        service = make_service(people_count=100, events_count=5)
+        event_id = "pc_event_002"
+        existing = asyncio.run(service.get_event_registrations(event_id, limit=100))["data"]
+        person_id = next(f"pc_person_{i:03d}" for i in range(1, 101)
+                         if f"pc_person_{i:03d}" not in {r["person_id"] for r in existing})
+
+        created = asyncio.run(service.create_registration(event_id, person_id))["data"]
+        asyncio.run(service.update_registration(existing[0]["id"], status="cancelled"))
+        asyncio.run(service.delete_registration(existing[1]["id"]))
+
+        registrations = {r["id"]: r for r in asyncio.run(service.get_event_registrations(event_id, limit=100))["data"]}
+        assert created["id"] in registrations
+        assert registrations[existing[0]["id"]]["status"] == "cancelled"
+        assert existing[1]["id"] not in registrations
+        assert len(registrations) == len(existing)
+
+
+class TestMockPlanningCenterApp:
+    """Test the in-process Planning Center API app"""
+
+    def test_pager_walks_every_person(self):
+        """Test PC-style paging serves every record exactly once"""
+        app = create_mock_planning_center_app(make_service(people_count=1_050))
+
+        people = asyncio.run(fetch_all(app, f"{BASE_URL}/people/v2/people"))
+
+        assert len(people) == 1_050
+        assert len({person["id"] for person in people}) == 1_050
+        assert people[0]["first_name"]
+
+    def test_registrations_are_json_api(self):
+        """Test registrations carry person and event relationships"""
+        app = create_mock_planning_center_app(make_service(people_count=100, events_count=3))
+
+        registrations = asyncio.run(fetch_all(app, f"{BASE_URL}/events/v2/events/pc_event_001/registrations"))
+
+        assert registrations
+        assert all(r["event_id"] == "pc_event_001" and r["person_id"].startswith("pc_person_") for r in registrations)
+
+    def test_updated_at_filter_is_kept_in_next_links(self):
+        """Test where[updated_at][gte] filters every page"""
+        service = make_service(people_count=600)
+        app = create_mock_planning_center_app(service)
+        since = "2026-01-15T00:00:00Z"
+
+        people = asyncio.run(fetch_all(app, f"{BASE_URL}/people/v2/people", {"where[updated_at][gte]": since}))
+
+        expected = asyncio.run(service.get_people(limit=600, updated_since=since))["data"]
+        assert [person["id"] for person in people] == [person["id"] for person in expected]
+
+        async def first_page():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+                return (await client.get(f"{BASE_URL}/people/v2/people",
+                                         params={"per_page": 25, "where[updated_at][gte]": since})).json()
+
+        assert "where%5Bupdated_at%5D%5Bgte%5D" in asyncio.run(first_page())["links"]["next"]
+
+    def test_missing_record_is_404(self):
+        """Test single-record lookups of unknown ids return a JSON:API 404"""
+        app = create_mock_planning_center_app(make_service(people_count=10))
+
+        async def get():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+                return await client.get(f"{BASE_URL}/people/v2/people/pc_person_999")
+
+        response = asyncio.run(get())
+        assert response.status_code == 404
+        assert response.json()["errors"][0]["status"] == "404"
+
+    def test_injected_faults_are_retried(self, monkeypatch):
+        """Test 429s and 5xx errors are injected and absorbed by the retrying client"""
+        monkeypatch.setattr(planning_center_client.asyncio, "sleep", _no_sleep)
+        faults = MockPlanningCenterFaults(seed=3, throttle_rate=0.2, error_rate=0.1, retry_after=0)
+        app = create_mock_planning_center_app(make_service(people_count=2_000), faults)
+        limiter = planning_center_client.PlanningCenterRateLimiter(limit=10_000, period=1)
+
+        people = asyncio.run(fetch_all(app, f"{BASE_URL}/people/v2/people", limiter=limiter))
+
+        assert len(people) == 2_000
+        assert faults.stats["throttled"] > 0
+        assert faults.stats["errors"] > 0
+        assert limiter.stats()["retries"] == faults.stats["throttled"] + faults.stats["errors"]
+
+    def test_rate_limit_headers(self):
+        """Test an advertised request budget is enforced with 429 and Retry-After"""
+        faults = MockPlanningCenterFaults(rate_limit=2, rate_period=20)
+        app = create_mock_planning_center_app(make_service(people_count=10), faults)
+
+        async def get_three():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+                return [await client.get(f"{BASE_URL}/people/v2/people") for _ in range(3)]
+
+        first, second, third = asyncio.run(get_three())
+        assert first.headers["X-PCO-API-Request-Rate-Count"] == "1"
+        assert second.status_code == 200
+        assert third.status_code == 429
+        assert 0 < float(third.headers["Retry-After"]) <= 20
+
+    def test_people_sync_against_mock(self, memory_engine, memory_db_session, monkeypatch):
+        """Test a full people sync runs end to end against the in-process app"""
+        app = create_mock_planning_center_app(make_service(people_count=300))
+        monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+        monkeypatch.setattr(planning_center_client, "_clients", {})
+        monkeypatch.setattr(planning_center_client, "_base_transport", lambda config: httpx.ASGITransport(app=app))
+        service = PlanningCenterSyncService(memory_db_session)
+        monkeypatch.setattr(service, "_get_db_session", sessionmaker(autocommit=False, autoflush=False, bind=memory_engine))
+
+        task_id = service._create_sync_task("sync_people")
+        asyncio.run(service._sync_people_background(task_id, mode="full"))
+
+        result = service.get_sync_task_status(task_id)["result"]
+        assert result["records_successful"] == 300
+        assert memory_db_session.query(People).count() == 300
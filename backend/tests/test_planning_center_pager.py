@@ -0,0 +1,350 @@
+"""
+Tests for the Planning Center HTTP layer (paging engine and pooled client)
+"""
+
+import asyncio
+import json
+import httpx
+import pytest
+
+import app.core.planning_center_client as planning_center_client
+from app.core.config import settings
+from app.services.planning_center_pager import PlanningCenterPager, PlanningCenterPage, flatten_resource
+from app.services.planning_center_stream import PlanningCenterStreamDecoder
+
+
+BASE_URL = "https://api.planningcenteronline.com"
+
+
+def make_people_handler(total: int, requests: list, with_total_count: bool = True):
+    """Build a MockTransport handler serving `total` PC-style people"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        per_page = int(request.url.params.get("per_page", 25))
+        offset = int(request.url.params.get("offset", 0))
+        data = [
+            {"type": "Person", "id": str(i), "attributes": {"first_name": f"Person {i}"}}
+            for i in range(offset, min(offset + per_page, total))
+        ]
+        meta = {"count": len(data)}
+        links = {}
+        if with_total_count:
+            meta["total_count"] = total
+        if offset + per_page < total:
+            meta["next"] = {"offset": offset + per_page}
+            links["next"] = f"{BASE_URL}/people/v2/people?offset={offset + per_page}&per_page={per_page}"
+        return httpx.Response(200, json={"data": data, "included": [], "meta": meta, "links": links})
+    return handler
+
+
+async def collect_records(total: int, with_total_count: bool = True, per_page: int = 10, prefetch_pages: int = 3):
+    requests = []
+    transport = httpx.MockTransport(make_people_handler(total, requests, with_total_count))
+    async with httpx.AsyncClient(transport=transport) as client:
+        pager = PlanningCenterPager(client, {}, per_page=per_page, prefetch_pages=prefetch_pages)
+        records = [record async for record in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+    return records, requests
+
+
+class TestPlanningCenterPager:
+    """Test PlanningCenterPager"""
+
+    def test_walks_every_page_in_order(self):
+        """Test that every page is fetched and records stay in order"""
+        records, requests = asyncio.run(collect_records(95))
+
+        assert [r["id"] for r in records] == [str(i) for i in range(95)]
+        assert len(requests) == 10
+
+    def test_follows_links_without_total_count(self):
+        """Test sequential fallback when meta.total_count is missing"""
+        records, requests = asyncio.run(collect_records(35, with_total_count=False))
+
+        assert len(records) == 35
+        assert len(requests) == 4
+
+    def test_single_page(self):
+        """Test a result that fits in one page"""
+        records, requests = asyncio.run(collect_records(5))
+
+        assert len(records) == 5
+        assert len(requests) == 1
+
+    def test_prefetch_is_bounded(self):
+        """Test that no more than prefetch_pages requests are in flight"""
+        state = {"in_flight": 0, "peak": 0}
+
+        async def run():
+            async def handler(request: httpx.Request) -> httpx.Response:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                await asyncio.sleep(0.01)
+                state["in_flight"] -= 1
+                return make_people_handler(200, [])(request)
+
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                pager = PlanningCenterPager(client, {}, per_page=10, prefetch_pages=3)
+                return [r async for r in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+
+        records = asyncio.run(run())
+        assert len(records) == 200
+        assert 1 < state["peak"] <= 3
+
+
+class TestPlanningCenterFanOut:
+    """Test concurrent per-key fetching"""
+
+    def test_fan_out_is_ordered_and_bounded(self):
+        """Test results come back in key order with bounded concurrency"""
+        state = {"in_flight": 0, "peak": 0}
+
+        async def run():
+            async def handler(request: httpx.Request) -> httpx.Response:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                event_id = int(request.url.path.split("/")[-2])
+                # Later events answer faster, so completion order differs from key order
+                await asyncio.sleep(0.001 * (20 - event_id))
+                state["in_flight"] -= 1
+                if event_id == 7:
+                    return httpx.Response(404)
+                return httpx.Response(200, json={"data": [{"id": f"r{event_id}"}], "meta": {"total_count": 1}})
+
+            async def keys():
+                for event_id in range(20):
+                    yield str(event_id)
+
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                pager = PlanningCenterPager(client, {}, semaphore=asyncio.Semaphore(10))
+                return [
+                    result async for result in pager.fan_out(
+                        keys(), lambda key: f"{BASE_URL}/events/v2/events/{key}/registrations", concurrency=5
+                    )
+                ]
+
+        results = asyncio.run(run())
+
+        assert [key for key, _, _ in results] == [str(i) for i in range(20)]
+        assert results[0][1] == [{"id": "r0"}]
+        assert isinstance(results[7][2], httpx.HTTPStatusError)
+        assert results[7][1] == []
+        assert 1 < state["peak"] <= 5
+
+
+class TestPlanningCenterPage:
+    """Test page decoding helpers"""
+
+    def test_flatten_resource(self):
+        """Test JSON:API resources are flattened with relationship ids"""
+        flat = flatten_resource({
+            "type": "Registration",
+            "id": "r1",
+            "attributes": {"status": "registered"},
+            "relationships": {"event": {"data": {"type": "Event", "id": "e1"}}}
+        })
+
+        assert flat == {"id": "r1", "status": "registered", "event_id": "e1"}
+        assert flatten_resource({"id": "p1", "first_name": "Jo"}) == {"id": "p1", "first_name": "Jo"}
+
+    def test_next_offset_from_mock_url(self):
+        """Test the mock API's URL-style meta.next is understood"""
+        page = PlanningCenterPage.from_body({
+            "data": [{"id": "p1"}],
+            "meta": {"total_count": 2, "next": f"{BASE_URL}/people/v2/people?per_page=1&offset=1"}
+        }, 0)
+
+        assert page.next_offset == 1
+        assert page.total_count == 2
+
+
+class TestPlanningCenterStreamDecoder:
+    """Test incremental decoding of response bodies"""
+
+    def decode(self, body: bytes, chunk_size: int):
+        decoder = PlanningCenterStreamDecoder()
+        items = []
+        for start in range(0, len(body), chunk_size):
+            items.extend(decoder.feed(body[start:start + chunk_size]))
+        items.extend(decoder.close())
+        return items, decoder.document
+
+    def test_items_survive_any_chunk_boundary(self):
+        """Test items, multi-byte characters and trailing numbers split across chunks"""
+        body = json.dumps({
+            "data": [{"id": str(i), "attributes": {"name": f"Zoë {i}", "n": [i, {"x": None}]}} for i in range(5)],
+            "included": [{"id": "e1", "type": "Event"}],
+            "meta": {"total_count": 12345, "next": {"offset": 5}},
+            "links": {"next": "https://example.test?offset=5"}
+        }, indent=1).encode("utf-8")
+        expected = json.loads(body)
+
+        for chunk_size in (1, 2, 3, 7, 64, len(body)):
+            items, document = self.decode(body, chunk_size)
+            assert [item for member, item in items if member == "data"] == expected["data"]
+            assert [item for member, item in items if member == "included"] == expected["included"]
+            assert document == {"meta": expected["meta"], "links": expected["links"]}
+
+    def test_scalar_member_at_chunk_end(self):
+        """Test a top-level number cut at the chunk edge is not decoded early"""
+        items, document = self.decode(b'{"data": [], "count": 1234}', 24)
+        assert items == []
+        assert document == {"count": 1234}
+
+    def test_incomplete_body_raises(self):
+        """Test a truncated body is reported instead of silently dropped"""
+        decoder = PlanningCenterStreamDecoder()
+        decoder.feed(b'{"data": [{"id": "1"}, {"id"')
+        with pytest.raises(ValueError):
+            decoder.close()
+
+    def test_streamed_page_matches_decoded_body(self):
+        """Test fetch_page builds the same page as decoding the whole body"""
+        body = {
+            "data": [{"type": "Person", "id": "1", "attributes": {"first_name": "Jo"}}],
+            "included": [{"type": "Email", "id": "m1"}],
+            "meta": {"total_count": 3, "next": {"offset": 1}},
+            "links": {}
+        }
+
+        async def fetch():
+            transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await PlanningCenterPager(client, {}, per_page=1).fetch_page(f"{BASE_URL}/people/v2/people")
+
+        page = asyncio.run(fetch())
+        expected = PlanningCenterPage.from_body(body, 0)
+        assert page.records == expected.records
+        assert page.included == expected.included
+        assert (page.total_count, page.next_offset) == (expected.total_count, expected.next_offset)
+
+    def test_error_status_raises(self):
+        """Test an error response still raises HTTPStatusError"""
+        async def fetch():
+            transport = httpx.MockTransport(lambda request: httpx.Response(500, json={"errors": []}))
+            async with httpx.AsyncClient(transport=transport) as client:
+                await PlanningCenterPager(client, {}).fetch_page(f"{BASE_URL}/people/v2/people")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(fetch())
+
+
+class TestPlanningCenterClient:
+    """Test the pooled Planning Center client"""
+
+    def test_client_is_reused_per_loop(self, monkeypatch):
+        """Test the same pooled client is returned within a loop and closed on shutdown"""
+        monkeypatch.setattr(planning_center_client, "_clients", {})
+
+        async def run():
+            first = planning_center_client.get_planning_center_client()
+            async with planning_center_client.planning_center_client() as second:
+                assert second is first
+            assert not first.is_closed
+            await planning_center_client.close_planning_center_client()
+            return first
+
+        client = asyncio.run(run())
+        assert client.is_closed
+        assert planning_center_client._clients == {}
+
+    def test_client_config(self):
+        """Test pool limits and timeouts come from settings"""
+        config = planning_center_client.get_client_config()
+
+        assert config["limits"].max_connections == settings.PLANNING_CENTER_MAX_CONNECTIONS
+        assert config["limits"].max_keepalive_connections == settings.PLANNING_CENTER_MAX_KEEPALIVE_CONNECTIONS
+        assert config["timeout"].connect == settings.PLANNING_CENTER_CONNECT_TIMEOUT
+        assert config["timeout"].read == settings.PLANNING_CENTER_READ_TIMEOUT
+
+
+class TestPlanningCenterRateLimiter:
+    """Test rate-limit-aware scheduling and retries"""
+
+    def test_retries_429_then_succeeds(self, monkeypatch):
+        """Test a 429 is retried after Retry-After and counted"""
+        monkeypatch.setattr(planning_center_client.asyncio, "sleep", _no_sleep)
+        limiter = planning_center_client.PlanningCenterRateLimiter(limit=100, period=20)
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, json={"data": []}, headers={
+                "X-PCO-API-Request-Rate-Limit": "50",
+                "X-PCO-API-Request-Rate-Period": "10",
+                "X-PCO-API-Request-Rate-Count": "40"
+            }),
+        ]
+
+        async def run():
+            transport = planning_center_client.RateLimitedTransport(
+                httpx.MockTransport(lambda request: responses.pop(0)), limiter, max_retries=3
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.get(f"{BASE_URL}/people/v2/people")
+
+        response = asyncio.run(run())
+        stats = limiter.stats()
+
+        assert response.status_code == 200
+        assert stats["retries"] == 2
+        assert stats["requests_sent"] == 3
+        assert stats["rate_limit"] == 50
+        assert stats["budget_remaining"] <= 5
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        """Test the last throttled response is returned once retries run out"""
+        monkeypatch.setattr(planning_center_client.asyncio, "sleep", _no_sleep)
+        limiter = planning_center_client.PlanningCenterRateLimiter(limit=100, period=20)
+
+        async def run():
+            transport = planning_center_client.RateLimitedTransport(
+                httpx.MockTransport(lambda request: httpx.Response(429)), limiter, max_retries=2
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.get(f"{BASE_URL}/people/v2/people")
+
+        assert asyncio.run(run()).status_code == 429
+        assert limiter.requests_sent == 3
+
+    def test_post_is_not_resent_after_read_timeout(self, monkeypatch):
+        """Test transport errors are retried for POST only when the request never reached the server"""
+        monkeypatch.setattr(planning_center_client.asyncio, "sleep", _no_sleep)
+        attempts = []
+
+        def handler(error):
+            def handle(request: httpx.Request) -> httpx.Response:
+                attempts.append(request.method)
+                if len(attempts) == 1:
+                    raise error("failed", request=request)
+                return httpx.Response(200, json={"data": {}})
+            return handle
+
+        async def run(error, method):
+            limiter = planning_center_client.PlanningCenterRateLimiter(limit=100, period=20)
+            transport = planning_center_client.RateLimitedTransport(httpx.MockTransport(handler(error)), limiter, max_retries=3)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.request(method, f"{BASE_URL}/people/v2/people")
+
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(run(httpx.ReadTimeout, "POST"))
+        assert attempts == ["POST"]
+
+        attempts.clear()
+        assert asyncio.run(run(httpx.ConnectError, "POST")).status_code == 200
+        assert attempts == ["POST", "POST"]
+
+        attempts.clear()
+        assert asyncio.run(run(httpx.ReadTimeout, "GET")).status_code == 200
+        assert attempts == ["GET", "GET"]
+
+    def test_bucket_throttles_below_limit(self):
+        """Test the bucket asks callers to wait once the headroom is spent"""
+        limiter = planning_center_client.PlanningCenterRateLimiter(limit=10, period=10, headroom=0.5)
+
+        waits = [limiter.reserve() for _ in range(7)]
+
+        assert waits[:5] == [0.0] * 5
+        assert 0 < waits[5] < waits[6]
+
+
+async def _no_sleep(delay):
+    return None
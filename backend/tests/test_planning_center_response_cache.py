@@ -0,0 +1,280 @@
+"""
+Tests for the conditional-GET Planning Center response cache
+"""
+
+import asyncio
+import httpx
+import pytest
+from datetime import datetime
+from sqlalchemy.orm import sessionmaker
+
+import app.core.planning_center_client as planning_center_client
+import app.services.planning_center_pager as pager_module
+from app.core.config import settings
+from app.core.planning_center_response_cache import CACHE_HEADER, CachingTransport, PlanningCenterResponseCache
+from app.services.mock_planning_center_app import create_mock_planning_center_app
+from app.services.mock_planning_center_service import MockPlanningCenterService
+from app.services.planning_center_pager import PlanningCenterPager
+from app.services.planning_center_sync_service import PlanningCenterSyncService
+
+
+BASE_URL = "https://api.planningcenteronline.com"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PlanningCenterResponseCache(str(tmp_path / "responses.db"), max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+def make_app(**kwargs):
+    kwargs.setdefault("seed", 5)
+    kwargs.setdefault("reference_time", datetime(2026, 1, 31))
+    return create_mock_planning_center_app(MockPlanningCenterService(**kwargs))
+
+
+def fetch(transport: httpx.AsyncBaseTransport, urls):
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [await client.get(url) for url in urls]
+    return asyncio.run(run())
+
+
+class TestCachingTransport:
+    """Test CachingTransport revalidation"""
+
+    def test_unchanged_response_is_revalidated(self, cache):
+        """Test a repeat GET sends If-None-Match and is answered from the cache"""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json={"data": {"id": "1"}}, headers={"ETag": '"v1"'})
+
+        first, second = fetch(CachingTransport(httpx.MockTransport(handler), cache), [f"{BASE_URL}/events/v2/events/1"] * 2)
+
+        assert "If-None-Match" not in sent[0].headers
+        assert sent[1].headers["If-None-Match"] == '"v1"'
+        assert second.status_code == 200
+        assert second.headers[CACHE_HEADER] == "revalidated"
+        assert second.json() == first.json() == {"data": {"id": "1"}}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_changed_response_replaces_entry(self, cache):
+        """Test a 200 to a conditional request is stored in place of the old version"""
+        versions = iter(['"v1"', '"v2"', '"v2"'])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            etag = next(versions)
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304, headers={"ETag": etag})
+            return httpx.Response(200, json={"version": etag}, headers={"ETag": etag})
+
+        responses = fetch(CachingTransport(httpx.MockTransport(handler), cache), [f"{BASE_URL}/people/v2/people/1"] * 3)
+
+        assert [response.json()["version"] for response in responses] == ['"v1"', '"v2"', '"v2"']
+        assert cache.stats()["stores"] == 2
+        assert cache.stats()["hits"] == 1
+
+    def test_unvalidated_responses_are_not_stored(self, cache):
+        """Test responses without validators, or marked no-store, pass straight through"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/no-store"):
+                return httpx.Response(200, json={}, headers={"ETag": '"x"', "Cache-Control": "no-store"})
+            return httpx.Response(200, json={})
+
+        fetch(CachingTransport(httpx.MockTransport(handler), cache), [f"{BASE_URL}/a", f"{BASE_URL}/no-store", f"{BASE_URL}/a"])
+
+        assert cache.stats()["stores"] == 0
+        assert cache.stats()["size_bytes"] == 0
+
+    def test_body_is_streamed_and_stored_once_read(self, cache):
+        """Test a new 200 body reaches the reader chunk by chunk and is stored after the last chunk"""
+        chunks = [b'{"data": [', b'{"id": "1"}', b"]}"]
+
+        async def body():
+            for chunk in chunks:
+                yield chunk
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=body(), headers={"ETag": '"v1"'})
+
+        async def run():
+            seen = []
+            async with httpx.AsyncClient(transport=CachingTransport(httpx.MockTransport(handler), cache)) as client:
+                async with client.stream("GET", f"{BASE_URL}/events/v2/events") as response:
+                    async for chunk in response.aiter_raw():
+                        seen.append((chunk, cache.stats()["stores"]))
+                    return response, seen
+
+        response, seen = asyncio.run(run())
+
+        assert response.headers[CACHE_HEADER] == "stored"
+        assert [chunk for chunk, _ in seen] == chunks
+        assert all(stores == 0 for _, stores in seen)
+        assert cache.stats()["stores"] == 1
+        assert cache.body(cache.key(response.request)) == b"".join(chunks)
+
+    def test_unfinished_and_oversized_bodies_are_not_stored(self, tmp_path):
+        """Test a body read only in part, or larger than the cache, is passed through without being stored"""
+        cache = PlanningCenterResponseCache(str(tmp_path / "small.db"), max_bytes=100)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            size = 500 if request.url.path.endswith("/large") else 50
+            return httpx.Response(200, content=b"x" * size, headers={"ETag": '"v1"'})
+
+        async def run():
+            async with httpx.AsyncClient(transport=CachingTransport(httpx.MockTransport(handler), cache)) as client:
+                large = await client.get(f"{BASE_URL}/large")
+                async with client.stream("GET", f"{BASE_URL}/small"):
+                    pass
+                return large
+
+        large = asyncio.run(run())
+
+        assert large.content == b"x" * 500
+        assert cache.stats()["stores"] == 0
+        assert cache.stats()["size_bytes"] == 0
+        cache.close()
+
+    def test_evicted_entry_is_fetched_again(self, cache):
+        """Test a 304 for an entry evicted since the lookup is retried without validators"""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                cache.clear()
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json={"id": "1"}, headers={"ETag": '"v1"'})
+
+        responses = fetch(CachingTransport(httpx.MockTransport(handler), cache), [f"{BASE_URL}/people/v2/people/1"] * 2)
+
+        assert sent == [None, '"v1"', None]
+        assert [response.json() for response in responses] == [{"id": "1"}] * 2
+        assert cache.stats()["hits"] == 0
+
+    def test_parsed_pages_are_bounded_by_size(self, cache):
+        """Test decoded pages are dropped oldest first once their body sizes exceed the budget"""
+        cache.parsed_bytes = 250
+        for key in ("a", "b", "c"):
+            cache.remember_parsed(key, '"e"', 100, lambda key=key: key)
+        built = []
+        cache.remember_parsed("d", '"e"', 300, lambda: built.append("d"))
+
+        assert cache.parsed("a", '"e"') is None
+        assert cache.parsed("b", '"e"') == "b"
+        assert cache.parsed("c", '"e"') == "c"
+        assert cache.parsed("c", '"other"') is None
+        assert built == []
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test the store stays under its size bound, evicting the least recently used entry"""
+        cache = PlanningCenterResponseCache(str(tmp_path / "small.db"), max_bytes=250)
+        headers = httpx.Headers({"ETag": '"e"'})
+        cache.store("a", "/a", headers, b"a" * 100)
+        cache.store("b", "/b", headers, b"b" * 100)
+        cache.lookup("a")
+        cache.store("c", "/c", headers, b"c" * 100)
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.lookup("c") is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] == 200
+        cache.close()
+
+        reopened = PlanningCenterResponseCache(str(tmp_path / "small.db"), max_bytes=250)
+        assert reopened.body("c") == b"c" * 100
+        assert reopened.stats()["size_bytes"] == 200
+        reopened.close()
+
+
+class TestCachedPaging:
+    """Test the pager and syncs on top of the response cache"""
+
+    def test_revalidated_pages_are_not_decoded_again(self, tmp_path, monkeypatch):
+        """Test a 304 page is rebuilt from the page decoded earlier"""
+        cache = PlanningCenterResponseCache(str(tmp_path / "responses.db"), max_bytes=1024 * 1024,
+                                            parsed_bytes=1024 * 1024)
+        decoders = []
+
+        class CountingDecoder(pager_module.PlanningCenterStreamDecoder):
+            def __init__(self):
+                super().__init__()
+                decoders.append(self)
+
+        monkeypatch.setattr(pager_module, "PlanningCenterStreamDecoder", CountingDecoder)
+        transport = CachingTransport(httpx.ASGITransport(app=make_app(people_count=250)), cache)
+
+        async def walk():
+            async with httpx.AsyncClient(transport=transport) as client:
+                pager = PlanningCenterPager(client, {}, per_page=100)
+                first = [record async for record in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+                decoded = len(decoders)
+                again = [record async for record in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+                return first, decoded, again
+
+        first, decoded, again = asyncio.run(walk())
+
+        assert decoded == 3
+        assert len(decoders) == 3
+        assert again == first
+        assert len(first) == 250
+        assert cache.stats()["hits"] == 3
+        cache.close()
+
+    def test_revalidated_pages_are_decoded_again_by_default(self, cache, monkeypatch):
+        """Test decoded pages are not kept in memory unless PLANNING_CENTER_RESPONSE_CACHE_PARSED_MB is set"""
+        decoders = []
+
+        class CountingDecoder(pager_module.PlanningCenterStreamDecoder):
+            def __init__(self):
+                super().__init__()
+                decoders.append(self)
+
+        monkeypatch.setattr(pager_module, "PlanningCenterStreamDecoder", CountingDecoder)
+        transport = CachingTransport(httpx.ASGITransport(app=make_app(people_count=250)), cache)
+
+        async def walk():
+            async with httpx.AsyncClient(transport=transport) as client:
+                pager = PlanningCenterPager(client, {}, per_page=100)
+                first = [record async for record in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+                again = [record async for record in pager.iter_records(f"{BASE_URL}/people/v2/people")]
+                return first, again
+
+        first, again = asyncio.run(walk())
+
+        assert cache.parsed_bytes == 0
+        assert len(decoders) == 6
+        assert again == first
+        assert cache.stats()["hits"] == 3
+
+    def test_sync_results_report_cache_counters(self, cache, memory_engine, memory_db_session, monkeypatch):
+        """Test a repeated events sync reports its revalidated pages"""
+        app = make_app(people_count=100, events_count=30)
+        monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+        monkeypatch.setattr(planning_center_client, "_clients", {})
+        monkeypatch.setattr(planning_center_client, "_base_transport", lambda config: httpx.ASGITransport(app=app))
+        monkeypatch.setattr(planning_center_client, "rate_limiter",
+                            planning_center_client.PlanningCenterRateLimiter(limit=10_000, period=1))
+        monkeypatch.setattr(planning_center_client, "response_cache", cache)
+        service = PlanningCenterSyncService(memory_db_session)
+        monkeypatch.setattr(service, "_get_db_session", sessionmaker(autocommit=False, autoflush=False, bind=memory_engine))
+
+        results = []
+        for _ in range(2):
+            task_id = service._create_sync_task("sync_events")
+            asyncio.run(service._sync_events_background(task_id, mode="full"))
+            results.append(service.get_sync_task_status(task_id)["result"])
+
+        assert results[0]["response_cache"]["hits"] == 0
+        assert results[0]["response_cache"]["misses"] > 0
+        assert results[1]["response_cache"]["hits"] == results[0]["response_cache"]["misses"]
+        assert results[1]["response_cache"]["misses"] == 0
+        assert results[1]["records_unchanged"] == 30
@@ -0,0 +1,811 @@
+"""
+Tests for Planning Center sync batch paths
+"""
+
+import asyncio
+import httpx
+import pytest
+from datetime import date, datetime
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+import app.core.planning_center_client as planning_center_client_module
+from app.core.config import settings
+from app.models.course import Course
+from app.models.enrollment import CourseEnrollment
+from app.models.member import People
+from app.models.planning_center_events_cache import PlanningCenterEventsCache
+from app.models.planning_center_registrations_cache import PlanningCenterRegistrationsCache
+from app.models.planning_center_sync_log import PlanningCenterSyncLog
+from app.models.planning_center_webhook_events import PlanningCenterWebhookEvents
+from app.services.people_service import PeopleService
+from app.services.planning_center_cache_writer import upsert_cache_rows
+from app.services.planning_center_id_index import PlanningCenterIdIndex
+from app.services.planning_center_reconciler import PlanningCenterReconciler, ReconciliationAborted, merge_diff
+from app.services.planning_center_sync_run import PlanningCenterSyncRun
+from app.services.planning_center_sync_service import PlanningCenterSyncService
+import app.services.planning_center_webhook_service as webhook_module
+
+
+def make_pc_person(index: int, **overrides) -> dict:
+    """Build a flattened PC person payload"""
+    person = {
+        "id": f"pc_{index}",
+        "first_name": f"First{index}",
+        "last_name": f"Last{index}",
+        "email": f"person{index}@example.com",
+        "date_of_birth": "1990-01-01",
+        "status": "active"
+    }
+    person.update(overrides)
+    return person
+
+
+def pc_people_response(request: httpx.Request, people: list) -> httpx.Response:
+    """Serve a PC-style page of people, honouring offset/per_page"""
+    per_page = int(request.url.params.get("per_page", 25))
+    offset = int(request.url.params.get("offset", 0))
+    page = people[offset:offset + per_page]
+    meta = {"total_count": len(people), "count": len(page)}
+    if offset + per_page < len(people):
+        meta["next"] = {"offset": offset + per_page}
+    return httpx.Response(200, json={
+        "data": [{"type": "Person", "id": p["id"], "attributes": {k: v for k, v in p.items() if k != "id"}} for p in page],
+        "meta": meta
+    })
+
+
+@pytest.fixture
+def pc_service(memory_engine, memory_db_session, monkeypatch):
+    """PlanningCenterSyncService wired to the in-memory database"""
+    monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+    monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)
+    service = PlanningCenterSyncService(memory_db_session)
+    monkeypatch.setattr(service, "_get_db_session", session_factory)
+    return service
+
+
+@pytest.fixture
+def pc_api(monkeypatch):
+    """Route Planning Center HTTP calls to a handler; returns the request log"""
+    state = {"handler": None, "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        return state["handler"](request)
+
+    monkeypatch.setattr(planning_center_client_module, "_clients", {})
+    monkeypatch.setattr(planning_center_client_module, "_base_transport", lambda config: httpx.MockTransport(handler))
+    return state
+
+
+class TestPeopleBulkSync:
+    """Test PeopleService.bulk_sync_from_planning_center"""
+
+    def test_inserts_and_updates(self, memory_db_session):
+        """Test new people are inserted and existing people updated"""
+        memory_db_session.add(People(planning_center_id="pc_0", first_name="Old", last_name="Name"))
+        memory_db_session.commit()
+
+        service = PeopleService(memory_db_session)
+        result = service.bulk_sync_from_planning_center(
+            [make_pc_person(i) for i in range(5)], updated_by=7, chunk_size=2
+        )
+
+        assert result["processed"] == 5
+        assert result["inserted"] == 4
+        assert result["updated"] == 1
+        assert result["failed"] == 0
+
+        memory_db_session.expire_all()
+        people = memory_db_session.query(People).order_by(People.planning_center_id).all()
+        assert len(people) == 5
+        assert people[0].first_name == "First0"
+        assert people[0].updated_by == 7
+        assert people[0].date_of_birth == date(1990, 1, 1)
+        assert all(person.last_synced_at is not None for person in people)
+
+    def test_one_transaction_per_chunk(self, memory_engine, memory_db_session):
+        """Test a chunk is written with a bounded number of statements"""
+        statements = []
+        event.listen(memory_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        service = PeopleService(memory_db_session)
+        service.bulk_sync_from_planning_center([make_pc_person(i) for i in range(50)], chunk_size=50)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(selects) == 1
+        assert 1 <= len(inserts) <= 2
+        assert memory_db_session.query(People).count() == 50
+
+    def test_bad_record_only_fails_itself(self, memory_db_session):
+        """Test a failing chunk is replayed record by record"""
+        payloads = [make_pc_person(1), {"first_name": "No Id"}, make_pc_person(2)]
+
+        service = PeopleService(memory_db_session)
+        result = service.bulk_sync_from_planning_center(payloads)
+
+        assert result["processed"] == 3
+        assert result["failed"] == 1
+        assert result["inserted"] == 2
+        assert memory_db_session.query(People).count() == 2
+
+    def test_matches_single_record_sync(self, memory_db_session):
+        """Test the bulk path validates, tags and reactivates people like sync_from_planning_center"""
+        memory_db_session.add(People(planning_center_id="pc_1", first_name="First1", last_name="Last1",
+                                     is_active=False, pc_missing_since=datetime(2026, 1, 1)))
+        memory_db_session.commit()
+
+        service = PeopleService(memory_db_session)
+        result = service.bulk_sync_from_planning_center([make_pc_person(1), make_pc_person(2, email="not-an-email")])
+
+        assert result["updated"] == 1
+        assert result["failed"] == 1
+        memory_db_session.expire_all()
+        person = service.get_person_by_pc_id("pc_1")
+        assert person.is_active
+        assert person.pc_missing_since is None
+        assert person.data_source == "api"
+        assert service.get_person_by_pc_id("pc_2") is None
+
+    def test_admin_deactivation_is_kept(self, memory_db_session):
+        """Test a changed PC payload does not reactivate a person deactivated by hand"""
+        memory_db_session.add_all([
+            People(planning_center_id="pc_1", first_name="Old", last_name="Name", is_active=False),
+            People(planning_center_id="pc_2", first_name="Old", last_name="Name", is_active=False),
+        ])
+        memory_db_session.commit()
+
+        service = PeopleService(memory_db_session)
+        result = service.bulk_sync_from_planning_center([make_pc_person(1)])
+        service.sync_from_planning_center(make_pc_person(2))
+
+        assert result["updated"] == 1
+        memory_db_session.expire_all()
+        for pc_id in ("pc_1", "pc_2"):
+            person = service.get_person_by_pc_id(pc_id)
+            assert person.first_name != "Old"
+            assert not person.is_active
+
+
+def make_registration_cache_row(index: int, **overrides) -> dict:
+    """Build registrations cache column values"""
+    row = {
+        "planning_center_event_id": "pc_event_1",
+        "planning_center_person_id": f"pc_{index}",
+        "registration_status": "registered",
+        "registration_date": datetime(2026, 1, 1),
+        "registration_notes": None,
+        "custom_field_responses": {}
+    }
+    row.update(overrides)
+    return row
+
+
+class TestCacheWriter:
+    """Test upsert_cache_rows"""
+
+    def test_inserts_updates_and_skips_unchanged(self, memory_db_session):
+        """Test new rows are inserted, changed rows updated and unchanged rows left alone"""
+        rows = [(f"reg_{i}", make_registration_cache_row(i)) for i in range(4)]
+        first = upsert_cache_rows(memory_db_session, PlanningCenterRegistrationsCache,
+                                  "planning_center_registration_id", rows, chunk_size=3)
+        assert first == {"inserted": 4, "updated": 0, "unchanged": 0}
+
+        rows[1] = ("reg_1", make_registration_cache_row(1, registration_status="cancelled"))
+        second = upsert_cache_rows(memory_db_session, PlanningCenterRegistrationsCache,
+                                   "planning_center_registration_id", rows + [("reg_9", make_registration_cache_row(9))])
+        assert second == {"inserted": 1, "updated": 1, "unchanged": 3}
+
+        memory_db_session.expire_all()
+        cached = {row.planning_center_registration_id: row
+                  for row in memory_db_session.query(PlanningCenterRegistrationsCache).all()}
+        assert len(cached) == 5
+        assert cached["reg_1"].registration_status == "cancelled"
+        assert cached["reg_0"].registration_status == "registered"
+
+    def test_protected_columns_are_not_updated(self, memory_db_session):
+        """Test protected columns keep the values they were inserted with"""
+        upsert_cache_rows(memory_db_session, PlanningCenterRegistrationsCache, "planning_center_registration_id",
+                          [("reg_1", make_registration_cache_row(1))])
+        upsert_cache_rows(memory_db_session, PlanningCenterRegistrationsCache, "planning_center_registration_id",
+                          [("reg_1", make_registration_cache_row(1, planning_center_event_id="pc_event_2",
+                                                                registration_status="waitlisted"))],
+                          protected=("planning_center_event_id", "planning_center_person_id"))
+
+        memory_db_session.expire_all()
+        row = memory_db_session.query(PlanningCenterRegistrationsCache).one()
+        assert row.planning_center_event_id == "pc_event_1"
+        assert row.registration_status == "waitlisted"
+
+    def test_one_lookup_and_one_upsert_per_chunk(self, memory_engine, memory_db_session):
+        """Test a chunk is written with one key lookup and one upsert statement"""
+        statements = []
+        event.listen(memory_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        rows = [(f"pc_event_{i}", {"event_name": f"Event {i}", "current_registrations_count": i}) for i in range(60)]
+        upsert_cache_rows(memory_db_session, PlanningCenterEventsCache, "planning_center_event_id", rows, chunk_size=30)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(selects) == 2
+        assert len(inserts) == 2
+        assert memory_db_session.query(PlanningCenterEventsCache).count() == 60
+
+    def test_missing_id_fails_the_chunk(self, memory_db_session):
+        """Test a payload without an id rejects the chunk before anything is written"""
+        with pytest.raises(ValueError):
+            upsert_cache_rows(memory_db_session, PlanningCenterEventsCache, "planning_center_event_id",
+                              [("pc_event_1", {"event_name": "One"}), (None, {"event_name": "No Id"})])
+        memory_db_session.rollback()
+        assert memory_db_session.query(PlanningCenterEventsCache).count() == 0
+
+
+class TestIncrementalSync:
+    """Test watermark-driven incremental syncs"""
+
+    def test_full_then_incremental(self, pc_service, pc_api, memory_db_session):
+        """Test the first run is full and records a watermark used by the next run"""
+        people = [make_pc_person(i, updated_at=f"2026-01-0{i + 1}T12:00:00Z") for i in range(3)]
+        pc_api["handler"] = lambda request: pc_people_response(request, people)
+
+        task_id = pc_service._create_sync_task("sync_people")
+        asyncio.run(pc_service._sync_people_background(task_id))
+
+        assert pc_service.get_sync_task_status(task_id)["result"]["mode"] == "full"
+        assert "where[updated_at][gte]" not in pc_api["requests"][0].url.params
+        watermark = pc_service.get_sync_watermark("people")
+        assert watermark.isoformat() == "2026-01-03T12:00:00+00:00"
+
+        pc_api["requests"].clear()
+        task_id = pc_service._create_sync_task("sync_people")
+        asyncio.run(pc_service._sync_people_background(task_id))
+
+        assert pc_service.get_sync_task_status(task_id)["result"]["mode"] == "incremental"
+        since = pc_api["requests"][0].url.params["where[updated_at][gte]"]
+        assert since == "2026-01-03T11:50:00Z"
+        assert memory_db_session.query(People).count() == 3
+
+    def test_explicit_full_mode(self, pc_service, pc_api, memory_db_session):
+        """Test an explicit full resync ignores the watermark"""
+        memory_db_session.add(PlanningCenterSyncLog(
+            sync_type="people", sync_direction="from_pc", started_at=datetime(2026, 1, 1),
+            high_water_mark=datetime(2026, 1, 1)
+        ))
+        memory_db_session.commit()
+        pc_api["handler"] = lambda request: pc_people_response(request, [make_pc_person(1)])
+
+        task_id = pc_service._create_sync_task("sync_people")
+        asyncio.run(pc_service._sync_people_background(task_id, mode="full"))
+
+        assert "where[updated_at][gte]" not in pc_api["requests"][0].url.params
+
+    def test_invalid_mode_rejected(self, pc_service):
+        """Test unknown modes are rejected before a task starts"""
+        with pytest.raises(ValueError):
+            pc_service.start_sync_people(mode="sideways")
+
+
+class TestReconciliation:
+    """Test deactivation of records deleted in Planning Center"""
+
+    def add_people(self, db, *keys, **values):
+        values.setdefault("data_source", "api")
+        for key in keys:
+            db.add(People(planning_center_id=key, first_name="Local", last_name=key, **values))
+        db.commit()
+
+    def test_merge_diff(self):
+        """Test the merge pairs every local key with whether it was seen"""
+        local = [("a",), ("b",), ("d",), ("f",)]
+
+        assert [(row[0], found) for row, found in merge_diff(local, ["b", "c", "d", "e"])] == [
+            ("a", False), ("b", True), ("d", True), ("f", False)
+        ]
+        assert [found for _, found in merge_diff(local, [])] == [False] * 4
+
+    def test_missing_rows_are_deactivated(self, memory_db_session):
+        """Test rows PC no longer lists are deactivated and returning rows reactivated"""
+        self.add_people(memory_db_session, "pc_1", "pc_2", "pc_3", "pc_10")
+        self.add_people(memory_db_session, "pc_4", is_active=False, pc_missing_since=datetime(2026, 1, 1))
+        self.add_people(memory_db_session, "pc_5", is_active=False)  # deactivated by hand
+        memory_db_session.add(Course(title="Local only"))
+        memory_db_session.add(Course(title="Gone", planning_center_event_id="ev_1", data_source="api"))
+        memory_db_session.add(Course(title="Kept", planning_center_event_id="ev_2", data_source="api"))
+        memory_db_session.commit()
+
+        reconciler = PlanningCenterReconciler(memory_db_session, chunk_size=2)
+        people = reconciler.reconcile(People, "planning_center_id", ["pc_10", "pc_1", "pc_4", "pc_5"], updated_by=3)
+        courses = reconciler.reconcile(Course, "planning_center_event_id", ["ev_2"])
+
+        assert people == {"checked": 6, "deactivated": 2, "reactivated": 1}
+        assert courses == {"checked": 2, "deactivated": 1, "reactivated": 0}
+        memory_db_session.expire_all()
+        active = {person.planning_center_id: person for person in memory_db_session.query(People).all()}
+        assert {key for key, person in active.items() if person.is_active} == {"pc_1", "pc_10", "pc_4"}
+        assert active["pc_2"].pc_missing_since is not None
+        assert active["pc_2"].updated_by == 3
+        assert active["pc_4"].pc_missing_since is None
+        assert active["pc_5"].pc_missing_since is None
+        assert memory_db_session.query(Course).filter(Course.title == "Local only").one().is_active
+
+    def test_rows_not_from_pc_are_left_alone(self, memory_db_session):
+        """Test CSV-loaded and manually created rows are not diffed against PC"""
+        self.add_people(memory_db_session, "pc_1", "pc_2")
+        self.add_people(memory_db_session, "csv_jane_doe", data_source="csv")
+        self.add_people(memory_db_session, "manual_1", data_source=None)
+
+        result = PlanningCenterReconciler(memory_db_session).reconcile(People, "planning_center_id", ["pc_1", "pc_2"])
+
+        assert result == {"checked": 2, "deactivated": 0, "reactivated": 0}
+        assert memory_db_session.query(People).filter(People.is_active.is_(True)).count() == 4
+
+    def test_truncated_listing_is_not_applied(self, memory_db_session):
+        """Test a diff that would deactivate most rows is aborted without writing"""
+        self.add_people(memory_db_session, *[f"pc_{i}" for i in range(10)])
+
+        with pytest.raises(ReconciliationAborted):
+            PlanningCenterReconciler(memory_db_session).reconcile(People, "planning_center_id", ["pc_1", "pc_2"])
+
+        assert memory_db_session.query(People).filter(People.is_active.is_(True)).count() == 10
+
+    def test_set_based_statements(self, memory_engine, memory_db_session):
+        """Test the diff reads keys once and updates in chunks"""
+        self.add_people(memory_db_session, *[f"pc_{i:04d}" for i in range(1000)])
+        statements = []
+        event.listen(memory_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        result = PlanningCenterReconciler(memory_db_session, chunk_size=100).reconcile(
+            People, "planning_center_id", [f"pc_{i:04d}" for i in range(0, 1000, 2)]
+        )
+
+        assert result["deactivated"] == 500
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+        assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 5
+
+    def test_only_full_syncs_reconcile(self, pc_service, pc_api, memory_db_session):
+        """Test a full sync deactivates people PC dropped and an incremental one does not"""
+        self.add_people(memory_db_session, "pc_gone")
+        people = [make_pc_person(i, updated_at="2026-01-02T00:00:00Z") for i in range(3)]
+        pc_api["handler"] = lambda request: pc_people_response(request, people)
+
+        task_id = pc_service._create_sync_task("sync_people")
+        asyncio.run(pc_service._sync_people_background(task_id, mode="full"))
+
+        result = pc_service.get_sync_task_status(task_id)["result"]
+        assert result["records_deactivated"] == 1
+        assert result["reconciliation"]["checked"] == 4
+        memory_db_session.expire_all()
+        assert not memory_db_session.query(People).filter(People.planning_center_id == "pc_gone").one().is_active
+
+        people.pop()
+        task_id = pc_service._create_sync_task("sync_people")
+        asyncio.run(pc_service._sync_people_background(task_id, mode="incremental"))
+
+        result = pc_service.get_sync_task_status(task_id)["result"]
+        assert result["reconciliation"] is None
+        assert memory_db_session.query(People).filter(People.is_active.is_(True)).count() == 3
+
+
+class TestRegistrationsFanOut:
+    """Test the all-events registrations sync"""
+
+    def test_every_event_is_synced(self, pc_service, pc_api, memory_db_session):
+        """Test registrations from every event are cached and counted"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            parts = request.url.path.strip("/").split("/")
+            if parts[-1] == "events":
+                return httpx.Response(200, json={
+                    "data": [{"type": "Event", "id": f"evt_{i}", "attributes": {"name": f"Event {i}"}} for i in range(6)],
+                    "meta": {"total_count": 6}
+                })
+            event_id = parts[-2]
+            return httpx.Response(200, json={
+                "data": [
+                    {"type": "Registration", "id": f"{event_id}_reg_{i}", "attributes": {"status": "registered"},
+                     "relationships": {"event": {"data": {"type": "Event", "id": event_id}},
+                                       "person": {"data": {"type": "Person", "id": f"pc_{i}"}}}}
+                    for i in range(2)
+                ],
+                "meta": {"total_count": 2}
+            })
+        pc_api["handler"] = handler
+
+        task_id = pc_service._create_sync_task("sync_registrations")
+        asyncio.run(pc_service._sync_registrations_background(task_id))
+
+        result = pc_service.get_sync_task_status(task_id)["result"]
+        assert result["records_processed"] == 12
+        assert result["records_unresolved"] == 12
+        assert memory_db_session.query(PlanningCenterRegistrationsCache).count() == 12
+        assert memory_db_session.query(CourseEnrollment).count() == 0
+        assert len(pc_api["requests"]) == 7
+
+    def test_failed_event_holds_watermark_and_checkpoint(self, pc_service, pc_api, memory_db_session, monkeypatch):
+        """Test an event whose fetch failed is counted and is not checkpointed past"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            parts = request.url.path.strip("/").split("/")
+            if parts[-1] == "events":
+                return httpx.Response(200, json={
+                    "data": [{"type": "Event", "id": f"evt_{i}", "attributes": {"name": f"Event {i}"}} for i in range(4)],
+                    "meta": {"total_count": 4}
+                })
+            if parts[-2] == "evt_1":
+                return httpx.Response(400, json={"errors": [{"status": "400"}]})
+            return httpx.Response(200, json={
+                "data": [{"type": "Registration", "id": f"{parts[-2]}_reg",
+                          "attributes": {"status": "registered", "updated_at": "2026-01-02T00:00:00Z"},
+                          "relationships": {"event": {"data": {"type": "Event", "id": parts[-2]}},
+                                            "person": {"data": {"type": "Person", "id": "pc_1"}}}}],
+                "meta": {"total_count": 1}
+            })
+        pc_api["handler"] = handler
+        positions = []
+        checkpoint = PlanningCenterSyncRun.checkpoint
+
+        def record_checkpoint(run, db, **position):
+            checkpoint(run, db, **position)
+            positions.append(run.position.get("events_done"))
+
+        monkeypatch.setattr(PlanningCenterSyncRun, "checkpoint", record_checkpoint)
+        task_id = pc_service._create_sync_task("sync_registrations")
+        asyncio.run(pc_service._sync_registrations_background(task_id))
+
+        result = pc_service.get_sync_task_status(task_id)["result"]
+        assert result["records_failed"] == 1
+        assert positions == [1, 1, 1, 1]
+        assert pc_service.get_sync_watermark("registrations", db=memory_db_session) is None
+
+
+class TestLegacySync:
+    """Test the original request-scoped sync methods"""
+
+    @staticmethod
+    def failing_flush(service, db, bad_id: str):
+        """Wrap a service's sync_from_planning_center so one record fails inside a flush"""
+        original = service.sync_from_planning_center
+
+        def sync(data, **kwargs):
+            if data.get("id") == bad_id:
+                db.add(People(planning_center_id=None, first_name=None, last_name=None))
+                db.flush()
+            return original(data, **kwargs)
+        return sync
+
+    def test_failed_registration_does_not_fail_the_rest(self, pc_service, pc_api, memory_db_session, monkeypatch):
+        """Test a registration that fails in a flush is rolled back before the next one is written"""
+        memory_db_session.add_all([People(planning_center_id=f"pc_{i}", first_name="A", last_name="B") for i in range(3)])
+        memory_db_session.add(Course(title="Event 1", planning_center_event_id="evt_1"))
+        memory_db_session.commit()
+        pc_api["handler"] = lambda request: httpx.Response(200, json={
+            "data": [
+                {"type": "Registration", "id": f"reg_{i}", "attributes": {"status": "registered"},
+                 "relationships": {"event": {"data": {"type": "Event", "id": "evt_1"}},
+                                   "person": {"data": {"type": "Person", "id": f"pc_{i}"}}}}
+                for i in range(3)
+            ],
+            "meta": {"total_count": 3}
+        })
+        monkeypatch.setattr(pc_service.enrollment_service, "sync_from_planning_center",
+                            self.failing_flush(pc_service.enrollment_service, memory_db_session, "reg_0"))
+
+        result = asyncio.run(pc_service.sync_registrations(event_id="evt_1"))
+
+        assert result["status"] == "success"
+        assert result["records_processed"] == 3
+        assert result["records_failed"] == 1
+        assert result["records_successful"] == 2
+        assert result["errors"][0].startswith("Registration reg_0:")
+        assert memory_db_session.query(CourseEnrollment).count() == 2
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).one()
+        assert sync_log.records_failed == 1
+
+    def test_failed_event_does_not_fail_the_rest(self, pc_service, pc_api, memory_db_session, monkeypatch):
+        """Test an event that fails in a flush is rolled back before the next one is written"""
+        events = [{"type": "Event", "id": f"evt_{i}", "attributes": {"name": f"Event {i}"}} for i in range(3)]
+        pc_api["handler"] = lambda request: httpx.Response(200, json={"data": events, "meta": {"total_count": 3}})
+        monkeypatch.setattr(pc_service.course_service, "sync_from_planning_center",
+                            self.failing_flush(pc_service.course_service, memory_db_session, "evt_0"))
+
+        result = asyncio.run(pc_service.sync_events())
+
+        assert result["records_failed"] == 1
+        assert result["records_successful"] == 2
+        assert memory_db_session.query(Course).count() == 2
+
+
+class TestFingerprinting:
+    """Test unchanged records are skipped instead of rewritten"""
+
+    def test_unchanged_people_are_not_written(self, memory_engine, memory_db_session):
+        """Test a repeat batch writes nothing and only changed people are updated"""
+        service = PeopleService(memory_db_session)
+        people = [make_pc_person(i) for i in range(5)]
+        service.bulk_sync_from_planning_center(people)
+
+        statements = []
+        event.listen(memory_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        result = service.bulk_sync_from_planning_center(people)
+
+        assert result["unchanged"] == 5
+        assert result["inserted"] == result["updated"] == 0
+        assert not [s for s in statements if s.lstrip().upper().startswith(("INSERT", "UPDATE"))]
+
+        people[2]["last_name"] = "Changed"
+        result = service.bulk_sync_from_planning_center(people)
+
+        assert result["updated"] == 1
+        assert result["unchanged"] == 4
+        memory_db_session.expire_all()
+        assert service.get_person_by_pc_id("pc_2").last_name == "Changed"
+
+    def test_unchanged_events_are_counted(self, pc_service, pc_api, memory_db_session):
+        """Test a repeat events sync reports unchanged records in the sync log"""
+        events = [{"type": "Event", "id": f"evt_{i}", "attributes": {"name": f"Event {i}"}} for i in range(3)]
+        pc_api["handler"] = lambda request: httpx.Response(200, json={"data": events, "meta": {"total_count": 3}})
+
+        asyncio.run(pc_service._sync_events_background(pc_service._create_sync_task("sync_events"), mode="full"))
+        updated_at = {course.id: course.updated_at for course in memory_db_session.query(Course).all()}
+
+        events[0]["attributes"]["name"] = "Renamed"
+        task_id = pc_service._create_sync_task("sync_events")
+        asyncio.run(pc_service._sync_events_background(task_id, mode="full"))
+
+        result = pc_service.get_sync_task_status(task_id)["result"]
+        assert result["records_successful"] == 3
+        assert result["records_unchanged"] == 2
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).order_by(PlanningCenterSyncLog.id.desc()).first()
+        assert sync_log.records_unchanged == 2
+
+        memory_db_session.expire_all()
+        courses = {course.planning_center_event_id: course for course in memory_db_session.query(Course).all()}
+        assert courses["evt_0"].title == "Renamed"
+        assert courses["evt_1"].updated_at == updated_at[courses["evt_1"].id]
+
+    def test_reappearing_courses_are_reactivated(self, pc_service, pc_api, memory_db_session):
+        """Test an unchanged course the sync deactivated is reactivated when PC lists it again"""
+        events = [{"type": "Event", "id": f"evt_{i}", "attributes": {"name": f"Event {i}"}} for i in range(2)]
+        pc_api["handler"] = lambda request: httpx.Response(200, json={"data": events, "meta": {"total_count": 2}})
+        asyncio.run(pc_service._sync_events_background(pc_service._create_sync_task("sync_events"), mode="full"))
+
+        courses = {course.planning_center_event_id: course for course in memory_db_session.query(Course).all()}
+        courses["evt_0"].is_active = False
+        courses["evt_0"].pc_missing_since = datetime(2026, 1, 1)  # e.g. a .destroyed webhook
+        courses["evt_1"].is_active = False  # deactivated by hand
+        memory_db_session.commit()
+
+        task_id = pc_service._create_sync_task("sync_events")
+        asyncio.run(pc_service._sync_events_background(task_id, mode="incremental"))
+
+        assert pc_service.get_sync_task_status(task_id)["result"]["records_unchanged"] == 1
+        memory_db_session.expire_all()
+        courses = {course.planning_center_event_id: course for course in memory_db_session.query(Course).all()}
+        assert courses["evt_0"].is_active
+        assert courses["evt_0"].pc_missing_since is None
+        assert not courses["evt_1"].is_active
+
+    def test_unresolved_registrations_are_retried(self, pc_service, pc_api, memory_db_session):
+        """Test registrations without an enrollment are never skipped as unchanged"""
+        pc_api["handler"] = lambda request: httpx.Response(200, json={
+            "data": [
+                {"type": "Registration", "id": f"reg_{i}", "attributes": {"status": "registered"},
+                 "relationships": {"event": {"data": {"type": "Event", "id": "evt_1"}},
+                                   "person": {"data": {"type": "Person", "id": f"pc_{i}"}}}}
+                for i in range(2)
+            ],
+            "meta": {"total_count": 2}
+        })
+
+        def sync():
+            task_id = pc_service._create_sync_task("sync_registrations")
+            asyncio.run(pc_service._sync_registrations_background(task_id, event_id="evt_1"))
+            return pc_service.get_sync_task_status(task_id)["result"]
+
+        assert sync()["records_unresolved"] == 2
+        assert sync()["records_unchanged"] == 0
+
+        memory_db_session.add_all([People(planning_center_id=f"pc_{i}", first_name="A", last_name="B") for i in range(2)])
+        memory_db_session.add(Course(title="Event 1", planning_center_event_id="evt_1"))
+        memory_db_session.commit()
+
+        result = sync()
+        assert result["records_unresolved"] == 0
+        assert result["records_unchanged"] == 0
+        assert memory_db_session.query(CourseEnrollment).count() == 2
+        assert sync()["records_unchanged"] == 2
+
+
+class TestIdResolution:
+    """Test PC id resolution for registration -> enrollment sync"""
+
+    def seed(self, db):
+        people = [People(planning_center_id=f"pc_{i}", first_name="P", last_name=str(i)) for i in range(3)]
+        courses = [Course(title=f"Course {i}", planning_center_event_id=f"evt_{i}") for i in range(2)]
+        db.add_all(people + courses)
+        db.commit()
+        return people, courses
+
+    def test_lookups_after_load_issue_no_queries(self, memory_engine, memory_db_session):
+        """Test the index loads with two queries and resolves from memory"""
+        people, courses = self.seed(memory_db_session)
+        person_id, course_id = people[2].id, courses[1].id
+        statements = []
+        event.listen(memory_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        index = PlanningCenterIdIndex.load(memory_db_session)
+        assert len(statements) == 2
+
+        assert index.person_id("pc_2") == person_id
+        assert index.course_id("evt_1") == course_id
+        assert index.person_id(None) is None
+        assert len(statements) == 2
+
+        # Unknown ids are looked up once, then cached
+        assert index.person_id("pc_missing") is None
+        assert index.person_id("pc_missing") is None
+        assert len(statements) == 3
+
+    def test_enrollments_point_at_local_rows(self, memory_db_session):
+        """Test enrollments get real people/course ids and unresolved ones are skipped"""
+        from app.services.enrollment_service import CourseEnrollmentService
+
+        people, courses = self.seed(memory_db_session)
+        index = PlanningCenterIdIndex.load(memory_db_session)
+        service = CourseEnrollmentService(memory_db_session)
+
+        enrollment = service.sync_from_planning_center(
+            {"id": "reg_1", "person_id": "pc_1", "event_id": "evt_0", "status": "registered"}, id_index=index
+        )
+        skipped = service.sync_from_planning_center(
+            {"id": "reg_2", "person_id": "pc_unknown", "event_id": "evt_0", "status": "registered"}, id_index=index
+        )
+        again = service.sync_from_planning_center(
+            {"id": "reg_1", "person_id": "pc_1", "event_id": "evt_0", "status": "cancelled"}, id_index=index
+        )
+
+        assert enrollment.people_id == people[1].id
+        assert enrollment.course_id == courses[0].id
+        assert enrollment.planning_center_registration_id == "reg_1"
+        assert skipped is None
+        assert again.id == enrollment.id
+        assert again.registration_status == "cancelled"
+        assert memory_db_session.query(CourseEnrollment).count() == 1
+
+
+class TestWebhookProcessing:
+    """Test batched, targeted webhook processing"""
+
+    @pytest.fixture
+    def processor(self, pc_service, memory_engine):
+        return webhook_module.PlanningCenterWebhookProcessor(
+            session_factory=sessionmaker(autocommit=False, autoflush=False, bind=memory_engine),
+            debounce_seconds=60,
+            batch_size=4
+        )
+
+    def test_burst_is_coalesced_per_record(self, pc_service, pc_api, processor, memory_db_session):
+        """Test repeated webhooks for one person cause a single targeted fetch per batch"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            pc_id = request.url.path.rsplit("/", 1)[-1]
+            person = make_pc_person(int(pc_id.split("_")[1]))
+            return httpx.Response(200, json={
+                "data": {"type": "Person", "id": pc_id, "attributes": {k: v for k, v in person.items() if k != "id"}}
+            })
+        pc_api["handler"] = handler
+
+        for _ in range(3):
+            webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.updated", "id": "pc_1"})
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.created", "id": "pc_2"})
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "campus.updated", "id": "c_1"})
+
+        # Still inside the debounce window
+        assert asyncio.run(processor.drain()) == 0
+        assert asyncio.run(processor.drain(force=True)) == 5
+
+        paths = sorted(request.url.path for request in pc_api["requests"])
+        assert paths == ["/people/v2/people/pc_1", "/people/v2/people/pc_2"]
+        assert memory_db_session.query(People).count() == 2
+        memory_db_session.expire_all()
+        webhooks = memory_db_session.query(PlanningCenterWebhookEvents).all()
+        assert len(webhooks) == 5
+        assert all(webhook.processed and webhook.error_message is None for webhook in webhooks)
+        assert all(webhook.claim_token is None for webhook in webhooks)
+
+    def test_claimed_rows_are_not_shared(self, processor, memory_db_session):
+        """Test a second claim skips rows another processor holds"""
+        for index in range(6):
+            webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.updated", "id": f"pc_{index}"})
+
+        first = processor.claim_batch(memory_db_session, force=True)
+        second = processor.claim_batch(memory_db_session, force=True)
+
+        assert len(first) == 4
+        assert len(second) == 2
+        assert not {row.id for row in first} & {row.id for row in second}
+
+    def test_deleted_records_are_deactivated(self, pc_service, pc_api, processor, memory_db_session):
+        """Test .destroyed webhooks and 404 fetches deactivate the local rows instead of failing"""
+        person = People(planning_center_id="pc_1", first_name="A", last_name="B")
+        course = Course(title="Event 1", planning_center_event_id="evt_1")
+        memory_db_session.add_all([person, course])
+        memory_db_session.commit()
+        memory_db_session.add(CourseEnrollment(people_id=person.id, course_id=course.id,
+                                               planning_center_registration_id="reg_1", registration_status="registered"))
+        memory_db_session.commit()
+        pc_api["handler"] = lambda request: httpx.Response(404, json={"errors": [{"status": "404"}]})
+
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.updated", "id": "pc_1"})
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.destroyed", "id": "pc_1"})
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "registration.destroyed", "id": "reg_1"})
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "event.updated", "id": "evt_1"})
+
+        asyncio.run(processor.drain(force=True))
+
+        assert [request.url.path for request in pc_api["requests"]] == ["/events/v2/events/evt_1"]
+        memory_db_session.expire_all()
+        person = memory_db_session.query(People).one()
+        assert not person.is_active
+        assert person.pc_missing_since is not None
+        assert not memory_db_session.query(Course).one().is_active
+        assert memory_db_session.query(CourseEnrollment).one().registration_status == "cancelled"
+        webhooks = memory_db_session.query(PlanningCenterWebhookEvents).all()
+        assert all(webhook.processed and webhook.error_message is None for webhook in webhooks)
+
+    def test_registration_without_event_is_recorded(self, pc_service, pc_api, processor, memory_db_session):
+        """Test a registration webhook that cannot be fetched is marked with an error"""
+        pc_service.process_webhook_event({"event_type": "registration.updated", "id": "reg_1"})
+
+        asyncio.run(processor.drain(force=True))
+
+        memory_db_session.expire_all()
+        webhook = memory_db_session.query(PlanningCenterWebhookEvents).one()
+        assert webhook.processed
+        assert "event_id" in webhook.error_message
+        assert pc_api["requests"] == []
+
+    def test_failed_fetch_is_retried(self, pc_service, pc_api, processor, memory_db_session, monkeypatch):
+        """Test a failed fetch releases the webhook for the next batch until its attempts run out"""
+        monkeypatch.setattr(settings, "PLANNING_CENTER_MAX_RETRIES", 0)
+        monkeypatch.setattr(settings, "PLANNING_CENTER_WEBHOOK_MAX_ATTEMPTS", 3)
+        pc_api["handler"] = lambda request: httpx.Response(503)
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.updated", "id": "pc_1"})
+
+        assert asyncio.run(processor.process_batch(force=True)) == (1, 1)
+
+        memory_db_session.expire_all()
+        webhook = memory_db_session.query(PlanningCenterWebhookEvents).one()
+        assert not webhook.processed
+        assert webhook.attempts == 1
+        assert webhook.claim_token is None and webhook.claimed_at is None
+        assert webhook.error_message
+
+        person = make_pc_person(1)
+        pc_api["handler"] = lambda request: httpx.Response(200, json={
+            "data": {"type": "Person", "id": "pc_1", "attributes": {k: v for k, v in person.items() if k != "id"}}
+        })
+        assert asyncio.run(processor.process_batch(force=True)) == (1, 0)
+
+        memory_db_session.expire_all()
+        webhook = memory_db_session.query(PlanningCenterWebhookEvents).one()
+        assert webhook.processed and webhook.error_message is None
+        assert memory_db_session.query(People).filter(People.planning_center_id == "pc_1").count() == 1
+
+        pc_api["handler"] = lambda request: httpx.Response(503)
+        webhook_module.enqueue_webhook_event(memory_db_session, {"event_type": "person.updated", "id": "pc_2"})
+        for _ in range(3):
+            asyncio.run(processor.drain(force=True))
+
+        memory_db_session.expire_all()
+        webhook = memory_db_session.query(PlanningCenterWebhookEvents).filter(
+            PlanningCenterWebhookEvents.planning_center_id == "pc_2"
+        ).one()
+        assert webhook.processed
+        assert webhook.attempts == 3
+        assert webhook.error_message
@@ -0,0 +1,153 @@
+"""
+Tests for connection pool telemetry and the saturation fast-fail
+"""
+
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, exc as sqlalchemy_exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.database import get_pool_timeout
+from app.core.pool_metrics import Histogram, PoolMetrics, PoolSaturated, instrument_pool
+from main import app as main_app, pool_timeout_handler
+
+
+@pytest.fixture
+def metered_engine(tmp_path):
+    """A one-connection queue pool reporting to fresh metrics"""
+    metrics = PoolMetrics("test")
+    config = instrument_pool({"poolclass": QueuePool, "pool_size": 1, "max_overflow": 0,
+                              "pool_timeout": 0.05, "pool_pre_ping": True}, metrics)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **config)
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+class TestHistogram:
+    """Test bucket counting"""
+
+    def test_observations_land_in_upper_bound_buckets(self):
+        """Test durations count toward the first bucket bound they do not exceed"""
+        histogram = Histogram((1, 10))
+        for seconds in (0.0005, 0.001, 0.004, 0.5):
+            histogram.observe(seconds)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"le_1ms": 2, "le_10ms": 1, "inf": 1}
+        assert snapshot["count"] == 4
+        assert snapshot["max_ms"] == 500.0
+
+
+class TestPoolMetrics:
+    """Test the pool counters and histograms"""
+
+    def test_checkouts_are_counted_and_timed(self, metered_engine):
+        """Test in-use count, wait and checkout duration follow connections in and out"""
+        engine, metrics = metered_engine
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            during = metrics.snapshot(engine.pool)
+        after = metrics.snapshot(engine.pool)
+
+        assert during["in_use"] == 1
+        assert during["checked_out"] == 1
+        assert during["size"] == 1
+        assert after["in_use"] == 0
+        assert after["checked_out"] == 0
+        assert after["connects"] == 1
+        assert after["wait"]["count"] == 1
+        assert after["checkout_duration"]["count"] == 1
+        assert after["pool_class"] == "InstrumentedQueuePool"
+
+    def test_failed_pre_ping_is_counted(self, metered_engine):
+        """Test a dead pooled connection is reported as a pre-ping failure and replaced"""
+        engine, metrics = metered_engine
+        with engine.connect() as conn:
+            dbapi_connection = conn.connection.dbapi_connection
+        dbapi_connection.close()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["pre_ping_failures"] == 1
+        assert snapshot["connects"] == 2
+        assert snapshot["in_use"] == 0
+
+    def test_metrics_survive_dispose(self, metered_engine):
+        """Test the pool recreated by dispose() still reports waits"""
+        engine, metrics = metered_engine
+        engine.dispose()
+        with engine.connect():
+            pass
+
+        assert metrics.snapshot()["wait"]["count"] == 1
+
+
+class TestPoolSaturation:
+    """Test exhausted pools fail fast"""
+
+    def test_fast_fail_raises_pool_saturated(self, metered_engine, monkeypatch):
+        """Test a checkout that waits past the threshold raises PoolSaturated"""
+        monkeypatch.setattr(settings, "DATABASE_POOL_FAST_FAIL_MS", 50)
+        engine, metrics = metered_engine
+
+        with engine.connect():
+            with pytest.raises(PoolSaturated):
+                engine.connect()
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["timeouts"] == 1
+        assert snapshot["last_timeout_at"] is not None
+        assert snapshot["wait"]["count"] == 2
+        assert snapshot["wait"]["max_ms"] >= 50
+
+    def test_fast_fail_caps_pool_timeout(self, monkeypatch):
+        """Test DATABASE_POOL_FAST_FAIL_MS shortens the configured pool timeout"""
+        monkeypatch.setattr(settings, "DATABASE_POOL_TIMEOUT", 30)
+        monkeypatch.setattr(settings, "DATABASE_POOL_FAST_FAIL_MS", 250)
+        assert get_pool_timeout() == 0.25
+        monkeypatch.setattr(settings, "DATABASE_POOL_FAST_FAIL_MS", 0)
+        assert get_pool_timeout() == 30
+
+    def test_pool_timeouts_become_503_with_retry_after(self, metered_engine, monkeypatch):
+        """Test the API answers pool exhaustion with 503 and Retry-After"""
+        monkeypatch.setattr(settings, "DATABASE_POOL_FAST_FAIL_MS", 50)
+        monkeypatch.setattr(settings, "DATABASE_POOL_RETRY_AFTER", 3)
+        engine, _ = metered_engine
+        app = FastAPI()
+        app.add_exception_handler(sqlalchemy_exc.TimeoutError, pool_timeout_handler)
+
+        @app.get("/busy")
+        def busy():
+            with engine.connect() as conn:
+                return {"value": conn.execute(text("SELECT 1")).scalar()}
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+                return await client.get("/busy")
+
+        with engine.connect():
+            response = asyncio.run(run())
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert asyncio.run(run()).json() == {"value": 1}
+
+
+class TestHealthPoolMetrics:
+    """Test /health reports the pools"""
+
+    def test_health_includes_both_pools(self):
+        """Test the health check carries sync and async pool metrics"""
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main_app), base_url="http://testserver") as client:
+                return await client.get("/health")
+
+        pools = asyncio.run(run()).json()["checks"]["database_pool"]
+
+        assert set(pools) == {"sync", "async"}
+        assert {"in_use", "pre_ping_failures", "timeouts", "wait", "checkout_duration"} <= set(pools["sync"])
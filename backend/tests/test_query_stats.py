@@ -0,0 +1,151 @@
+"""
+Tests for per-request SQL statistics and repeated-statement detection
+"""
+
+import asyncio
+import httpx
+import logging
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.core.database as database
+from app.core.config import settings
+from app.core.query_stats import RepeatedQueryError, RequestQueryStats, statement_fingerprint
+from main import log_requests
+
+
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", database.start_statement_timer)
+    event.listen(engine, "after_cursor_execute", database.record_statement)
+
+
+@pytest.fixture
+def instrumented_app(tmp_path):
+    """An app with the request logging middleware, one sync and one async route"""
+    sync_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    instrument(sync_engine)
+    instrument(async_engine.sync_engine)
+
+    app = FastAPI()
+    app.middleware("http")(log_requests)
+
+    @app.get("/sync/{repeats}")
+    def sync_route(repeats: int):
+        with sync_engine.connect() as conn:
+            for value in range(repeats):
+                conn.execute(text("SELECT :value"), {"value": value})
+        return {}
+
+    @app.get("/async")
+    async def async_route():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {}
+
+    yield app
+    sync_engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def get(app, path):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get(path)
+    return asyncio.run(run())
+
+
+class TestStatementFingerprint:
+    """Test statement shapes"""
+
+    def test_literals_and_in_lists_are_collapsed(self):
+        """Test statements differing only in literals or IN list length share a fingerprint"""
+        assert statement_fingerprint("SELECT * FROM people WHERE id = 5 AND name = 'O''Brien'") == \
+            statement_fingerprint("SELECT * FROM people\n  WHERE id = 12 AND name = 'Ada'")
+        assert statement_fingerprint("SELECT id FROM courses WHERE id IN (?, ?, ?)") == \
+            statement_fingerprint("SELECT id FROM courses WHERE id IN (?)") == \
+            "SELECT id FROM courses WHERE id IN (...)"
+        assert statement_fingerprint("SELECT id FROM courses WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == \
+            "SELECT id FROM courses WHERE id IN (...)"
+        assert statement_fingerprint("SELECT * FROM people WHERE id IN (SELECT person_id FROM enrollments)") == \
+            "SELECT * FROM people WHERE id IN (SELECT person_id FROM enrollments)"
+
+
+class TestRequestQueryStats:
+    """Test counting and the repeat threshold"""
+
+    def test_repeats_over_threshold_are_logged_once(self, caplog):
+        """Test a shape over the threshold is logged once in log mode"""
+        stats = RequestQueryStats(repeat_threshold=2, repeat_action="log")
+        with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+            for person_id in range(5):
+                stats.record(f"SELECT * FROM people WHERE id = {person_id}", 0.001)
+            stats.record("SELECT * FROM courses", 0.002)
+
+        assert stats.count == 6
+        assert stats.repeated() == [("SELECT * FROM people WHERE id = ?", 5)]
+        assert len(caplog.records) == 1
+        assert "more than 2 times" in caplog.records[0].getMessage()
+        assert stats.server_timing() == 'db;dur=7.0;desc="6 queries"'
+
+    def test_raise_mode_fails_on_first_excess_repeat(self):
+        """Test raise mode raises RepeatedQueryError once the threshold is passed"""
+        stats = RequestQueryStats(repeat_threshold=2, repeat_action="raise")
+        stats.record("SELECT 1", 0)
+        stats.record("SELECT 2", 0)
+        with pytest.raises(RepeatedQueryError):
+            stats.record("SELECT 3", 0)
+
+    def test_threshold_zero_never_flags(self):
+        """Test a zero threshold turns detection off"""
+        stats = RequestQueryStats(repeat_threshold=0, repeat_action="raise")
+        for value in range(50):
+            stats.record(f"SELECT {value}", 0)
+        assert stats.repeated() == [("SELECT ?", 50)]
+
+
+class TestRequestInstrumentation:
+    """Test the middleware reports each request's statements"""
+
+    def test_sync_route_statements_reach_server_timing(self, instrumented_app, caplog):
+        """Test statements run in the threadpool are counted for their request"""
+        with caplog.at_level(logging.INFO, logger="main"):
+            response = get(instrumented_app, "/sync/4")
+
+        assert response.status_code == 200
+        assert 'desc="4 queries"' in response.headers["Server-Timing"]
+        assert "total;dur=" in response.headers["Server-Timing"]
+        assert any("4 queries" in record.getMessage() and "max repeat 4x" in record.getMessage()
+                   for record in caplog.records)
+
+    def test_async_route_statements_reach_server_timing(self, instrumented_app):
+        """Test statements run on the async engine are counted for their request"""
+        response = get(instrumented_app, "/async")
+
+        assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+    def test_requests_are_counted_separately(self, instrumented_app):
+        """Test each request starts from zero"""
+        get(instrumented_app, "/sync/3")
+        response = get(instrumented_app, "/sync/1")
+
+        assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+    def test_strict_mode_fails_the_request(self, instrumented_app, monkeypatch):
+        """Test raise mode stops a request that repeats a statement too often"""
+        monkeypatch.setattr(settings, "SQL_REPEAT_THRESHOLD", 3)
+        monkeypatch.setattr(settings, "SQL_REPEAT_ACTION", "raise")
+
+        assert get(instrumented_app, "/sync/3").status_code == 200
+        with pytest.raises(RepeatedQueryError):
+            get(instrumented_app, "/sync/4")
+
+    def test_disabled_instrumentation_sends_no_header(self, instrumented_app, monkeypatch):
+        """Test SQL_INSTRUMENTATION_ENABLED=false leaves responses alone"""
+        monkeypatch.setattr(settings, "SQL_INSTRUMENTATION_ENABLED", False)
+
+        assert "Server-Timing" not in get(instrumented_app, "/sync/2").headers
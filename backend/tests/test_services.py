@@ -671,7 +671,7 @@ class TestPlanningCenterSyncService:
         events_tasks = service.list_sync_tasks("sync_events")
         assert len(events_tasks) == 1
     
-    @patch('app.services.planning_center_sync_service.httpx.AsyncClient')
+    @patch('app.core.planning_center_client.httpx.AsyncClient')
     def test_start_sync_people(self, mock_client, db_session):
         """Test starting people sync"""
         # Mock the HTTP response
@@ -701,7 +701,7 @@ class TestPlanningCenterSyncService:
         assert task_status["task_type"] == "sync_people"
         assert task_status["status"] == "pending"
     
-    @patch('app.services.planning_center_sync_service.httpx.AsyncClient')
+    @patch('app.core.planning_center_client.httpx.AsyncClient')
     def test_start_sync_events(self, mock_client, db_session):
         """Test starting events sync"""
         # Mock the HTTP response
@@ -0,0 +1,177 @@
+"""
+Tests for the slow-query log
+"""
+
+import asyncio
+import httpx
+import pytest
+from datetime import date, datetime
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.api.v1.endpoints.diagnostics as diagnostics
+import app.core.database as database
+from app.api.v1.endpoints.auth import get_current_admin_user
+from app.core.database import Base
+from app.core.slow_query_log import SlowQueryLog, redact_parameters
+from app.models.member import People
+from app.services.audit_service import AuditService
+from app.services.people_service import AsyncPeopleService, PeopleService
+from main import app
+
+
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", database.start_statement_timer)
+    event.listen(engine, "after_cursor_execute", database.record_statement)
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    """A log that records every statement"""
+    log = SlowQueryLog(threshold_ms=1e-9, capacity=5)
+    monkeypatch.setattr(database, "slow_query_log", log)
+    monkeypatch.setattr(diagnostics, "slow_query_log", log)
+    return log
+
+
+class TestRedaction:
+    """Test parameter redaction"""
+
+    def test_strings_are_replaced_by_type_and_length(self):
+        """Test strings are hidden while numbers, dates and None are kept"""
+        assert redact_parameters(("%ada@example.com%", 42, None, date(2026, 1, 5))) == \
+            ["<str:17>", 42, None, "2026-01-05"]
+        assert redact_parameters({"email_1": "ada@example.com", "limit": 10, "flag": True}) == \
+            {"email_1": "<str:15>", "limit": 10, "flag": True}
+        assert redact_parameters([b"\x00\x01", datetime(2026, 1, 5, 9, 30)]) == ["<bytes:2>", "2026-01-05T09:30:00"]
+
+
+class TestSlowQueryLog:
+    """Test what the slow-query log captures"""
+
+    def test_date_filter_is_captured_with_full_scan_plan(self, memory_engine, memory_db_session, slow_log):
+        """Test a func.date() filter on audit_log is recorded with its call site and table scan"""
+        instrument(memory_engine)
+        AuditService(memory_db_session).get_audit_logs(start_date=date(2026, 1, 1))
+
+        entry = next(entry for entry in slow_log.entries() if "FROM audit_log" in entry["fingerprint"])
+        assert entry["call_site"].startswith("app/services/audit_service.py:")
+        assert entry["call_site"].endswith("in get_audit_logs")
+        assert entry["parameters"][0] == "<str:10>"
+        assert entry["full_scan"] is True
+        assert any("audit_log" in line for line in entry["plan"])
+
+    def test_substring_search_is_captured_with_full_scan_plan(self, memory_engine, memory_db_session, slow_log):
+        """Test an ilike('%...%') search is recorded as a full scan"""
+        instrument(memory_engine)
+        PeopleService(memory_db_session).search_people("ada")
+
+        entry = slow_log.entries()[0]
+        assert "FROM people" in entry["fingerprint"]
+        assert entry["call_site"].endswith("in search_people")
+        assert "<str:5>" in entry["parameters"]
+        assert entry["full_scan"] is True
+
+    def test_inlined_literals_are_not_stored(self, memory_engine, slow_log):
+        """Test literals written into the SQL text are stripped like parameters are redacted"""
+        instrument(memory_engine)
+        with memory_engine.connect() as conn:
+            conn.execute(text("SELECT 'ada@example.com' AS email, 42 AS answer"))
+
+        entry = slow_log.entries()[0]
+        assert "statement" not in entry
+        assert "ada@example.com" not in str(entry)
+        assert entry["fingerprint"] == "SELECT ? AS email, ? AS answer"
+
+    def test_buffer_is_bounded_and_newest_first(self, memory_engine, slow_log):
+        """Test only the newest entries are kept"""
+        instrument(memory_engine)
+        with memory_engine.connect() as conn:
+            for value in range(8):
+                conn.execute(text("SELECT :value"), {"value": value})
+
+        entries = slow_log.entries()
+        assert len(entries) == 5
+        assert [entry["parameters"] for entry in entries] == [[7], [6], [5], [4], [3]]
+        assert slow_log.stats()["recorded"] == 8
+
+    def test_statements_under_threshold_are_ignored(self, memory_engine, monkeypatch):
+        """Test fast statements and a zero threshold record nothing"""
+        instrument(memory_engine)
+        for threshold_ms in (60_000, 0):
+            log = SlowQueryLog(threshold_ms=threshold_ms, capacity=5)
+            monkeypatch.setattr(database, "slow_query_log", log)
+            with memory_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            assert log.entries() == []
+
+    def test_failed_explain_is_reported_not_raised(self, memory_engine, slow_log):
+        """Test a statement EXPLAIN rejects is recorded with the error instead of raising"""
+        with memory_engine.connect() as conn:
+            slow_log.observe(conn, "SELECT * FROM no_such_table WHERE id = ?", (1,), 0.5)
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        entry = slow_log.entries()[0]
+        assert entry["plan"] is None
+        assert "no_such_table" in entry["explain_error"]
+        assert entry["duration_ms"] == 500.0
+
+    def test_async_statements_are_traced_to_their_coroutine(self, tmp_path, slow_log):
+        """Test statements run through an AsyncSession resolve the awaiting service method"""
+        async def run():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}")
+            instrument(engine.sync_engine)
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+                    db.add(People(planning_center_id="pc-1", first_name="Ada", last_name="Lovelace"))
+                    await db.commit()
+                    return await AsyncPeopleService(db).search_people("ada")
+            finally:
+                await engine.dispose()
+
+        people = asyncio.run(run())
+
+        assert [person.first_name for person in people] == ["Ada"]
+        entry = slow_log.entries()[0]
+        assert entry["call_site"].startswith("app/services/people_service.py:")
+        assert entry["full_scan"] is True
+
+
+class TestSlowQueryEndpoint:
+    """Test the admin diagnostics endpoint"""
+
+    def test_admin_sees_newest_entries(self, memory_engine, slow_log):
+        """Test GET /diagnostics/slow-queries returns the buffer, newest first"""
+        instrument(memory_engine)
+        with memory_engine.connect() as conn:
+            conn.execute(text("SELECT :value"), {"value": 1})
+            conn.execute(text("SELECT :value"), {"value": 2})
+
+        async def run():
+            app.dependency_overrides[get_current_admin_user] = lambda: {"role": "admin", "is_active": True}
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+                    listed = await client.get("/api/v1/diagnostics/slow-queries", params={"limit": 1})
+                    cleared = await client.delete("/api/v1/diagnostics/slow-queries")
+                    return listed, cleared
+            finally:
+                app.dependency_overrides.pop(get_current_admin_user, None)
+
+        listed, cleared = asyncio.run(run())
+
+        assert listed.status_code == 200
+        body = listed.json()
+        assert body["recorded"] == 2
+        assert [entry["parameters"] for entry in body["entries"]] == [[2]]
+        assert cleared.status_code == 200
+        assert slow_log.entries() == []
+
+    def test_endpoint_requires_authentication(self):
+        """Test the endpoint is not public"""
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+                return await client.get("/api/v1/diagnostics/slow-queries")
+
+        assert asyncio.run(run()).status_code == 401
@@ -0,0 +1,185 @@
+"""
+Tests for SQLite production mode: single writer, read-only pool, routing sessions
+"""
+
+import threading
+import pytest
+from sqlalchemy import create_engine, event, exc, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, set_sqlite_pragma
+from app.core.sqlite_production import (
+    SQLiteMaintenance, SQLiteRoutingSession, is_sqlite_production_mode, set_sqlite_read_only,
+    sqlite_reader_config, sqlite_writer_config
+)
+from app.models.member import People
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Writer and read-only engines on one database file, set up like SQLITE_PRODUCTION_MODE does"""
+    url = f"sqlite:///{tmp_path / 'production.db'}"
+    writer = create_engine(url, **sqlite_writer_config(pool_timeout=10))
+    reader = create_engine(url, **sqlite_reader_config())
+    event.listen(writer, "connect", set_sqlite_pragma)
+    event.listen(reader, "connect", set_sqlite_pragma)
+    event.listen(reader, "connect", set_sqlite_read_only)
+    Base.metadata.create_all(bind=writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+@pytest.fixture
+def session_factory(engines):
+    writer, reader = engines
+    return sessionmaker(class_=SQLiteRoutingSession, writer=writer, reader=reader, autocommit=False, autoflush=False)
+
+
+def person(number: int) -> People:
+    return People(planning_center_id=f"pc-{number}", first_name="Test", last_name=f"Person {number}")
+
+
+class TestProductionModeSwitch:
+    """Test when the mode applies"""
+
+    @pytest.mark.parametrize("url, enabled", [
+        ("sqlite:///./data/church_course_tracker.db", True),
+        ("sqlite:////var/lib/app/app.db", True),
+        ("sqlite://", False),
+        ("sqlite:///:memory:", False),
+        ("postgresql://u:p@db/app", False),
+    ])
+    def test_only_file_backed_sqlite_qualifies(self, monkeypatch, url, enabled):
+        """Test the mode needs SQLITE_PRODUCTION_MODE and a shared database file"""
+        monkeypatch.setattr(settings, "SQLITE_PRODUCTION_MODE", True)
+        assert is_sqlite_production_mode(url) is enabled
+        monkeypatch.setattr(settings, "SQLITE_PRODUCTION_MODE", False)
+        assert is_sqlite_production_mode(url) is False
+
+
+class TestConnections:
+    """Test the writer and reader connection setup"""
+
+    def test_tuning_pragmas_are_applied(self, engines):
+        """Test busy_timeout, mmap_size and wal_autocheckpoint come from settings"""
+        writer, _ = engines
+        with writer.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert conn.execute(text("PRAGMA mmap_size")).scalar() == settings.SQLITE_MMAP_SIZE
+            assert conn.execute(text("PRAGMA wal_autocheckpoint")).scalar() == settings.SQLITE_WAL_AUTOCHECKPOINT
+
+    def test_reader_connections_refuse_writes(self, engines):
+        """Test a write that reaches a reader fails instead of taking the write lock"""
+        _, reader = engines
+        with reader.connect() as conn:
+            assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+            with pytest.raises(exc.OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO people (planning_center_id, first_name, last_name, is_active)"
+                                  " VALUES ('x', 'a', 'b', 1)"))
+
+    def test_writer_pool_holds_one_connection(self, engines):
+        """Test the writer pool never hands out a second connection"""
+        writer, reader = engines
+        assert writer.pool.size() == 1
+        assert writer.pool._max_overflow == 0
+        assert reader.pool.size() == settings.SQLITE_READ_POOL_SIZE
+
+
+class TestRoutingSession:
+    """Test statements are routed between the writer and the read pool"""
+
+    def test_reads_use_the_read_pool_until_the_first_write(self, session_factory, engines):
+        """Test SELECTs go to the reader, and everything after a write goes to the writer until commit"""
+        writer, reader = engines
+        session = session_factory()
+        try:
+            assert session.get_bind(clause=select(People)) is reader
+            assert session.get_bind(clause=text("SELECT 1")) is reader
+            assert session.get_bind(clause=text("UPDATE people SET is_active = 1")) is writer
+
+            session.rollback()
+            session.add(person(1))
+            session.flush()
+            assert session.get_bind(clause=select(People)) is writer
+            # Reads inside the writing transaction see its own uncommitted rows
+            assert session.scalar(select(func.count()).select_from(People)) == 1
+
+            session.commit()
+            assert session.get_bind(clause=select(People)) is reader
+            assert session.scalar(select(func.count()).select_from(People)) == 1
+        finally:
+            session.close()
+
+    def test_orm_round_trip(self, session_factory):
+        """Test add, commit, refresh and update work through the routed session"""
+        session = session_factory()
+        try:
+            session.add(person(1))
+            session.commit()
+            stored = session.scalars(select(People)).one()
+            stored.first_name = "Renamed"
+            session.commit()
+            session.expire_all()
+            assert session.scalars(select(People.first_name)).one() == "Renamed"
+        finally:
+            session.close()
+
+    def test_concurrent_writers_are_serialized(self, session_factory, engines):
+        """Test writer threads queue for the single connection instead of hitting "database is locked" """
+        writer, _ = engines
+        errors = []
+        busiest = []
+
+        def write(worker: int):
+            for number in range(25):
+                session = session_factory()
+                try:
+                    session.add(person(worker * 100 + number))
+                    session.commit()
+                    busiest.append(writer.pool.checkedout())
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    session.close()
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert max(busiest) <= 1
+        with writer.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(People)).scalar() == 200
+
+
+class TestSQLiteMaintenance:
+    """Test periodic PRAGMA optimize"""
+
+    def test_optimize_runs_periodically_and_on_stop(self, engines):
+        """Test the maintenance thread optimizes on its interval and once more when stopped"""
+        writer, _ = engines
+        maintenance = SQLiteMaintenance(writer, interval=0.01)
+        maintenance.start()
+        assert maintenance.is_running
+        for _ in range(200):
+            if maintenance.runs:
+                break
+            threading.Event().wait(0.01)
+        runs = maintenance.runs
+        maintenance.stop()
+
+        assert runs >= 1
+        assert maintenance.runs > runs
+        assert not maintenance.is_running
+
+    def test_zero_interval_disables_thread(self, engines):
+        """Test SQLITE_OPTIMIZE_INTERVAL=0 never starts the thread"""
+        writer, _ = engines
+        maintenance = SQLiteMaintenance(writer, interval=0)
+        maintenance.start()
+        assert not maintenance.is_running
@@ -0,0 +1,551 @@
+"""
+Tests for the database-backed Planning Center sync job queue
+"""
+
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+
+import app.core.planning_center_client as planning_center_client
+from app.core.config import settings
+from app.models.member import People
+from app.models.planning_center_sync_job import PlanningCenterSyncJob
+from app.models.planning_center_sync_log import PlanningCenterSyncLog
+from app.services.mock_planning_center_app import MockPlanningCenterFaults, create_mock_planning_center_app
+from app.services.mock_planning_center_service import MockPlanningCenterService
+from app.services.planning_center_sync_dag import SyncStage, run_stages
+from app.services.planning_center_sync_run import PlanningCenterSyncRun
+from app.services.planning_center_sync_service import PlanningCenterSyncService
+from app.services.sync_job_service import SyncJobService, job_status
+from app.services.sync_job_worker import SyncJobWorker
+
+
+@pytest.fixture
+def jobs(memory_db_session):
+    return SyncJobService(memory_db_session)
+
+
+@pytest.fixture
+def worker(memory_engine):
+    return SyncJobWorker(session_factory=sessionmaker(autocommit=False, autoflush=False, bind=memory_engine))
+
+
+class TestSyncJobService:
+    """Test SyncJobService"""
+
+    def test_one_active_job_per_type(self, jobs):
+        """Test a second job of the same type returns the active one until it finishes"""
+        first, created = jobs.enqueue("sync_people", params={"mode": "full"})
+        assert created
+
+        second, created = jobs.enqueue("sync_people")
+        assert not created
+        assert second.id == first.id
+
+        other, created = jobs.enqueue("sync_events")
+        assert created
+
+        jobs.update(first.id, status="completed", result={"records_processed": 1})
+        third, created = jobs.enqueue("sync_people")
+        assert created
+        assert third.id != first.id
+
+    def test_claim_is_exclusive_and_skips_stages(self, jobs):
+        """Test each pending job is claimed once and stages are never claimed"""
+        parent, _ = jobs.enqueue("sync_all")
+        jobs.enqueue("sync_people", parent_id=parent.id)
+
+        claimed = jobs.claim_next("worker-a")
+        assert claimed.id == parent.id
+        assert claimed.status == "running"
+        assert claimed.attempts == 1
+        assert jobs.claim_next("worker-b") is None
+
+    def test_stages_hold_their_type_lock(self, jobs):
+        """Test a standalone sync cannot be queued while a sync_all stage of that type is active"""
+        parent, _ = jobs.enqueue("sync_all")
+        jobs.claim_next("worker-a")
+        stage, created = jobs.enqueue("sync_people", parent_id=parent.id)
+        assert created
+
+        standalone, created = jobs.enqueue("sync_people")
+        assert not created
+        assert standalone.id == stage.id
+
+        jobs.finish(parent.id, "cancelled")
+        assert jobs.enqueue("sync_people")[1]
+
+    def test_update_keeps_extra_fields_in_details(self, jobs):
+        """Test non-column fields are kept and returned in the task status"""
+        job, _ = jobs.enqueue("sync_people")
+        jobs.update(job.id, status="running", progress=40, mode="incremental", api={"budget_remaining": 12})
+
+        status = job_status(jobs.get(job.id))
+        assert status["task_id"] == job.id
+        assert status["progress"] == 40
+        assert status["mode"] == "incremental"
+        assert status["api"] == {"budget_remaining": 12}
+
+    def test_cancel(self, jobs):
+        """Test pending jobs cancel at once and running jobs are flagged"""
+        pending, _ = jobs.enqueue("sync_events")
+        assert jobs.request_cancel(pending.id).status == "cancelled"
+
+        running, _ = jobs.enqueue("sync_people")
+        jobs.claim_next("worker-a")
+        assert not jobs.heartbeat(running.id)
+        cancelled = jobs.request_cancel(running.id)
+        assert cancelled.status == "running"
+        assert jobs.heartbeat(running.id)
+
+    def test_recover_stale(self, jobs, memory_db_session):
+        """Test jobs from a dead worker are requeued, then failed once out of attempts"""
+        job, _ = jobs.enqueue("sync_people")
+        jobs.claim_next("worker-a")
+        memory_db_session.query(PlanningCenterSyncJob).update({"heartbeat_at": datetime.utcnow() - timedelta(hours=1)})
+        memory_db_session.commit()
+
+        assert jobs.recover_stale(lease_seconds=60, max_attempts=2) == 1
+        assert jobs.get(job.id).status == "pending"
+
+        jobs.claim_next("worker-b")
+        memory_db_session.query(PlanningCenterSyncJob).update({"heartbeat_at": datetime.utcnow() - timedelta(hours=1)})
+        memory_db_session.commit()
+        jobs.recover_stale(lease_seconds=60, max_attempts=2)
+
+        memory_db_session.expire_all()
+        failed = jobs.get(job.id)
+        assert failed.status == "failed"
+        assert failed.lock_key is None
+
+    def test_prune(self, jobs, memory_db_session):
+        """Test finished jobs are pruned by age and by count; active jobs are kept"""
+        for index in range(5):
+            job, _ = jobs.enqueue(f"sync_{index}")
+            jobs.update(job.id, status="completed")
+        old, _ = jobs.enqueue("sync_old")
+        jobs.update(old.id, status="failed")
+        old.completed_at = datetime.utcnow() - timedelta(days=90)
+        memory_db_session.commit()
+        active, _ = jobs.enqueue("sync_people")
+
+        deleted = jobs.prune(retention_days=30, max_retained=3)
+
+        assert deleted == 3
+        assert memory_db_session.query(PlanningCenterSyncJob).count() == 4
+        assert jobs.get(active.id) is not None
+
+
+class TestSyncJobWorker:
+    """Test SyncJobWorker job execution"""
+
+    def test_runs_claimed_job(self, worker, jobs, monkeypatch):
+        """Test a claimed job is dispatched and closed out"""
+        calls = []
+        monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+
+        async def run_sync_job(self, task_id, task_type, params):
+            calls.append((task_type, params))
+
+        monkeypatch.setattr(PlanningCenterSyncService, "run_sync_job", run_sync_job)
+        job, _ = jobs.enqueue("sync_people", params={"mode": "full"})
+        claimed = jobs.claim_next(worker.worker_id)
+
+        asyncio.run(worker.run_job(claimed.id, claimed.task_type, claimed.params))
+
+        jobs.db.expire_all()
+        assert calls == [("sync_people", {"mode": "full"})]
+        assert jobs.get(job.id).status == "completed"
+
+    def test_cancels_running_job(self, worker, jobs, monkeypatch):
+        """Test a cancel request stops the running job at its next heartbeat"""
+        monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+        monkeypatch.setattr(settings, "SYNC_JOB_HEARTBEAT_SECONDS", 0.01)
+
+        async def run_sync_job(self, task_id, task_type, params):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(PlanningCenterSyncService, "run_sync_job", run_sync_job)
+        job, _ = jobs.enqueue("sync_events")
+        jobs.claim_next(worker.worker_id)
+        jobs.request_cancel(job.id)
+
+        asyncio.run(asyncio.wait_for(worker.run_job(job.id, "sync_events", {}), 5))
+
+        jobs.db.expire_all()
+        cancelled = jobs.get(job.id)
+        assert cancelled.status == "cancelled"
+        assert cancelled.lock_key is None
+
+    def test_failed_job_releases_lock(self, worker, jobs):
+        """Test a job that cannot start is failed and unlocks its type"""
+        job, _ = jobs.enqueue("sync_unknown")
+        jobs.claim_next(worker.worker_id)
+
+        asyncio.run(worker.run_job(job.id, "sync_unknown", {}))
+
+        jobs.db.expire_all()
+        failed = jobs.get(job.id)
+        assert failed.status == "failed"
+        assert failed.error
+        assert jobs.enqueue("sync_unknown")[1]
+
+
+@pytest.fixture
+def sync_service(memory_engine, memory_db_session, monkeypatch):
+    monkeypatch.setattr(settings, "PLANNING_CENTER_APP_ID", "test-app")
+    monkeypatch.setattr(settings, "PLANNING_CENTER_SECRET", "test-secret")
+    service = PlanningCenterSyncService(memory_db_session)
+    monkeypatch.setattr(service, "_get_db_session", sessionmaker(autocommit=False, autoflush=False, bind=memory_engine))
+    return service
+
+
+class TestSyncTaskProgress:
+    """Test sync task progress reporting and streaming"""
+
+    def test_record_progress_is_throttled(self, sync_service, jobs, monkeypatch):
+        """Test per-record progress only reaches the job store once per interval"""
+        writes = []
+        monkeypatch.setattr(SyncJobService, "update", lambda self, task_id, **fields: writes.append(fields))
+        job, _ = jobs.enqueue("sync_events")
+
+        for done in range(1, 1001):
+            sync_service._report_progress(job.id, done, 1000, "events")
+
+        assert len(writes) == 1
+        assert writes[0]["message"] == "Processed 1/1000 events"
+        assert "api" in writes[0]
+
+    def test_stream_follows_task_to_result(self, sync_service, jobs):
+        """Test the stream sends each change once and ends with the result"""
+        job, _ = jobs.enqueue("sync_events")
+
+        async def follow():
+            async def drive():
+                await asyncio.sleep(0.05)
+                sync_service._update_sync_task(job.id, status="running", progress=20, message="Halfway")
+                await asyncio.sleep(0.05)
+                sync_service._update_sync_task(job.id, status="completed", progress=100, result={"records_processed": 3})
+
+            driver = asyncio.create_task(drive())
+            events = [event async for event in sync_service.stream_sync_task(job.id, interval=0.01)]
+            await driver
+            return events
+
+        events = asyncio.run(asyncio.wait_for(follow(), 5))
+
+        names = [name for name, _ in events]
+        assert names == ["progress", "progress", "result"]
+        assert events[1][1]["message"] == "Halfway"
+        assert events[-1][1]["result"] == {"records_processed": 3}
+
+    def test_stream_of_unknown_task_is_empty(self, sync_service):
+        """Test a missing task ends the stream straight away"""
+        async def follow():
+            return [event async for event in sync_service.stream_sync_task("missing", interval=0.01)]
+
+        assert asyncio.run(follow()) == []
+
+
+class InterruptingTransport(httpx.AsyncBaseTransport):
+    """Serves the mock PC app but fails one chosen request, once"""
+
+    def __init__(self, app, path: str, offset: int = 0, error: Exception = None):
+        self.transport = httpx.ASGITransport(app=app)
+        self.path = path
+        self.offset = offset
+        self.error = error
+        self.requests = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params.get("offset", 0))
+        self.requests.append((request.url.path, offset))
+        if self.path is not None and request.url.path == self.path and offset == self.offset:
+            self.path = None
+            if self.error is not None:
+                raise self.error
+            return httpx.Response(400, json={"errors": [{"status": "400"}]}, request=request)
+        return await self.transport.handle_async_request(request)
+
+
+@pytest.fixture
+def mock_pc(monkeypatch):
+    """Point the PC client at an interrupting transport over the mock app"""
+    def install(service: MockPlanningCenterService, path: str = None, offset: int = 0, error: Exception = None,
+                faults: MockPlanningCenterFaults = None):
+        transport = InterruptingTransport(create_mock_planning_center_app(service, faults), path, offset, error)
+        monkeypatch.setattr(planning_center_client, "_clients", {})
+        monkeypatch.setattr(planning_center_client, "_base_transport", lambda config: transport)
+        monkeypatch.setattr(planning_center_client, "rate_limiter",
+                            planning_center_client.PlanningCenterRateLimiter(limit=10_000, period=1))
+        return transport
+    return install
+
+
+class TestResumableSync:
+    """Test sync runs resume from their last checkpoint"""
+
+    def test_failed_people_sync_resumes_from_checkpoint(self, sync_service, mock_pc, memory_db_session, monkeypatch):
+        """Test a retried people sync only fetches the pages after the checkpoint"""
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SYNC_CHUNK_SIZE", 100)
+        transport = mock_pc(MockPlanningCenterService(seed=1, people_count=300), "/people/v2/people", offset=200)
+
+        first = sync_service._create_sync_task("sync_people")
+        asyncio.run(sync_service._sync_people_background(first, mode="full"))
+        assert sync_service.get_sync_task_status(first)["status"] == "failed"
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).one()
+        assert sync_log.checkpoint["position"] == {"offset": 200}
+        assert sync_log.records_processed == 200
+
+        transport.requests.clear()
+        retry = sync_service._create_sync_task("sync_people")
+        asyncio.run(sync_service._sync_people_background(retry, mode="full"))
+
+        result = sync_service.get_sync_task_status(retry)["result"]
+        assert result["resumed"]
+        assert result["records_processed"] == 300
+        assert transport.requests == [("/people/v2/people", 200)]
+        assert memory_db_session.query(People).count() == 300
+        memory_db_session.expire_all()
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).one()
+        assert sync_log.checkpoint is None
+        assert sync_log.task_id == retry
+        assert sync_log.high_water_mark is not None
+
+        # A finished run is never picked up again
+        again = sync_service._create_sync_task("sync_people")
+        asyncio.run(sync_service._sync_people_background(again, mode="full"))
+        assert "resumed" not in sync_service.get_sync_task_status(again)["result"]
+
+    def test_batch_commits_with_its_checkpoint(self, sync_service, mock_pc, memory_db_session, monkeypatch):
+        """Test a batch whose checkpoint is not written leaves no rows behind"""
+        monkeypatch.setattr(settings, "PLANNING_CENTER_SYNC_CHUNK_SIZE", 100)
+        mock_pc(MockPlanningCenterService(seed=1, people_count=300))
+        checkpoint = PlanningCenterSyncRun.checkpoint
+        calls = []
+
+        def crash_on_second_batch(run, db, **position):
+            calls.append(position)
+            if len(calls) == 2:
+                raise RuntimeError("worker died before commit")
+            checkpoint(run, db, **position)
+
+        monkeypatch.setattr(PlanningCenterSyncRun, "checkpoint", crash_on_second_batch)
+        first = sync_service._create_sync_task("sync_people")
+        asyncio.run(sync_service._sync_people_background(first, mode="full"))
+
+        assert sync_service.get_sync_task_status(first)["status"] == "failed"
+        assert memory_db_session.query(People).count() == 100
+        assert memory_db_session.query(PlanningCenterSyncLog).one().checkpoint["position"] == {"offset": 100}
+
+        retry = sync_service._create_sync_task("sync_people")
+        asyncio.run(sync_service._sync_people_background(retry, mode="full"))
+
+        result = sync_service.get_sync_task_status(retry)["result"]
+        assert result["resumed"]
+        assert result["records_unchanged"] == 0
+        assert memory_db_session.query(People).count() == 300
+
+    def test_requeued_registrations_sync_skips_done_events(self, sync_service, mock_pc):
+        """Test a restarted job resumes after the last event it finished"""
+        service = MockPlanningCenterService(seed=2, people_count=50, events_count=5, registrations_per_event=10)
+        transport = mock_pc(service, "/events/v2/events/pc_event_004/registrations",
+                            error=RuntimeError("worker recycled"))
+
+        task_id = sync_service._create_sync_task("sync_registrations")
+        asyncio.run(sync_service._sync_registrations_background(task_id, mode="full"))
+        assert sync_service.get_sync_task_status(task_id)["status"] == "failed"
+
+        transport.requests.clear()
+        asyncio.run(sync_service._sync_registrations_background(task_id, mode="full"))
+
+        result = sync_service.get_sync_task_status(task_id)["result"]
+        assert result["resumed"]
+        expected = sum(asyncio.run(service.get_event_registrations(f"pc_event_{n:03d}"))["meta"]["total_count"]
+                       for n in range(1, 6))
+        assert result["records_processed"] == expected
+        assert transport.requests[0] == ("/events/v2/events", 3)
+        assert {path for path, _ in transport.requests[1:]} == {
+            "/events/v2/events/pc_event_004/registrations", "/events/v2/events/pc_event_005/registrations"
+        }
+
+    def test_run_owned_by_active_job_is_not_resumed(self, jobs, memory_db_session):
+        """Test a second job never takes over a log another running job is writing"""
+        owner, _ = jobs.enqueue("sync_events")
+        jobs.update(owner.id, status="running")
+        running = PlanningCenterSyncRun.start(memory_db_session, owner.id, "events", "full")
+        running.checkpoint(memory_db_session, offset=100)
+
+        other = PlanningCenterSyncRun.start(memory_db_session, "other-task", "events", "full")
+        assert not other.resumed
+        assert other.sync_log.id != running.sync_log.id
+
+        # Once the owner is gone its run can be resumed
+        jobs.finish(owner.id, "failed")
+        other.checkpoint(memory_db_session, offset=0)
+        other.fail(memory_db_session, "stopped")
+        memory_db_session.delete(other.sync_log)
+        memory_db_session.commit()
+        resumed = PlanningCenterSyncRun.start(memory_db_session, "retry-task", "events", "full")
+        assert resumed.resumed
+        assert resumed.sync_log.id == running.sync_log.id
+        assert resumed.position == {"offset": 100}
+
+
+class TestSyncAllStages:
+    """Test the sync_all stage DAG"""
+
+    def test_stages_wait_for_dependencies(self):
+        """Test independent stages overlap and dependants start after their dependencies"""
+        order = []
+
+        def stage(name: str, delay: float):
+            async def run():
+                order.append(f"start {name}")
+                await asyncio.sleep(delay)
+                order.append(f"end {name}")
+            return run
+
+        timings = asyncio.run(run_stages([
+            SyncStage("a", stage("a", 0.05)),
+            SyncStage("b", stage("b", 0.01)),
+            SyncStage("c", stage("c", 0), after=("a", "b")),
+        ], concurrency=2))
+
+        assert order[:2] == ["start a", "start b"]
+        assert order.index("start c") > order.index("end a")
+        assert timings["c"]["started_at"] >= timings["a"]["finished_at"]
+        assert all(timing["status"] == "completed" for timing in timings.values())
+
+    def test_concurrency_and_failures(self):
+        """Test a concurrency of 1 runs stages one at a time and a failure only stops its dependants"""
+        running, peak = [0], [0]
+
+        async def work():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def cancelled():
+            return "cancelled"
+
+        timings = asyncio.run(run_stages([
+            SyncStage("a", work), SyncStage("b", fail), SyncStage("c", work, after=("b",)),
+            SyncStage("d", work, after=("a", "c")), SyncStage("e", cancelled), SyncStage("f", work, after=("e",)),
+            SyncStage("g", work, after=("a",)),
+        ], concurrency=1))
+
+        assert peak[0] == 1
+        assert timings["b"]["status"] == "failed"
+        assert timings["b"]["error"] == "boom"
+        assert timings["c"]["status"] == "skipped"
+        assert timings["c"]["error"] == "Skipped because b did not complete"
+        assert "started_at" not in timings["c"]
+        assert timings["d"]["status"] == "skipped"
+        assert timings["f"]["status"] == "skipped"
+        assert timings["a"]["status"] == timings["g"]["status"] == "completed"
+
+        with pytest.raises(ValueError):
+            asyncio.run(run_stages([SyncStage("a", work, after=("missing",))]))
+
+    def test_stage_supersedes_queued_standalone_sync(self, sync_service, jobs):
+        """Test a sync_people queued before sync_all reaches its people stage is taken over by the stage"""
+        parent, _ = jobs.enqueue("sync_all")
+        jobs.claim_next("worker-a")
+        standalone, _ = jobs.enqueue("sync_people")
+
+        stage_id, completed = asyncio.run(sync_service._stage_task(parent.id, "sync_people"))
+
+        jobs.db.expire_all()
+        assert not completed
+        assert jobs.get(stage_id).parent_id == parent.id
+        assert jobs.get(standalone.id).status == "cancelled"
+        assert jobs.enqueue("sync_people")[0].id == stage_id
+
+    def test_stage_waits_for_running_standalone_sync(self, sync_service, jobs, monkeypatch):
+        """Test a sync_people queued while sync_all runs blocks the people stage until it finishes"""
+        monkeypatch.setattr(settings, "SYNC_WORKER_POLL_SECONDS", 0.01)
+        parent, _ = jobs.enqueue("sync_all")
+        jobs.claim_next("worker-a")
+        standalone, _ = jobs.enqueue("sync_people")
+        jobs.claim_next("worker-b")
+
+        async def run():
+            stage = asyncio.create_task(sync_service._stage_task(parent.id, "sync_people"))
+            await asyncio.sleep(0.05)
+            assert not stage.done()
+            jobs.update(standalone.id, status="completed")
+            return await asyncio.wait_for(stage, 5)
+
+        stage_id, completed = asyncio.run(run())
+
+        assert stage_id != standalone.id
+        assert not completed
+        assert jobs.get(stage_id).lock_key == "sync_people"
+
+    def test_failed_people_stage_skips_registrations_and_fails_sync_all(self, sync_service, mock_pc, memory_db_session):
+        """Test registrations are not synced against missing people and the parent job reports the failure"""
+        service = MockPlanningCenterService(seed=4, people_count=5, events_count=3, registrations_per_event=2)
+        transport = mock_pc(service, "/people/v2/people", offset=0)
+
+        task_id = sync_service._create_sync_task("sync_all")
+        asyncio.run(sync_service._sync_all_background(task_id, mode="full"))
+
+        status = sync_service.get_sync_task_status(task_id)
+        assert status["status"] == "failed"
+        assert status["message"] == "Full sync incomplete: people failed, registrations skipped"
+        stages = status["result"]["timings"]["stages"]
+        assert {name: stage["status"] for name, stage in stages.items()} == {
+            "people": "failed", "events": "completed", "registrations": "skipped"
+        }
+        assert status["result"]["registrations"] is None
+        assert not any(path.endswith("/registrations") for path, _ in transport.requests)
+        assert memory_db_session.query(PlanningCenterSyncJob).filter(
+            PlanningCenterSyncJob.parent_id == task_id, PlanningCenterSyncJob.task_type == "sync_registrations"
+        ).count() == 0
+
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).filter(PlanningCenterSyncLog.sync_type == "all").one()
+        assert sync_log.error_details == {"stages": {"people": "failed", "registrations": "skipped"}}
+
+    def test_sync_all_streams_events_into_registrations(self, sync_service, mock_pc, memory_db_session, monkeypatch):
+        """Test registrations start on written events before the events stage has finished"""
+        monkeypatch.setattr(settings, "PLANNING_CENTER_PAGE_SIZE", 5)
+        service = MockPlanningCenterService(seed=4, people_count=5, events_count=40, registrations_per_event=2)
+        mock_pc(service, faults=MockPlanningCenterFaults(latency=0.005, throttle_rate=0, error_rate=0))
+
+        task_id = sync_service._create_sync_task("sync_all")
+        asyncio.run(sync_service._sync_all_background(task_id, mode="full"))
+
+        status = sync_service.get_sync_task_status(task_id)
+        assert status["status"] == "completed"
+        result = status["result"]
+        stages = result["timings"]["stages"]
+        assert {name: stage["status"] for name, stage in stages.items()} == {
+            "people": "completed", "events": "completed", "registrations": "completed"
+        }
+        assert stages["events"]["started_at"] < stages["people"]["finished_at"]
+        assert stages["registrations"]["started_at"] < stages["events"]["finished_at"]
+        assert result["events"]["records_processed"] == 40
+        expected = sum(asyncio.run(service.get_event_registrations(f"pc_event_{n:03d}"))["meta"]["total_count"]
+                       for n in range(1, 41))
+        assert result["registrations"]["records_processed"] == expected
+        assert result["registrations"]["records_unresolved"] == 0
+
+        sync_log = memory_db_session.query(PlanningCenterSyncLog).filter(PlanningCenterSyncLog.sync_type == "all").one()
+        assert sync_log.stage_timings["wall_seconds"] > 0
+        assert sync_log.records_processed == 5 + 40 + expected
+
+        # An incremental run cannot use the feed; registrations list the events after the events stage
+        again = sync_service._create_sync_task("sync_all")
+        asyncio.run(sync_service._sync_all_background(again))
+        result = sync_service.get_sync_task_status(again)["result"]
+        assert result["registrations"]["mode"] == "incremental"
+        assert result["timings"]["stages"]["registrations"]["status"] == "completed"
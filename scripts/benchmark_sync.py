@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for the Planning Center sync
+
+Runs the people, events and registrations background syncs against the
+in-process Planning Center stand-in (``create_mock_planning_center_app``) and
+records, per sync:
+
+- records/sec
+- p50/p99 latency of each page request
+- DB statements per record
+- peak RSS of the process
+- response cache hits (pages PC answered with 304)
+
+Each (size, database) scenario runs in its own subprocess, so peak RSS belongs
+to that scenario alone. Results are written as JSON so runs can be compared
+before and after a sync change::
+
+    python scripts/benchmark_sync.py --sizes 1000,10000 --output before.json
+    # ... change the sync ...
+    python scripts/benchmark_sync.py --sizes 1000,10000 --output after.json --compare before.json
+
+A size of N generates N people and N/50 events. Each event gets a random
+0-50 registrations (capped by its capacity), so roughly N/2 registrations in
+all. The exact volumes of every scenario are recorded under ``generated`` in
+the results, and ``--compare`` flags scenarios whose volumes differ.
+``--database-url`` adds a scenario against another database (e.g. PostgreSQL);
+tables are created there if missing, so point it at a scratch database.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+# The benchmark never talks to the real API or starts the sync workers
+os.environ.setdefault("PLANNING_CENTER_APP_ID", "benchmark")
+os.environ.setdefault("PLANNING_CENTER_SECRET", "benchmark")
+os.environ["SYNC_WORKERS_ENABLED"] = "false"
+
+SYNC_KINDS = ("people", "events", "registrations")
+REGISTRATIONS_PER_EVENT = 50
+DATABASES = ("sqlite-memory", "sqlite-file")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def create_benchmark_engine(database: str, database_url: Optional[str], workdir: str):
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    if database == "sqlite-memory":
+        return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    if database == "sqlite-file":
+        return create_engine(f"sqlite:///{os.path.join(workdir, 'benchmark.db')}",
+                             connect_args={"check_same_thread": False})
+    return create_engine(database_url, pool_pre_ping=True)
+
+
+def run_scenario(size: int, database: str, database_url: Optional[str], seed: int,
+                 latency_ms: float) -> List[Dict[str, Any]]:
+    """Run every sync once against a fresh database; returns one result per sync kind"""
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+
+    import app.core.planning_center_client as planning_center_client
+    from app.core.config import settings
+    from app.core.planning_center_response_cache import PlanningCenterResponseCache
+    from app.core.database import Base
+    import app.models  # noqa: F401 - registers every table on Base
+    from app.services.mock_planning_center_app import MockPlanningCenterFaults, create_mock_planning_center_app
+    from app.services.mock_planning_center_service import MockPlanningCenterService
+    from app.services.planning_center_sync_service import PlanningCenterSyncService
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    latencies: List[float] = []
+
+    class TimedTransport(httpx.AsyncBaseTransport):
+        """Records how long each page request takes to answer"""
+
+        def __init__(self, transport: httpx.AsyncBaseTransport):
+            self.transport = transport
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            started = time.perf_counter()
+            response = await self.transport.handle_async_request(request)
+            latencies.append(time.perf_counter() - started)
+            return response
+
+        async def aclose(self):
+            await self.transport.aclose()
+
+    service = MockPlanningCenterService(
+        seed=seed,
+        people_count=size,
+        events_count=max(1, size // REGISTRATIONS_PER_EVENT),
+        registrations_per_event=REGISTRATIONS_PER_EVENT
+    )
+    generated = {
+        "people": service.people_count,
+        "events": service.events_count,
+        "registrations": sum(service._registration_count(index) for index in range(service.events_count)),
+    }
+    app = create_mock_planning_center_app(service, MockPlanningCenterFaults(
+        seed=seed, latency=latency_ms / 1000, throttle_rate=0, error_rate=0
+    ))
+    planning_center_client._base_transport = lambda config: TimedTransport(httpx.ASGITransport(app=app))
+    # Measure ingest, not the PC request budget
+    planning_center_client.rate_limiter = planning_center_client.PlanningCenterRateLimiter(limit=10 ** 9, period=1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # A scenario starts with an empty response cache, like a fresh install
+        planning_center_client.response_cache = PlanningCenterResponseCache(
+            os.path.join(workdir, "responses.db"), int(settings.PLANNING_CENTER_RESPONSE_CACHE_MAX_MB * 1024 * 1024)
+        )
+        engine = create_benchmark_engine(database, database_url, workdir)
+        Base.metadata.create_all(bind=engine)
+        statements = [0]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements[0] += 1
+
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = session_factory()
+        sync_service = PlanningCenterSyncService(db)
+        sync_service._get_db_session = session_factory
+
+        results = []
+        try:
+            for kind in SYNC_KINDS:
+                task_id = sync_service._create_sync_task(f"sync_{kind}")
+                latencies.clear()
+                statements[0] = 0
+                started = time.perf_counter()
+                asyncio.run(getattr(sync_service, f"_sync_{kind}_background")(task_id, mode="full"))
+                seconds = time.perf_counter() - started
+
+                status = sync_service.get_sync_task_status(task_id)
+                result = status.get("result") or {}
+                records = result.get("records_processed", 0)
+                results.append({
+                    "size": size,
+                    "database": database,
+                    "kind": kind,
+                    "generated": generated,
+                    "status": status["status"],
+                    "error": status.get("error"),
+                    "records": records,
+                    "records_successful": result.get("records_successful", 0),
+                    "records_failed": result.get("records_failed", 0),
+                    "seconds": round(seconds, 3),
+                    "records_per_sec": round(records / seconds, 1) if seconds else None,
+                    "pages": len(latencies),
+                    "page_latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+                    "page_latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+                    "db_statements": statements[0],
+                    "db_statements_per_record": round(statements[0] / records, 2) if records else None,
+                    "response_cache_hits": (result.get("response_cache") or {}).get("hits", 0),
+                    # ru_maxrss never drops, so this is the peak up to the end of this sync
+                    "peak_rss_mb": peak_rss_mb(),
+                })
+        finally:
+            db.close()
+            engine.dispose()
+            planning_center_client.response_cache.close()
+    return results
+
+
+def run_in_subprocess(size: int, database: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    command = [
+        sys.executable, os.path.abspath(__file__), "--scenario",
+        "--sizes", str(size), "--databases", database,
+        "--seed", str(args.seed), "--latency-ms", str(args.latency_ms),
+    ]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise RuntimeError(f"Benchmark scenario size={size} database={database} failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None):
+    previous = {}
+    if baseline:
+        previous = {(r["size"], r["database"], r["kind"]): r for r in baseline.get("results", [])}
+
+    header = f"{'size':>7} {'database':<14} {'kind':<14} {'rec/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'stmt/rec':>9} {'rss MB':>7}"
+    if previous:
+        header += f" {'vs base':>8}"
+    print(header)
+    for r in results:
+        line = (f"{r['size']:>7} {r['database']:<14} {r['kind']:<14} {r['records_per_sec'] or 0:>9.1f} "
+                f"{r['page_latency_p50_ms'] or 0:>8.2f} {r['page_latency_p99_ms'] or 0:>8.2f} "
+                f"{r['db_statements_per_record'] or 0:>9.2f} {r['peak_rss_mb']:>7.1f}")
+        base = previous.get((r["size"], r["database"], r["kind"]))
+        if previous:
+            if base and base.get("records_per_sec") and r["records_per_sec"]:
+                line += f" {(r['records_per_sec'] / base['records_per_sec'] - 1) * 100:>+7.1f}%"
+            else:
+                line += f" {'-':>8}"
+            if base and base.get("generated") != r["generated"]:
+                line += f"  [baseline generated {base.get('generated')}]"
+        if r["status"] != "completed":
+            line += f"  [{r['status']}: {r['error']}]"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Planning Center sync throughput")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated record counts (default: 1000,10000,100000)")
+    parser.add_argument("--databases", default=",".join(DATABASES),
+                        help=f"Comma-separated databases to run on: {', '.join(DATABASES)}, url")
+    parser.add_argument("--database-url", help="SQLAlchemy URL of a scratch database; adds the 'url' database")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated Planning Center data")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency added to every mock API response")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmark-results/sync-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare records/sec against")
+    parser.add_argument("--scenario", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    databases = [database for database in args.databases.split(",") if database]
+    if args.database_url and "url" not in databases:
+        databases.append("url")
+    if "url" in databases and not args.database_url:
+        parser.error("the 'url' database needs --database-url")
+
+    if args.scenario:
+        # Child process: one scenario, results as the last line of stdout
+        print(json.dumps(run_scenario(sizes[0], databases[0], args.database_url, args.seed, args.latency_ms)))
+        return
+
+    results = []
+    for size in sizes:
+        for database in databases:
+            print(f"Running size={size} database={database}...", file=sys.stderr)
+            results.extend(run_in_subprocess(size, database, args))
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "latency_ms": args.latency_ms,
+        "registrations_per_event": REGISTRATIONS_PER_EVENT,
+        "results": results,
+    }
+    output = args.output or os.path.join("benchmark-results", f"sync-{datetime.utcnow():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nResults written to {output}")
+
+    if any(r["status"] != "completed" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()